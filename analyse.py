@@ -0,0 +1,269 @@
+# L'objectif de ce fichier est de regrouper les fonctions d'analyse des graphes de l'essaim utilisées par
+# resultats_toutes_parties.py, partie2.py, partie3.py et la ligne de commande (essaim.py).
+# Importer ce module ne fait aucun calcul et ne charge que NumPy : les modules de calcul (et donc SciPy,
+# NetworkX) ne sont importés qu'au premier appel de la fonction qui en a besoin, et matplotlib jamais.
+
+import numpy as np
+
+from instrumentation import instrumenter
+
+fichiers_donnees = ['topology_low.csv', 'topology_avg.csv', 'topology_high.csv']
+
+# On charge les données (nums_sat, coordonnées), projetées en mémoire depuis leur conversion binaire
+@instrumenter()
+def charger_donnees(fichiers=None):
+    from chargement import charger_topologie
+    return [charger_topologie(fichier) for fichier in (fichiers_donnees if fichiers is None else fichiers)]
+
+# On crée un graphe (poids = distance² si pondere vaut True) ; portee est une portée commune ou un vecteur
+# d'une portée par satellite (voir aretes.paires_a_portee)
+@instrumenter()
+def creer_graphe(essaim, portee, pondere=False):
+    from aretes import graphe_a_portee
+    from chargement import nums_et_coordonnees
+    nums_sat, coordonnees_sat = nums_et_coordonnees(essaim)
+    return graphe_a_portee(nums_sat, coordonnees_sat, portee, pondere=pondere)
+
+# On crée les graphes de plusieurs portées en une seule recherche de voisins (les arêtes d'une portée
+# sont incluses dans celles des portées supérieures)
+@instrumenter()
+def creer_graphes(essaim, portees, pondere=False):
+    from aretes import graphes_par_portee
+    from chargement import nums_et_coordonnees
+    nums_sat, coordonnees_sat = nums_et_coordonnees(essaim)
+    return graphes_par_portee(nums_sat, coordonnees_sat, portees, pondere=pondere)
+
+# On analyse les degrés du graphe
+@instrumenter()
+def analyser_degres(graphe):
+    resultats = {}
+    degres = np.array([degre for n, degre in graphe.degree()])
+    resultats['Degré Moyen'] = np.mean(degres) if len(degres) > 0 else 0
+    resultats['Distribution des Degrés'] = np.bincount(degres) if len(degres) > 0 else np.array([])
+    return resultats
+
+# On analyse les coefficients de clustering (triangles comptés sur la matrice d'adjacence creuse)
+@instrumenter()
+def analyser_clustering(graphe):
+    from triangles import triangles_et_clustering
+    resultats = {}
+    clustering = triangles_et_clustering(graphe)
+    resultats['Coefficient de Clustering Moyen'] = clustering['Clustering Moyen']
+    resultats['Transitivité'] = clustering['Transitivité']
+    return resultats
+
+# On analyse les composantes connexes
+@instrumenter()
+def analyser_composantes(graphe):
+    from connexite import composantes_connexes
+    resultats = {}
+    composantes = composantes_connexes(graphe)
+    resultats['Nombre de Composantes Connexes'] = len(composantes)
+    resultats['Tailles des Composantes Connexes'] = [len(composante) for composante in composantes]
+    return resultats
+
+# On analyse les cliques : les tailles des cliques maximales sont accumulées au fil de l'énumération,
+# sans conserver les cliques elles-mêmes. Si un budget est donné et atteint, le résultat est marqué partiel
+# et la taille de la clique maximum est obtenue par une recherche dédiée, avec le temps restant du budget
+# (duree_max borne la durée totale de l'analyse).
+@instrumenter()
+def analyser_cliques(graphe, duree_max=None, nombre_max=None):
+    import time
+
+    from cliques import clique_maximum
+    debut = time.perf_counter()
+    resultats = analyser_distribution_cliques(graphe, duree_max=duree_max, nombre_max=nombre_max)
+    if resultats['Cliques Partielles']:
+        restant = None if duree_max is None else max(0.0, duree_max - (time.perf_counter() - debut))
+        clique_max, partielle = clique_maximum(graphe, duree_max=restant)
+        # La recherche interrompue peut rester en deçà de la plus grande clique déjà énumérée
+        taille_enumeree = len(resultats['Distribution des Tailles des Cliques']) - 1
+        resultats['Taille de la Clique Maximum'] = max(len(clique_max), taille_enumeree)
+        resultats['Cliques Partielles'] = partielle
+    else:
+        resultats['Taille de la Clique Maximum'] = len(resultats['Distribution des Tailles des Cliques']) - 1
+    return resultats
+
+# On analyse les plus courts chemins
+@instrumenter()
+def analyser_chemins(graphe):
+    from chemins import compter_plus_courts_chemins
+    resultats = {}
+    # On compte, pour chaque paire de sommets connectés, la longueur et le nombre de ses plus courts chemins
+    chemins = compter_plus_courts_chemins(graphe)
+    histogramme = chemins['Histogramme des Longueurs']
+    nombre_paires = chemins['Nombre de Paires Connectées']
+    resultats['Nombre de Paires Connectées'] = nombre_paires
+    resultats['Distribution du Nombre de Plus Courts Chemins'] = (chemins['Valeurs de σ'], chemins['Nombre de Paires par σ'])
+
+    if nombre_paires > 0:
+        resultats['Longueur Moyenne des Chemins'] = np.dot(np.arange(len(histogramme)), histogramme) / nombre_paires
+        resultats['Nombre des Plus Courts Chemins'] = int(chemins['Nombre Total de Plus Courts Chemins'])
+        resultats['Nombre Moyen de Plus Courts Chemins'] = chemins['Nombre Moyen de Plus Courts Chemins']
+    else:
+        resultats['Longueur Moyenne des Chemins'] = 'N/A'
+        resultats['Nombre des Plus Courts Chemins'] = 0
+        resultats['Nombre Moyen de Plus Courts Chemins'] = 'N/A'
+    return resultats
+
+# On analyse la charge de relais (intermédiarité) des satellites en nombre de sauts.
+# Le balayage des configurations étant déjà parallèle, le calcul reste ici dans le processus courant.
+@instrumenter()
+def analyser_charge_relais(graphe):
+    from charge_relais import charge_relais
+    resultats = {}
+    charge = charge_relais(graphe, processus=1)
+    if len(charge['sat_id']) > 0:
+        plus_charge = int(np.argmax(charge['Intermédiarité']))
+        resultats['Satellite le Plus Sollicité'] = charge['sat_id'][plus_charge]
+        resultats['Intermédiarité Maximale'] = charge['Intermédiarité'][plus_charge]
+    else:
+        resultats['Satellite le Plus Sollicité'] = 'N/A'
+        resultats['Intermédiarité Maximale'] = 0
+    return resultats
+
+# Distributions étudiées dans la partie 2
+@instrumenter()
+def analyser_distribution_degres(graphe):
+    degres = np.array([degre for n, degre in graphe.degree()])
+    return {'Distribution des Degrés': np.bincount(degres)}
+
+@instrumenter()
+def analyser_distribution_clustering(graphe):
+    from triangles import triangles_et_clustering
+    return {'Distribution de Clustering': triangles_et_clustering(graphe)['Clustering']}
+
+# Cliques (les tailles des cliques maximales sont accumulées dans un histogramme au fil de l'énumération)
+@instrumenter()
+def analyser_distribution_cliques(graphe, duree_max=None, nombre_max=None):
+    from cliques import histogramme_cliques
+    resultats = {}
+    cliques = histogramme_cliques(graphe, duree_max=duree_max, nombre_max=nombre_max)
+    resultats['Nombre de Cliques'] = cliques['Nombre']
+    resultats['Distribution des Tailles des Cliques'] = cliques['Histogramme']
+    resultats['Cliques Partielles'] = cliques['Partiel']
+    return resultats
+
+# Distribution des plus courts chemins (en nombre de sauts)
+# histogramme[k] = nombre de paires de sommets connectés à k sauts (chaque paire comptée une seule fois)
+# Pour les grands graphes (ou si une précision est donnée, voir chemins_echantillonnes.mode_echantillonne),
+# l'histogramme est estimé depuis un échantillon de sources : comptes réels, accompagnés de leur erreur type,
+# de la longueur moyenne et du diamètre effectif avec leurs intervalles de confiance.
+@instrumenter()
+def analyser_distribution_chemins(graphe, precision=None):
+    from chemins_echantillonnes import distribution_chemins_echantillonnee, mode_echantillonne
+    if not mode_echantillonne(graphe, precision):
+        from chemins import histogramme_sauts
+        histogramme_chemins, _, _ = histogramme_sauts(graphe)
+        return {'Distribution des Plus Courts Chemins': histogramme_chemins}
+    options = {} if precision is None else {'precision': precision}
+    estimation = distribution_chemins_echantillonnee(graphe, **options)
+    return {'Distribution des Plus Courts Chemins': estimation['Histogramme'],
+            'Erreur Type de la Distribution des Plus Courts Chemins': estimation['Erreur Type'],
+            'Longueur Moyenne des Chemins': estimation['Longueur Moyenne des Chemins'],
+            'Intervalle de Confiance de la Longueur Moyenne':
+                estimation['Intervalle de Confiance de la Longueur Moyenne'],
+            'Diamètre Effectif': estimation['Diamètre Effectif'],
+            'Intervalle de Confiance du Diamètre Effectif': estimation['Intervalle de Confiance du Diamètre Effectif'],
+            'Sources Échantillonnées': estimation['Sources Échantillonnées']}
+
+# Analyse des plus courts chemins pondérés (graphe de creer_graphe avec pondere=True)
+# On calcule la matrice des distances pondérées (Dijkstra compilé sur la matrice d'adjacence creuse)
+# puis l'histogramme (comptes, bords des classes) des distances entre paires de sommets connectés.
+# Pour les grands graphes (ou si une précision est donnée), les comptes sont estimés depuis un échantillon
+# de sources, dans le même format (voir chemins_echantillonnes.py pour les intervalles de confiance).
+@instrumenter()
+def analyser_chemins_ponderes(graphe, classes=30, precision=None):
+    from chemins_echantillonnes import distribution_chemins_echantillonnee, mode_echantillonne
+    if not mode_echantillonne(graphe, precision):
+        from chemins import matrice_distances_ponderees, histogramme_distances
+        distances, _ = matrice_distances_ponderees(graphe, poids='weight')
+        return histogramme_distances(distances, classes=classes)
+    options = {} if precision is None else {'precision': precision}
+    estimation = distribution_chemins_echantillonnee(graphe, pondere='weight', classes=classes, **options)
+    return estimation['Histogramme'], estimation['Bords']
+
+# Diffusion épidémique de tous vers tous sur le graphe de contact fixe (voir diffusion.py).
+# Le graphe de creer_graphe ne contient pas les satellites isolés : le taux porte sur les sommets du graphe.
+@instrumenter()
+def analyser_diffusion(graphe):
+    from diffusion import simuler_diffusion
+    diffusion = simuler_diffusion(graphe)
+    return {'Taux de Livraison': diffusion['Taux de Livraison'],
+            'Latence Moyenne': diffusion['Latence Moyenne'] if diffusion['Latence Moyenne'] is not None else 'N/A',
+            'Latence Maximale': diffusion['Latence Maximale'] if diffusion['Latence Maximale'] is not None else 'N/A',
+            'Distribution des Latences': diffusion['Histogramme des Latences']}
+
+# Robustesse aux pannes d'un satellite ou d'un lien (voir robustesse.py)
+@instrumenter()
+def analyser_robustesse(graphe):
+    from robustesse import analyser_pannes
+    pannes = analyser_pannes(graphe)
+    resultats = {"Nombre de Points d'Articulation": int(pannes["Point d'Articulation"].sum()),
+                 'Nombre de Ponts': len(pannes['Ponts'])}
+    if len(pannes['sat_id']) > 0:
+        # Satellite dont la panne réduit le plus la plus grande composante (puis allonge le plus le diamètre)
+        critique = int(np.lexsort((-pannes['Variation du Diamètre'],
+                                   pannes['Taille de la Plus Grande Composante Après Retrait']))[0])
+        resultats['Satellite le Plus Critique'] = pannes['sat_id'][critique]
+        resultats['Variation Maximale du Diamètre'] = int(pannes['Variation du Diamètre'].max())
+    else:
+        resultats['Satellite le Plus Critique'] = 'N/A'
+        resultats['Variation Maximale du Diamètre'] = 0
+    return resultats
+
+# Mesures disponibles (le nom sert aussi de clé dans le cache des résultats)
+mesures_graphe = {
+    'degres': analyser_degres,
+    'clustering': analyser_clustering,
+    'composantes': analyser_composantes,
+    'cliques': analyser_cliques,
+    'chemins': analyser_chemins,
+    'charge_relais': analyser_charge_relais,
+}
+
+# Mesures de la partie 2 (distributions)
+mesures_distributions = {
+    'distribution_degres': analyser_distribution_degres,
+    'distribution_clustering': analyser_distribution_clustering,
+    'composantes': analyser_composantes,
+    'distribution_cliques': analyser_distribution_cliques,
+    'distribution_chemins': analyser_distribution_chemins,
+}
+
+# Mesures du routage opportuniste
+mesures_diffusion = {
+    'diffusion': analyser_diffusion,
+}
+
+# Mesures de robustesse aux pannes
+mesures_robustesse = {
+    'robustesse': analyser_robustesse,
+}
+
+# On analyse les caractéristiques du graphe (toutes les mesures, ou celles dont le nom est donné)
+@instrumenter()
+def analyser_graphe(graphe, mesures=None):
+    toutes_mesures = dict(mesures_distributions, **mesures_graphe, **mesures_diffusion, **mesures_robustesse)
+    resultats = {}
+    for nom in (mesures_graphe if mesures is None else mesures):
+        resultats.update(toutes_mesures[nom](graphe))
+    return resultats
+
+# On calcule la matrice de distance (n × n : réservée aux petits essaims, voir distances_essaim.py)
+def calculer_matrice_distances(donnees):
+    from scipy.spatial import distance
+    from chargement import nums_et_coordonnees
+    _, positions = nums_et_coordonnees(donnees)
+    return distance.cdist(positions, positions, 'euclidean')
+
+# On analyse les distances : plus petite (arbre k-d) et plus grande (enveloppe convexe) distance entre satellites,
+# sans construire la matrice des distances
+@instrumenter()
+def analyser_distances(donnees):
+    from chargement import nums_et_coordonnees
+    from distances_essaim import paire_la_plus_proche, paire_la_plus_eloignee
+    _, positions = nums_et_coordonnees(donnees)
+    distance_minimale, _, _ = paire_la_plus_proche(positions)
+    distance_maximale, _, _ = paire_la_plus_eloignee(positions)
+    return distance_minimale, distance_maximale
@@ -0,0 +1,94 @@
+# L'objectif de ce fichier est de regrouper la construction des arêtes des graphes de l'essaim.
+# Plutôt que de calculer la distance de chaque paire de satellites dans une double boucle Python,
+# on s'appuie sur un arbre k-d (index spatial) qui renvoie en un seul appel toutes les paires à portée.
+
+import numpy as np
+import networkx as nx
+from scipy.spatial import cKDTree
+
+
+# Cette fonction renvoie toutes les paires (i, j), i < j, de satellites dont la distance est inférieure
+# ou égale à la portée, ainsi que la distance correspondante, sous forme de tableaux NumPy.
+# Les indices i et j sont les positions des satellites dans coordonnees_sat (et non leurs numéros).
+# La portée peut aussi être un vecteur (une portée par satellite) : deux satellites ne sont alors reliés
+# que s'ils s'atteignent mutuellement, c'est-à-dire si leur distance est au plus min(portee[i], portee[j]).
+def paires_a_portee(coordonnees_sat, portee):
+    coordonnees_sat = np.asarray(coordonnees_sat, dtype=np.float64)
+    if len(coordonnees_sat) < 2:
+        vide = np.empty(0, dtype=np.intp)
+        return vide, vide, np.empty(0, dtype=np.float64)
+
+    portees_sat = None
+    if np.ndim(portee) > 0:
+        portees_sat = np.asarray(portee, dtype=np.float64)
+        if portees_sat.shape != (len(coordonnees_sat),):
+            raise ValueError("Il faut une portée par satellite")
+        portee = portees_sat.max()
+
+    # cKDTree.query_pairs n'arrondit pas les distances comme np.linalg.norm : une paire dont la distance
+    # vaut exactement la portée (la portée critique, par exemple) peut être omise. On interroge donc avec un
+    # rayon très légèrement supérieur, puis on filtre avec la même norme que celle renvoyée.
+    arbre = cKDTree(coordonnees_sat)
+    paires = arbre.query_pairs(np.nextafter(portee * (1 + 1e-12), np.inf), output_type='ndarray')
+
+    # On trie les paires pour obtenir un ordre déterministe (le même que la double boucle i < j)
+    ordre = np.lexsort((paires[:, 1], paires[:, 0]))
+    sources = paires[ordre, 0]
+    cibles = paires[ordre, 1]
+    distances = np.linalg.norm(coordonnees_sat[sources] - coordonnees_sat[cibles], axis=1)
+    if portees_sat is not None:
+        garder = distances <= np.minimum(portees_sat[sources], portees_sat[cibles])
+    else:
+        garder = distances <= portee
+    return sources[garder], cibles[garder], distances[garder]
+
+
+# Cette fonction ajoute au graphe les arêtes données par les tableaux d'indices (et éventuellement les poids).
+def ajouter_aretes_depuis_paires(graphe, nums_sat, sources, cibles, poids=None):
+    nums_sat = np.asarray(nums_sat)
+    # tolist() convertit les types NumPy en types Python natifs (les sommets restent de simples entiers)
+    extremites_u = nums_sat[sources].tolist()
+    extremites_v = nums_sat[cibles].tolist()
+    if poids is None:
+        graphe.add_edges_from(zip(extremites_u, extremites_v))
+    else:
+        graphe.add_weighted_edges_from(zip(extremites_u, extremites_v, np.asarray(poids).tolist()))
+    return graphe
+
+
+# Cette fonction crée directement le graphe de l'essaim pour une portée donnée (ou une portée par satellite).
+# Comme dans les scripts d'origine, seuls les satellites ayant au moins un voisin apparaissent dans le graphe.
+# Si pondere vaut True, chaque arête porte un poids égal au carré de la distance.
+def graphe_a_portee(nums_sat, coordonnees_sat, portee, pondere=False):
+    sources, cibles, distances = paires_a_portee(coordonnees_sat, portee)
+    poids = distances ** 2 if pondere else None
+    return ajouter_aretes_depuis_paires(nx.Graph(), nums_sat, sources, cibles, poids)
+
+
+# Cette fonction calcule une seule fois les paires à la plus grande portée et les trie par distance croissante.
+# Les arêtes d'une portée plus petite sont alors exactement le début de ces tableaux.
+def paires_triees(coordonnees_sat, portee_max):
+    sources, cibles, distances = paires_a_portee(coordonnees_sat, portee_max)
+    ordre = np.argsort(distances, kind='stable')
+    return sources[ordre], cibles[ordre], distances[ordre]
+
+
+# Nombre de paires (déjà triées par distance) dont la distance est inférieure ou égale à la portée
+def nombre_paires_a_portee(distances_triees, portee):
+    return int(np.searchsorted(distances_triees, portee, side='right'))
+
+
+# Cette fonction construit les graphes de toutes les portées demandées à partir d'une seule recherche de voisins.
+# Si un graphe de base est donné (par exemple le graphe sans arêtes de la partie 1), on en part d'une copie,
+# sinon seuls les satellites ayant au moins un voisin apparaissent, comme dans graphe_a_portee.
+def graphes_par_portee(nums_sat, coordonnees_sat, portees, pondere=False, graphe_base=None):
+    sources, cibles, distances = paires_triees(coordonnees_sat, max(portees))
+    poids = distances ** 2 if pondere else None
+
+    graphes = {}
+    for portee in portees:
+        k = nombre_paires_a_portee(distances, portee)
+        graphe = graphe_base.copy() if graphe_base is not None else nx.Graph()
+        graphes[portee] = ajouter_aretes_depuis_paires(graphe, nums_sat, sources[:k], cibles[:k],
+                                                       poids[:k] if poids is not None else None)
+    return graphes
@@ -0,0 +1,162 @@
+# L'objectif de ce fichier est de répartir l'analyse des configurations (densité × portée × mesure)
+# sur plusieurs processus. Les coordonnées de tous les essaims sont placées une seule fois dans un bloc
+# de mémoire partagée : les processus de calcul y accèdent directement, sans copie.
+#
+# Les fonctions de mesure doivent pouvoir être transmises aux processus (fonctions définies au niveau
+# d'un module) ; les scripts qui utilisent ce balayage doivent donc protéger leur code principal par
+# if __name__ == "__main__".
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from aretes import graphe_a_portee
+from cache_resultats import parametres_mesure
+from chargement import charger_topologie
+import instrumentation
+
+# État propre à chaque processus de calcul (initialisé une seule fois par processus)
+_memoire_partagee = None
+_essaims = None
+_mesures = None
+_fichiers = None
+_dernier_graphe = (None, None)
+
+
+def _initialiser_processus(nom_memoire, nombre_lignes, decalages, nums_sat, mesures, pondere, fichiers):
+    global _memoire_partagee, _essaims, _mesures, _fichiers
+    # Les processus de calcul partagent le suivi des ressources du processus principal,
+    # qui reste seul responsable de la libération du bloc
+    _memoire_partagee = shared_memory.SharedMemory(name=nom_memoire)
+    coordonnees = np.ndarray((nombre_lignes, 3), dtype=np.float64, buffer=_memoire_partagee.buf)
+    # Vues (sans copie) sur les coordonnées de chaque essaim
+    _essaims = [(nums_sat[debut:fin], coordonnees[debut:fin]) for debut, fin in zip(decalages[:-1], decalages[1:])]
+    _mesures = (mesures, pondere)
+    _fichiers = fichiers
+
+
+# Initialisation d'un processus du pool : l'état d'instrumentation hérité du processus principal est oublié
+def _initialiser_processus_pool(*initialisation):
+    instrumentation.reinitialiser_processus()
+    _initialiser_processus(*initialisation)
+
+
+# Un processus traite souvent plusieurs mesures de la même configuration à la suite :
+# on garde le dernier graphe construit
+def _graphe(indice, portee):
+    global _dernier_graphe
+    cle, graphe = _dernier_graphe
+    if cle != (indice, portee):
+        nums_sat, coordonnees = _essaims[indice]
+        with instrumentation.etape('creer_graphe') as mesure:
+            graphe = graphe_a_portee(nums_sat, coordonnees, portee, pondere=_mesures[1])
+            if mesure is not None:
+                mesure.graphe = graphe
+        _dernier_graphe = ((indice, portee), graphe)
+    return graphe
+
+
+# Avec l'instrumentation activée, les enregistrements du processus de calcul sont renvoyés avec le résultat
+def _executer_tache(tache):
+    indice, portee, nom = tache
+    mesures, _ = _mesures
+    if not instrumentation.est_actif():
+        return indice, portee, nom, mesures[nom](_graphe(indice, portee)), None
+    with instrumentation.configuration(Fichier=_fichiers[indice], Portée=portee):
+        resultat = mesures[nom](_graphe(indice, portee))
+    return indice, portee, nom, resultat, instrumentation.vider()
+
+
+# Cette fonction analyse toutes les configurations (fichier, portée) avec toutes les mesures
+# (dictionnaire nom -> fonction(graphe) renvoyant un dictionnaire de résultats) et renvoie un dictionnaire
+# (indice du fichier, portée) -> résultats fusionnés de toutes les mesures.
+# Chaque tâche (fichier, portée, mesure) est confiée au pool de processus ; si un cache est fourni
+# (voir cache_resultats.py), seules les mesures absentes du cache sont calculées ; les paramètres fixés par
+# functools.partial font partie de la clé.
+# Le coût qui sert de clé au cache se déduit de pondere ('distance2' pour les graphes pondérés par
+# creer_graphe_pond, 'sauts' sinon) ; un coût explicite doit lui correspondre.
+def executer_balayage(fichiers, portees, mesures, processus=None, cache=None, cout=None, pondere=False):
+    cout_graphe = 'distance2' if pondere else 'sauts'
+    if cout is None:
+        cout = cout_graphe
+    elif cout != cout_graphe:
+        raise ValueError(f"Coût '{cout}' incompatible avec pondere={pondere} (coût attendu : '{cout_graphe}')")
+    essaims = []
+    for fichier in fichiers:
+        with instrumentation.configuration(Fichier=fichier):
+            essaims.append(charger_topologie(fichier))
+    resultats = {(i, portee): {} for i in range(len(fichiers)) for portee in portees}
+
+    # On relit d'abord le cache, les tâches restantes seront calculées
+    parametres = {nom: parametres_mesure(fonction) for nom, fonction in mesures.items()}
+    taches = []
+    for i, fichier in enumerate(fichiers):
+        for portee in portees:
+            for nom in mesures:
+                present, resultat = (cache.obtenir(fichier, portee, cout, nom, parametres[nom]) if cache is not None
+                                     else (False, None))
+                if present:
+                    resultats[(i, portee)][nom] = resultat
+                else:
+                    taches.append((i, portee, nom))
+
+    if taches:
+        # Toutes les coordonnées dans un seul bloc de mémoire partagée
+        decalages = np.cumsum([0] + [len(nums) for nums, _ in essaims])
+        nums_sat = np.concatenate([nums for nums, _ in essaims])
+        memoire = shared_memory.SharedMemory(create=True, size=max(1, int(decalages[-1]) * 3 * 8))
+        coordonnees = None
+        try:
+            coordonnees = np.ndarray((int(decalages[-1]), 3), dtype=np.float64, buffer=memoire.buf)
+            for (_, coordonnees_essaim), debut in zip(essaims, decalages[:-1]):
+                coordonnees[debut:debut + len(coordonnees_essaim)] = coordonnees_essaim
+
+            initialisation = (memoire.name, int(decalages[-1]), decalages, nums_sat, mesures, pondere, list(fichiers))
+            if processus is None:
+                processus = os.cpu_count() or 1
+            processus = min(processus, len(taches))
+
+            if processus <= 1:
+                # Exécution dans le processus courant (utile pour le débogage)
+                _initialiser_processus(*initialisation)
+                calcules = map(_executer_tache, taches)
+            else:
+                pool = ProcessPoolExecutor(max_workers=processus, initializer=_initialiser_processus_pool,
+                                           initargs=initialisation)
+                # Les tâches d'une même configuration sont consécutives : on les envoie par paquets
+                calcules = pool.map(_executer_tache, taches, chunksize=max(1, len(mesures)))
+
+            try:
+                for i, portee, nom, resultat, trace in calcules:
+                    resultats[(i, portee)][nom] = resultat
+                    if trace:
+                        instrumentation.ajouter(trace)
+                    if cache is not None:
+                        cache.enregistrer(fichiers[i], portee, cout, nom, resultat, parametres[nom])
+            finally:
+                if processus > 1:
+                    pool.shutdown()
+        finally:
+            # Les vues sur le bloc doivent disparaître avant de le fermer
+            del coordonnees
+            _liberer_processus_courant()
+            memoire.close()
+            memoire.unlink()
+
+    # On fusionne les résultats des mesures, dans l'ordre des mesures
+    return {config: {cle: valeur for nom in mesures for cle, valeur in par_mesure[nom].items()}
+            for config, par_mesure in resultats.items()}
+
+
+# Libère les vues sur la mémoire partagée si le calcul a eu lieu dans le processus courant
+def _liberer_processus_courant():
+    global _memoire_partagee, _essaims, _mesures, _fichiers, _dernier_graphe
+    if _memoire_partagee is not None:
+        _essaims = None
+        _mesures = None
+        _fichiers = None
+        _dernier_graphe = (None, None)
+        _memoire_partagee.close()
+        _memoire_partagee = None
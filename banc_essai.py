@@ -0,0 +1,181 @@
+# L'objectif de ce fichier est de mesurer le passage à l'échelle des analyses : pour des essaims synthétiques
+# (voir generateur_essaim.py) de taille croissante, on chronomètre chaque étape et on mesure son pic de
+# mémoire, puis on écrit les résultats dans un fichier JSON pour les comparer d'une version à l'autre.
+#
+#     python banc_essai.py --tailles 100 1000 10000 100000 --densite forte --portee 40000 --sortie banc.json
+#
+# Chaque étape est exécutée une première fois pour la mesure de durée (meilleure de plusieurs répétitions),
+# puis une seconde fois sous tracemalloc pour le pic de mémoire (tracemalloc ralentit fortement les calculs,
+# les deux mesures sont donc séparées). Une étape qui dépasse la durée maximale n'est plus lancée pour les
+# tailles suivantes ; elle apparaît avec le statut 'ignorée'.
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Étapes mesurées, dans l'ordre d'exécution
+etapes = ['conversion', 'chargement', 'creer_graphe', 'degres', 'clustering', 'cliques', 'composantes',
+          'chemins', 'chemins_ponderes']
+
+# Étapes qui analysent le graphe construit par creer_graphe
+etapes_sur_graphe = ['degres', 'clustering', 'cliques', 'composantes', 'chemins']
+
+# Au-delà de ces tailles, les étapes en O(n²) de mémoire ne sont pas lancées (matrice n × n)
+tailles_max = {'chemins': 30000, 'chemins_ponderes': 30000}
+
+
+# Fonctions de chaque étape : elles reçoivent le contexte (fichier, essaim, graphes) et renvoient
+# éventuellement une valeur à conserver dans le contexte
+def _fonctions_etapes(duree_cliques):
+    from chargement import charger_topologie
+    from analyse import creer_graphe, analyser_degres
+    from triangles import triangles_et_clustering
+    from cliques import histogramme_cliques
+    from connexite import composantes_connexes
+    from chemins import histogramme_sauts, matrice_distances_ponderees
+
+    def conversion(contexte):
+        # Première lecture : analyse du CSV et écriture des fichiers binaires
+        for fichier in os.listdir(contexte['repertoire']):
+            os.remove(os.path.join(contexte['repertoire'], fichier))
+        return charger_topologie(contexte['fichier'], repertoire=contexte['repertoire'])
+
+    return {
+        'conversion': (conversion, None),
+        'chargement': (lambda c: charger_topologie(c['fichier'], repertoire=c['repertoire']), 'essaim'),
+        'creer_graphe': (lambda c: creer_graphe(c['essaim'], c['portee']), 'graphe'),
+        'degres': (lambda c: analyser_degres(c['graphe']), None),
+        'clustering': (lambda c: triangles_et_clustering(c['graphe']), None),
+        'cliques': (lambda c: histogramme_cliques(c['graphe'], duree_max=duree_cliques), 'cliques'),
+        'composantes': (lambda c: composantes_connexes(c['graphe']), None),
+        'chemins': (lambda c: histogramme_sauts(c['graphe']), None),
+        'chemins_ponderes': (lambda c: matrice_distances_ponderees(creer_graphe(c['essaim'], c['portee'], pondere=True)),
+                             None),
+    }
+
+
+# On mesure la durée (meilleure de repetitions exécutions) de l'étape
+def _chronometrer(fonction, contexte, repetitions):
+    meilleure = None
+    valeur = None
+    for _ in range(repetitions):
+        gc.collect()
+        debut = time.perf_counter()
+        valeur = fonction(contexte)
+        duree = time.perf_counter() - debut
+        meilleure = duree if meilleure is None else min(meilleure, duree)
+    return meilleure, valeur
+
+
+# On mesure le pic de mémoire allouée pendant l'étape (tableaux NumPy compris)
+def _memoire(fonction, contexte):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fonction(contexte)
+        _, pic = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return pic
+
+
+def _versions():
+    versions = {'python': platform.python_version(), 'plateforme': platform.platform()}
+    for module in ('numpy', 'scipy', 'networkx', 'pandas'):
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            versions[module] = None
+    return versions
+
+
+# Cette fonction exécute le banc d'essai et renvoie la liste des mesures (une par taille et par étape)
+#   tailles : nombres de satellites des essaims synthétiques
+#   densite : essaim de référence du générateur ('faible', 'moyenne', 'forte')
+#   duree_max : une étape plus longue (en secondes) n'est plus lancée pour les tailles suivantes
+#   memoire : si False, on ne fait pas la seconde exécution sous tracemalloc
+def executer_banc(tailles, densite='forte', portee=40000, repetitions=1, duree_max=60.0, duree_cliques=10.0,
+                  memoire=True, graine=0, etapes_choisies=None):
+    from generateur_essaim import generer_essaim, enregistrer_essaim
+
+    fonctions = _fonctions_etapes(duree_cliques)
+    etapes_choisies = etapes if etapes_choisies is None else etapes_choisies
+    besoin_graphe = any(etape in etapes_choisies for etape in etapes_sur_graphe)
+    abandonnees = set()
+    mesures = []
+
+    with tempfile.TemporaryDirectory() as repertoire:
+        for taille in sorted(tailles):
+            nums_sat, coordonnees_sat = generer_essaim(densite, taille, graine=graine)
+            contexte = {'fichier': os.path.join(repertoire, f"essaim_{taille}.csv"),
+                        'repertoire': os.path.join(repertoire, 'binaires'), 'portee': portee}
+            os.makedirs(contexte['repertoire'], exist_ok=True)
+            enregistrer_essaim(contexte['fichier'], nums_sat, coordonnees_sat)
+            # Les étapes suivantes ont besoin de l'essaim, même si le chargement n'est pas mesuré
+            contexte['essaim'] = (nums_sat, coordonnees_sat)
+
+            for etape in etapes:
+                # creer_graphe est toujours exécutée si une étape suivante a besoin du graphe
+                if etape not in etapes_choisies and not (etape == 'creer_graphe' and besoin_graphe):
+                    continue
+                fonction, cle = fonctions[etape]
+                mesure = {'Taille': taille, 'Étape': etape}
+                if etape in abandonnees or taille > tailles_max.get(etape, taille) or \
+                        (etape in etapes_sur_graphe and 'graphe' not in contexte):
+                    mesure['Statut'] = 'ignorée'
+                    mesures.append(mesure)
+                    continue
+
+                duree, valeur = _chronometrer(fonction, contexte, repetitions)
+                if cle is not None:
+                    contexte[cle] = valeur
+                mesure['Durée (s)'] = duree
+                if memoire:
+                    mesure['Pic de Mémoire (octets)'] = _memoire(fonction, contexte)
+                if 'graphe' in contexte:
+                    mesure['Noeuds'] = contexte['graphe'].number_of_nodes()
+                    mesure['Arêtes'] = contexte['graphe'].number_of_edges()
+                mesure['Statut'] = 'partielle' if cle == 'cliques' and valeur['Partiel'] else 'ok'
+                if duree > duree_max:
+                    abandonnees.add(etape)
+                mesures.append(mesure)
+            print(f"taille {taille} : terminé", file=sys.stderr)
+    return mesures
+
+
+# Cette fonction écrit les mesures et leur contexte (paramètres, versions) dans un fichier JSON
+def enregistrer_banc(fichier, mesures, parametres):
+    with open(fichier, 'w') as f:
+        json.dump({'Date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'Paramètres': parametres, 'Versions': _versions(),
+                   'Mesures': mesures}, f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    analyseur = argparse.ArgumentParser(description="Banc d'essai du passage à l'échelle des analyses")
+    analyseur.add_argument('--tailles', nargs='+', type=int, default=[100, 1000, 10000, 100000])
+    analyseur.add_argument('--densite', default='forte', choices=['faible', 'moyenne', 'forte'])
+    analyseur.add_argument('--portee', type=float, default=40000)
+    analyseur.add_argument('--etapes', nargs='+', choices=etapes, help="étapes à mesurer (toutes par défaut)")
+    analyseur.add_argument('--repetitions', type=int, default=1)
+    analyseur.add_argument('--duree-max', type=float, default=60.0)
+    analyseur.add_argument('--duree-cliques', type=float, default=10.0, help="budget de l'énumération des cliques")
+    analyseur.add_argument('--sans-memoire', action='store_true', help="ne pas mesurer le pic de mémoire")
+    analyseur.add_argument('--graine', type=int, default=0)
+    analyseur.add_argument('--sortie', default='banc_essai.json')
+    arguments = analyseur.parse_args()
+
+    parametres = {'Tailles': arguments.tailles, 'Densité': arguments.densite, 'Portée': arguments.portee,
+                  'Répétitions': arguments.repetitions, 'Durée Maximale': arguments.duree_max,
+                  'Durée des Cliques': arguments.duree_cliques, 'Graine': arguments.graine}
+    mesures = executer_banc(arguments.tailles, arguments.densite, arguments.portee, arguments.repetitions,
+                            arguments.duree_max, arguments.duree_cliques, not arguments.sans_memoire,
+                            arguments.graine, arguments.etapes)
+    enregistrer_banc(arguments.sortie, mesures, parametres)
+    for mesure in mesures:
+        print(mesure)
@@ -0,0 +1,113 @@
+# L'objectif de ce fichier est de conserver sur disque les résultats des analyses de graphes, pour ne pas
+# tout recalculer à chaque exécution des scripts. Un résultat est identifié par l'empreinte (SHA-256) du
+# contenu du fichier de topologie, la portée, le modèle de coût des arêtes, le nom de la mesure et ses
+# paramètres (budgets, précision...) quand elle en a.
+# La taille totale du cache est bornée : les entrées les moins récemment utilisées sont supprimées en premier.
+
+import functools
+import hashlib
+import os
+import pickle
+
+# À incrémenter lorsque le calcul d'une mesure change, pour invalider les résultats déjà enregistrés
+VERSION_CACHE = 4
+
+REPERTOIRE_CACHE = ".cache_graphes"
+TAILLE_MAX_CACHE = 256 * 1024 * 1024  # octets
+
+
+class CacheResultats:
+
+    def __init__(self, repertoire=REPERTOIRE_CACHE, taille_max=TAILLE_MAX_CACHE):
+        self.repertoire = repertoire
+        self.taille_max = taille_max
+        # Empreintes déjà calculées : chemin -> (taille, date de modification, empreinte)
+        self._empreintes = {}
+        os.makedirs(repertoire, exist_ok=True)
+
+    # Empreinte du contenu d'un fichier (recalculée seulement si le fichier a changé)
+    def empreinte_fichier(self, fichier):
+        etat = os.stat(fichier)
+        connue = self._empreintes.get(fichier)
+        if connue is not None and connue[:2] == (etat.st_size, etat.st_mtime_ns):
+            return connue[2]
+        sha = hashlib.sha256()
+        with open(fichier, 'rb') as f:
+            for bloc in iter(lambda: f.read(1 << 20), b''):
+                sha.update(bloc)
+        empreinte = sha.hexdigest()
+        self._empreintes[fichier] = (etat.st_size, etat.st_mtime_ns, empreinte)
+        return empreinte
+
+    def _chemin(self, fichier, portee, cout, mesure, parametres=None):
+        cle = f"{VERSION_CACHE}|{self.empreinte_fichier(fichier)}|{portee}|{cout}|{mesure}"
+        if parametres:
+            cle += f"|{sorted(parametres.items())!r}"
+        return os.path.join(self.repertoire, hashlib.sha256(cle.encode()).hexdigest() + ".pkl")
+
+    # On renvoie (True, résultat) si le résultat est en cache, (False, None) sinon
+    def obtenir(self, fichier, portee, cout, mesure, parametres=None):
+        chemin = self._chemin(fichier, portee, cout, mesure, parametres)
+        try:
+            with open(chemin, 'rb') as f:
+                resultat = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return False, None
+        # La date de modification sert de date de dernière utilisation pour l'éviction
+        os.utime(chemin)
+        return True, resultat
+
+    def enregistrer(self, fichier, portee, cout, mesure, resultat, parametres=None):
+        chemin = self._chemin(fichier, portee, cout, mesure, parametres)
+        # Écriture dans un fichier temporaire puis renommage, pour ne jamais laisser d'entrée incomplète
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        with open(temporaire, 'wb') as f:
+            pickle.dump(resultat, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporaire, chemin)
+        self.evincer()
+
+    # On supprime les entrées les moins récemment utilisées tant que le cache dépasse sa taille maximale
+    def evincer(self):
+        entrees = []
+        for nom in os.listdir(self.repertoire):
+            if not nom.endswith(".pkl"):
+                continue
+            chemin = os.path.join(self.repertoire, nom)
+            try:
+                etat = os.stat(chemin)
+            except FileNotFoundError:
+                continue
+            entrees.append((etat.st_mtime_ns, etat.st_size, chemin))
+
+        taille_totale = sum(taille for _, taille, _ in entrees)
+        for _, taille, chemin in sorted(entrees):
+            if taille_totale <= self.taille_max:
+                break
+            try:
+                os.remove(chemin)
+            except FileNotFoundError:
+                pass
+            taille_totale -= taille
+
+    # On renvoie le résultat en cache, ou on le calcule avec fonction() puis on l'enregistre
+    def calculer(self, fichier, portee, cout, mesure, fonction, parametres=None):
+        present, resultat = self.obtenir(fichier, portee, cout, mesure, parametres)
+        if not present:
+            resultat = fonction()
+            self.enregistrer(fichier, portee, cout, mesure, resultat, parametres)
+        return resultat
+
+
+# Paramètres d'une mesure fixés par functools.partial (par exemple partial(analyser_cliques, duree_max=5)) :
+# ils entrent dans la clé du cache, pour qu'un résultat obtenu avec un budget ne serve pas à un appel sans budget
+def parametres_mesure(fonction):
+    parametres = {}
+    positionnels = ()
+    while isinstance(fonction, functools.partial):
+        # Comme à l'appel, les arguments du partial le plus extérieur l'emportent
+        parametres = {**fonction.keywords, **parametres}
+        positionnels = fonction.args + positionnels
+        fonction = fonction.func
+    if positionnels:
+        parametres['*'] = positionnels
+    return parametres
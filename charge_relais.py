@@ -0,0 +1,214 @@
+# L'objectif de ce fichier est de mesurer la charge de relais de chaque satellite et de chaque lien
+# (intermédiarité des sommets et des arêtes) dans les graphes de creer_graphe / creer_graphe_pond,
+# en nombre de sauts ou avec le coût distance².
+#
+# On suit l'algorithme de Brandes, vectorisé sur des lots de sources : les distances sont calculées par
+# scipy.sparse.csgraph, puis on ne garde que les arcs « tendus » (dist(s, u) + w(u, v) = dist(s, v)), qui
+# forment le graphe orienté sans circuit des plus courts chemins issus de chaque source. Le nombre de plus
+# courts chemins σ et les dépendances δ se propagent le long de ces arcs dans un ordre topologique, front par
+# front, en ne lisant que les arcs issus du front courant. Les lots de sources sont répartis sur un pool de
+# processus.
+#
+# Le mode exact traite toutes les sources ; le mode échantillonné n'en traite que quelques-unes (pivots
+# tirés uniformément) et extrapole, avec une borne d'erreur de Hoeffding.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.sparse.csgraph import dijkstra, shortest_path
+
+from chemins import matrice_adjacence_csr, TAILLE_BLOC
+
+# Tolérance relative pour décider qu'un arc est tendu avec des coûts réels
+TOLERANCE_RELATIVE = 1e-10
+
+# Données du graphe dans chaque processus de calcul (transmises une seule fois par processus)
+_graphe_processus = None
+
+
+def _initialiser_processus(adjacence, pondere):
+    global _graphe_processus
+    _graphe_processus = _preparer(adjacence, pondere)
+
+
+# On prépare les arcs (dans les deux sens), rangés comme dans la matrice CSR
+def _preparer(adjacence, pondere):
+    n = adjacence.shape[0]
+    degres = np.diff(adjacence.indptr)
+    origines = np.repeat(np.arange(n), degres)
+    extremites = adjacence.indices.astype(np.int64)
+    couts = adjacence.data.astype(np.float64) if pondere else np.ones(len(extremites))
+    return {
+        'adjacence': adjacence, 'pondere': pondere, 'n': n, 'degres': degres,
+        'origines': origines, 'extremites': extremites, 'couts': couts,
+    }
+
+
+# Indices (dans les tableaux des arcs tendus, rangés par clé d'origine) des arcs tendus issus des sommets
+# d'un front : on lit les intervalles pointeurs[cle] à pointeurs[cle + 1] - 1, comme dans une matrice CSR
+def _arcs_du_front(pointeurs, front):
+    premiers = pointeurs[front]
+    degres = pointeurs[front + 1] - premiers
+    position = np.repeat(np.arange(len(front)), degres)
+    return premiers[position] + np.arange(len(position)) - np.repeat(np.cumsum(degres) - degres, degres)
+
+
+# Dépendances de toutes les sources d'un lot : on renvoie la somme sur le lot des δ_s(v) (sommets)
+# et des contributions de chaque arc (arêtes parcourues dans un sens donné).
+# Les arcs tendus forment un graphe sans circuit : on le parcourt dans un ordre topologique (un sommet entre
+# dans le front quand tous ses arcs tendus entrants ont été traités, ce qui respecte l'ordre des distances),
+# et chaque phase ne lit que les arcs tendus issus du front courant, soit O(m) par source comme dans Brandes.
+# Un sommet v de la ligne l du lot est repéré par la clé l * n + v dans les tableaux aplatis.
+def _dependances_lot(graphe, sources):
+    n = graphe['n']
+    origines, extremites, couts = graphe['origines'], graphe['extremites'], graphe['couts']
+    lignes = np.arange(len(sources))
+
+    if graphe['pondere']:
+        distances = dijkstra(graphe['adjacence'], directed=False, indices=sources)
+    else:
+        distances = shortest_path(graphe['adjacence'], method='D', unweighted=True, directed=False, indices=sources)
+
+    # Arcs tendus : ceux qui prolongent un plus court chemin issu de la source. Pour les sommets non atteints,
+    # l'allongement vaut inf ou nan (inf - inf) et l'arc est écarté. On travaille sur la transposée
+    # (sommets × lot) : lire les distances aux extrémités des arcs revient alors à copier des lignes contiguës.
+    # En sauts, float32 reste exact et divise par deux la mémoire parcourue.
+    distances = np.ascontiguousarray(distances.T, dtype=np.float64 if graphe['pondere'] else np.float32)
+    arrivee = distances[extremites]
+    with np.errstate(invalid='ignore'):
+        allongement = arrivee - np.repeat(distances, graphe['degres'], axis=0)
+        if graphe['pondere']:
+            tendus = np.isfinite(allongement) & \
+                (np.abs(allongement - couts[:, np.newaxis]) <= TOLERANCE_RELATIVE * np.maximum(arrivee, 1.0))
+        else:
+            tendus = allongement == 1
+    del arrivee, allongement
+
+    # Les arcs tendus sont rangés par ligne puis par origine (ordre CSR) : les arcs issus d'une même clé
+    # sont consécutifs, pointeurs joue le rôle de indptr
+    lignes_tendus, arcs_tendus = np.divmod(np.flatnonzero(tendus.T), len(extremites))
+    del tendus
+    cles_origines = lignes_tendus * n + origines[arcs_tendus]
+    cles_extremites = lignes_tendus * n + extremites[arcs_tendus]
+    del lignes_tendus
+    pointeurs = np.zeros(len(sources) * n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(cles_origines, minlength=len(sources) * n), out=pointeurs[1:])
+    # Nombre d'arcs tendus entrants pas encore traités
+    restants = np.bincount(cles_extremites, minlength=len(sources) * n)
+    marques = np.full(len(sources) * n, -1, dtype=np.int64)
+
+    # Phase avant : σ, front par front ; on garde les arcs tendus de chaque front pour la phase arrière
+    sigma = np.zeros(len(sources) * n)
+    front = lignes * n + np.asarray(sources, dtype=np.int64)
+    sigma[front] = 1.0
+    fronts = []
+    while len(front) > 0:
+        arcs = _arcs_du_front(pointeurs, front)
+        if len(arcs) == 0:
+            break
+        fronts.append(arcs)
+        cibles = cles_extremites[arcs]
+        np.add.at(sigma, cibles, sigma[cles_origines[arcs]])
+        np.subtract.at(restants, cibles, 1)
+        # Front suivant : sommets dont tous les arcs tendus entrants ont été traités (chacun une seule fois)
+        prets = cibles[restants[cibles] == 0]
+        marques[prets] = np.arange(len(prets))
+        front = prets[marques[prets] == np.arange(len(prets))]
+
+    # Phase arrière : δ(v) = Σ σ(v) / σ(w) (1 + δ(w)) sur les arcs tendus v -> w, fronts pris à rebours
+    # (les extrémités w d'un front sont toutes dans des fronts ultérieurs, donc déjà traitées)
+    delta = np.zeros(len(sources) * n)
+    contributions = np.zeros(len(arcs_tendus))
+    for arcs in reversed(fronts):
+        departs, cibles = cles_origines[arcs], cles_extremites[arcs]
+        contributions[arcs] = sigma[departs] / sigma[cibles] * (1.0 + delta[cibles])
+        np.add.at(delta, departs, contributions[arcs])
+
+    # Contribution de chaque arc tendu v -> w : σ(v) / σ(w) (1 + δ(w))
+    contributions_arcs = np.bincount(arcs_tendus, weights=contributions, minlength=len(extremites))
+
+    # La source ne compte pas dans sa propre dépendance
+    delta[lignes * n + sources] = 0.0
+    return delta.reshape(len(sources), n).sum(axis=0), contributions_arcs
+
+
+def _executer_lot(sources):
+    return _dependances_lot(_graphe_processus, sources)
+
+
+# Cette fonction calcule l'intermédiarité (non normalisée, conventions de NetworkX pour un graphe non orienté)
+# des sommets et des arêtes du graphe.
+#   poids : None pour compter les sauts, 'weight' pour le coût distance² de creer_graphe_pond
+#   nombre_pivots : None pour le calcul exact, sinon nombre de sources tirées au hasard
+#   confiance : niveau de confiance de la borne d'erreur en mode échantillonné
+#   processus : nombre de processus (None : tous les coeurs, 1 : calcul dans le processus courant)
+# On renvoie des tableaux NumPy indexés comme 'sat_id' (sommets) et 'Arêtes' (paires de sat_id).
+def charge_relais(graphe, poids=None, nombre_pivots=None, confiance=0.95, processus=None, graine=None,
+                  taille_lot=None):
+    adjacence, noeuds = matrice_adjacence_csr(graphe, poids=poids)
+    adjacence = adjacence.tocsr()
+    adjacence.sum_duplicates()
+    pondere = poids is not None
+    n = len(noeuds)
+
+    if nombre_pivots is None or nombre_pivots >= n:
+        sources = np.arange(n)
+        facteur = 1.0
+    else:
+        generateur = np.random.default_rng(graine)
+        sources = np.sort(generateur.choice(n, size=nombre_pivots, replace=False))
+        facteur = n / nombre_pivots
+
+    # Chaque lot manipule des tableaux (sources × arcs) : on borne leur taille
+    if taille_lot is None:
+        taille_lot = TAILLE_BLOC // max(adjacence.nnz, n, 1)
+    taille_lot = max(1, min(len(sources), taille_lot)) if len(sources) > 0 else 1
+    lots = [sources[debut:debut + taille_lot] for debut in range(0, len(sources), taille_lot)]
+
+    if processus is None:
+        processus = os.cpu_count() or 1
+    processus = min(processus, len(lots))
+
+    intermediarite = np.zeros(n)
+    contributions_arcs = np.zeros(adjacence.nnz)
+    if processus <= 1:
+        graphe_prepare = _preparer(adjacence, pondere)
+        resultats_lots = (_dependances_lot(graphe_prepare, lot) for lot in lots)
+        for dependances, contributions in resultats_lots:
+            intermediarite += dependances
+            contributions_arcs += contributions
+    else:
+        with ProcessPoolExecutor(max_workers=processus, initializer=_initialiser_processus,
+                                 initargs=(adjacence, pondere)) as pool:
+            for dependances, contributions in pool.map(_executer_lot, lots):
+                intermediarite += dependances
+                contributions_arcs += contributions
+
+    # Graphe non orienté : chaque paire est comptée depuis ses deux extrémités
+    intermediarite *= facteur / 2
+    origines = np.repeat(np.arange(n), np.diff(adjacence.indptr))
+    extremites = adjacence.indices
+    # On regroupe les deux sens de chaque arête (u < v)
+    cles = np.minimum(origines, extremites).astype(np.int64) * n + np.maximum(origines, extremites)
+    cles_aretes, inverse = np.unique(cles, return_inverse=True)
+    intermediarite_aretes = np.bincount(inverse, weights=contributions_arcs, minlength=len(cles_aretes))
+    intermediarite_aretes *= facteur / 2
+
+    noeuds = np.asarray(noeuds)
+    aretes = np.column_stack([noeuds[cles_aretes // n], noeuds[cles_aretes % n]]).reshape(-1, 2)
+
+    # Borne de Hoeffding (avec union sur les n sommets) : chaque dépendance δ_s(v) est dans [0, n - 2]
+    borne_erreur = None
+    if facteur != 1.0:
+        k = len(sources)
+        borne_erreur = n * (n - 2) * np.sqrt(np.log(2 * n / (1 - confiance)) / (2 * k)) / 2
+
+    return {
+        'sat_id': noeuds,
+        'Intermédiarité': intermediarite,
+        'Arêtes': aretes,
+        'Intermédiarité des Arêtes': intermediarite_aretes,
+        'Exact': facteur == 1.0,
+        "Borne d'Erreur": borne_erreur,
+    }
@@ -0,0 +1,106 @@
+# L'objectif de ce fichier est de charger rapidement les positions des satellites.
+# Chaque fichier CSV est converti une seule fois dans un format binaire en colonnes (fichiers .npy) ;
+# les chargements suivants projettent directement ces fichiers en mémoire (np.load avec mmap_mode) et
+# renvoient des tableaux float64 contigus, sans copie, utilisables tels quels par les constructeurs de graphes.
+# La conversion est refaite automatiquement si le fichier CSV a changé (taille ou date de modification).
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from instrumentation import instrumenter
+
+REPERTOIRE_BINAIRES = ".cache_topologies"
+
+
+# Chemins des fichiers binaires associés à un fichier CSV ; le nom contient une empreinte du chemin absolu,
+# pour que deux CSV de même nom dans des dossiers différents ne partagent pas le même cache
+def _chemins_binaires(fichier_csv, repertoire):
+    empreinte = hashlib.sha256(os.path.abspath(fichier_csv).encode()).hexdigest()[:12]
+    nom = os.path.splitext(os.path.basename(fichier_csv))[0]
+    base = os.path.join(repertoire, f"{nom}_{empreinte}")
+    return base + ".json", base + ".sat_id.npy", base + ".xyz.npy", base + ".temps.npy", base + ".decalages.npy"
+
+
+def _etat_source(fichier_csv):
+    etat = os.stat(fichier_csv)
+    return {'source': os.path.abspath(fichier_csv), 'taille': etat.st_size, 'date': etat.st_mtime_ns}
+
+
+# Écriture d'un tableau dans un fichier temporaire puis renommage (un lecteur ne voit jamais de fichier incomplet)
+def _enregistrer(chemin, tableau):
+    temporaire = f"{chemin}.{os.getpid()}.tmp"
+    with open(temporaire, 'wb') as f:
+        np.save(f, tableau)
+    os.replace(temporaire, chemin)
+
+
+# Conversion du CSV en fichiers binaires. S'il contient une colonne de temps, les lignes sont triées par
+# (temps, sat_id) et on enregistre aussi les instants et le début de chaque instantané dans les tableaux.
+def _convertir(fichier_csv, chemins, colonne_temps):
+    # pandas n'est nécessaire que pour la conversion, les chargements suivants s'en passent
+    import pandas as pd
+    meta, chemin_ids, chemin_xyz, chemin_temps, chemin_decalages = chemins
+    essaim_DF = pd.read_csv(fichier_csv)
+    temporel = colonne_temps is not None and colonne_temps in essaim_DF.columns
+    if temporel:
+        essaim_DF = essaim_DF.sort_values([colonne_temps, 'sat_id'], kind='stable')
+        temps = essaim_DF[colonne_temps].to_numpy()
+        debuts = np.flatnonzero(np.r_[True, temps[1:] != temps[:-1]])
+        _enregistrer(chemin_temps, temps[debuts])
+        _enregistrer(chemin_decalages, np.r_[debuts, len(temps)].astype(np.int64))
+    _enregistrer(chemin_ids, essaim_DF['sat_id'].to_numpy())
+    _enregistrer(chemin_xyz, np.ascontiguousarray(essaim_DF[['x', 'y', 'z']].to_numpy(dtype=np.float64)))
+    # Les métadonnées sont écrites en dernier : elles valident la conversion
+    with open(meta + f".{os.getpid()}.tmp", 'w') as f:
+        json.dump(dict(_etat_source(fichier_csv), temporel=temporel), f)
+    os.replace(meta + f".{os.getpid()}.tmp", meta)
+    return temporel
+
+
+def _preparer(fichier_csv, repertoire, colonne_temps):
+    os.makedirs(repertoire, exist_ok=True)
+    chemins = _chemins_binaires(fichier_csv, repertoire)
+    try:
+        with open(chemins[0]) as f:
+            meta = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        meta = None
+    etat = _etat_source(fichier_csv)
+    if meta is None or any(meta.get(cle) != valeur for cle, valeur in etat.items()) or \
+            (colonne_temps is not None and not meta.get('temporel')):
+        temporel = _convertir(fichier_csv, chemins, colonne_temps)
+    else:
+        temporel = meta['temporel']
+    return chemins, temporel
+
+
+# Cette fonction renvoie (nums_sat, coordonnees_sat) pour un fichier au format de topology_*.csv.
+# Les tableaux sont projetés en mémoire en lecture seule (pas de copie, pas d'analyse du CSV).
+@instrumenter()
+def charger_topologie(fichier_csv, repertoire=REPERTOIRE_BINAIRES):
+    (_, chemin_ids, chemin_xyz, _, _), _ = _preparer(fichier_csv, repertoire, None)
+    return np.load(chemin_ids, mmap_mode='r'), np.load(chemin_xyz, mmap_mode='r')
+
+
+# Cette fonction charge un fichier de trajectoires (colonne de temps en plus de sat_id, x, y, z) et renvoie
+# (temps, decalages, nums_sat, coordonnees_sat) : les lignes de l'instantané k sont decalages[k]:decalages[k + 1].
+@instrumenter()
+def charger_trajectoires(fichier_csv, colonne_temps='temps', repertoire=REPERTOIRE_BINAIRES):
+    (_, chemin_ids, chemin_xyz, chemin_temps, chemin_decalages), temporel = \
+        _preparer(fichier_csv, repertoire, colonne_temps)
+    if not temporel:
+        raise ValueError(f"Le fichier {fichier_csv} n'a pas de colonne de temps '{colonne_temps}'")
+    return (np.load(chemin_temps), np.load(chemin_decalages),
+            np.load(chemin_ids, mmap_mode='r'), np.load(chemin_xyz, mmap_mode='r'))
+
+
+# On renvoie (nums_sat, coordonnees_sat) pour un essaim donné soit sous forme de DataFrame (colonnes
+# sat_id, x, y, z), soit sous forme du couple renvoyé par charger_topologie.
+def nums_et_coordonnees(essaim):
+    if isinstance(essaim, tuple):
+        nums_sat, coordonnees_sat = essaim
+        return nums_sat, coordonnees_sat
+    return essaim['sat_id'].to_numpy(), essaim[['x', 'y', 'z']].to_numpy(dtype=np.float64)
@@ -0,0 +1,238 @@
+# L'objectif de ce fichier est de calculer les plus courts chemins entre toutes les paires de satellites
+# à partir de la matrice d'adjacence creuse (format CSR) du graphe, avec les routines compilées de
+# scipy.sparse.csgraph, sans passer par les dictionnaires de nx.shortest_path_length.
+
+import numpy as np
+import networkx as nx
+from scipy.sparse import csr_array
+from scipy.sparse.csgraph import shortest_path, dijkstra
+
+from graphe_essaim import GrapheEssaim
+
+# Nombre maximal de distances calculées simultanément (sources du lot × sommets)
+TAILLE_BLOC = 1 << 22
+
+
+# Cette fonction renvoie la matrice d'adjacence creuse du graphe et la liste des sommets dans l'ordre
+# des lignes de la matrice. Si poids est donné (par exemple 'weight'), la matrice contient les poids des arêtes.
+# Le graphe peut être un nx.Graph ou un GrapheEssaim (dont la matrice est déjà stockée au format CSR).
+def matrice_adjacence_csr(graphe, poids=None):
+    if isinstance(graphe, GrapheEssaim):
+        return graphe.adjacence(poids), graphe.nodes()
+    noeuds = list(graphe.nodes())
+    adjacence = nx.to_scipy_sparse_array(graphe, nodelist=noeuds, weight=poids, format='csr')
+    return adjacence, noeuds
+
+
+# Cette fonction construit directement la matrice d'adjacence creuse (symétrique) à partir des tableaux
+# d'arêtes renvoyés par aretes.paires_a_portee. poids peut être n'importe quel coût positif (distance²...).
+def matrice_adjacence_depuis_paires(n, sources, cibles, poids=None):
+    if poids is None:
+        poids = np.ones(len(sources))
+    lignes = np.concatenate([sources, cibles])
+    colonnes = np.concatenate([cibles, sources])
+    valeurs = np.concatenate([poids, poids]).astype(np.float64)
+    return csr_array((valeurs, (lignes, colonnes)), shape=(n, n))
+
+
+# Nombre de sources traitées ensemble pour que chaque lot tienne dans TAILLE_BLOC distances
+def taille_lot_sources(n, taille_lot=None):
+    if taille_lot is None:
+        taille_lot = TAILLE_BLOC // max(n, 1)
+    return max(1, min(n, taille_lot))
+
+
+# Cette fonction calcule la distribution des longueurs (en nombre de sauts) des plus courts chemins entre
+# toutes les paires de sommets connectés, sans jamais construire la liste des distances paire par paire.
+# Les parcours en largeur sont faits par lots de sources ; chaque paire {u, v} est comptée une seule fois.
+# On renvoie l'histogramme (histogramme[k] = nombre de paires à k sauts), la longueur moyenne et le nombre de paires.
+def histogramme_sauts(graphe, taille_lot=None):
+    adjacence, noeuds = matrice_adjacence_csr(graphe)
+    n = len(noeuds)
+    histogramme = np.zeros(1, dtype=np.int64)
+
+    taille_lot = taille_lot_sources(n, taille_lot)
+    for debut in range(0, n, taille_lot):
+        sources = np.arange(debut, min(debut + taille_lot, n))
+        distances = shortest_path(adjacence, method='D', unweighted=True, directed=False, indices=sources)
+        # On ne garde que les cibles d'indice supérieur à la source (paires non ordonnées)
+        garder = np.arange(n)[np.newaxis, :] > sources[:, np.newaxis]
+        garder &= np.isfinite(distances)
+        comptes = np.bincount(distances[garder].astype(np.int64))
+        if len(comptes) > len(histogramme):
+            histogramme = np.pad(histogramme, (0, len(comptes) - len(histogramme)))
+        histogramme[:len(comptes)] += comptes
+
+    nombre_paires = int(histogramme.sum())
+    moyenne = float(np.dot(np.arange(len(histogramme)), histogramme) / nombre_paires) if nombre_paires > 0 else None
+    return histogramme, moyenne, nombre_paires
+
+
+# Type entier le plus compact pour stocker des indices de sommets (et -1 pour "pas de prédécesseur")
+def type_indices(n):
+    return np.int16 if n < np.iinfo(np.int16).max else np.int32
+
+
+# Cette fonction calcule les plus courts chemins pondérés entre toutes les paires de sommets (Dijkstra compilé,
+# par lots de sources) à partir d'une matrice d'adjacence pondérée, et renvoie une matrice dense float32
+# (np.inf entre sommets non connectés). Si predecesseurs vaut True, on renvoie aussi la matrice compacte des
+# prédécesseurs (predecesseurs[i, j] = avant-dernier sommet du chemin de i à j, -1 s'il n'existe pas).
+def distances_ponderees_csr(adjacence, predecesseurs=False, taille_lot=None):
+    n = adjacence.shape[0]
+    distances = np.empty((n, n), dtype=np.float32)
+    matrice_predecesseurs = np.empty((n, n), dtype=type_indices(n)) if predecesseurs else None
+
+    taille_lot = taille_lot_sources(n, taille_lot)
+    for debut in range(0, n, taille_lot):
+        sources = np.arange(debut, min(debut + taille_lot, n))
+        if predecesseurs:
+            distances_lot, predecesseurs_lot = dijkstra(adjacence, directed=False, indices=sources,
+                                                        return_predecessors=True)
+            predecesseurs_lot[predecesseurs_lot < 0] = -1
+            matrice_predecesseurs[sources] = predecesseurs_lot
+        else:
+            distances_lot = dijkstra(adjacence, directed=False, indices=sources)
+        distances[sources] = distances_lot
+
+    if predecesseurs:
+        return distances, matrice_predecesseurs
+    return distances
+
+
+# Même calcul à partir d'un graphe NetworkX dont les arêtes portent l'attribut de poids donné.
+# On renvoie la matrice des distances, la liste des sommets (ordre des lignes) et éventuellement les prédécesseurs.
+def matrice_distances_ponderees(graphe, poids='weight', predecesseurs=False, taille_lot=None):
+    adjacence, noeuds = matrice_adjacence_csr(graphe, poids=poids)
+    resultat = distances_ponderees_csr(adjacence, predecesseurs=predecesseurs, taille_lot=taille_lot)
+    if predecesseurs:
+        distances, matrice_predecesseurs = resultat
+        return distances, noeuds, matrice_predecesseurs
+    return resultat, noeuds
+
+
+# Cette fonction calcule l'histogramme des distances finies entre paires de sommets distincts (chaque paire
+# comptée une seule fois), par blocs de lignes pour ne jamais extraire toutes les valeurs en même temps.
+# Les bornes des classes sont celles de np.histogram(valeurs, bins=classes).
+def histogramme_distances(distances, classes=30):
+    n = distances.shape[0]
+    taille_lot = taille_lot_sources(n)
+    colonnes = np.arange(n)[np.newaxis, :]
+
+    # Premier passage : bornes des valeurs (pour des classes identiques à celles de np.histogram)
+    minimum, maximum, nombre = np.inf, -np.inf, 0
+    for debut in range(0, n, taille_lot):
+        lignes = np.arange(debut, min(debut + taille_lot, n))
+        bloc = distances[lignes]
+        garder = (colonnes > lignes[:, np.newaxis]) & np.isfinite(bloc)
+        valeurs = bloc[garder]
+        if len(valeurs) > 0:
+            minimum = min(minimum, float(valeurs.min()))
+            maximum = max(maximum, float(valeurs.max()))
+            nombre += len(valeurs)
+    if nombre == 0:
+        return np.zeros(classes, dtype=np.int64), np.linspace(0.0, 1.0, classes + 1)
+
+    # Second passage : comptage
+    bords = np.histogram_bin_edges([minimum, maximum], bins=classes)
+    comptes = np.zeros(classes, dtype=np.int64)
+    for debut in range(0, n, taille_lot):
+        lignes = np.arange(debut, min(debut + taille_lot, n))
+        bloc = distances[lignes]
+        garder = (colonnes > lignes[:, np.newaxis]) & np.isfinite(bloc)
+        comptes += np.histogram(bloc[garder], bins=bords)[0]
+    return comptes, bords
+
+
+# Cette fonction reconstruit le plus court chemin (liste d'indices de sommets) de i à j à partir de la
+# matrice des prédécesseurs ; renvoie une liste vide si j n'est pas accessible depuis i.
+def reconstruire_chemin(predecesseurs, i, j):
+    if i == j:
+        return [i]
+    if predecesseurs[i, j] < 0:
+        return []
+    chemin = [j]
+    while j != i:
+        j = int(predecesseurs[i, j])
+        chemin.append(j)
+    return chemin[::-1]
+
+
+# Cette fonction compte, pour chaque paire {s, t} de sommets connectés, le nombre σ(s, t) de plus courts
+# chemins (en sauts) entre s et t, comme dans la phase avant de l'algorithme de Brandes : un parcours en largeur
+# par niveaux depuis chaque source, où σ d'un sommet atteint au niveau k est la somme des σ de ses voisins
+# du niveau k - 1. Les sources sont traitées par lots ; à chaque niveau on ne parcourt que les arêtes issues
+# du front (lecture directe des voisins dans la matrice CSR), soit O(n·m) au total, sans énumérer les chemins.
+# σ est gardé en entiers 64 bits, puis en entiers Python si un niveau risque de dépasser 2^63 - 1 : les
+# comptes restent exacts quelle que soit leur taille.
+# On renvoie la distribution de σ (valeurs distinctes et nombre de paires pour chacune), sa moyenne, le nombre
+# total de plus courts chemins et l'histogramme des longueurs.
+def compter_plus_courts_chemins(graphe, taille_lot=None):
+    adjacence, noeuds = matrice_adjacence_csr(graphe)
+    adjacence = adjacence.tocsr()
+    adjacence.sum_duplicates()
+    pointeurs, voisins = adjacence.indptr, adjacence.indices
+    degre_max = int(np.diff(pointeurs).max()) if len(pointeurs) > 1 else 0
+    n = len(noeuds)
+    distribution = {}
+    histogramme = np.zeros(1, dtype=np.int64)
+
+    taille_lot = taille_lot_sources(n, taille_lot)
+    for debut in range(0, n, taille_lot):
+        sources = np.arange(debut, min(debut + taille_lot, n))
+        lignes = np.arange(len(sources))
+        sigma = np.zeros((len(sources), n), dtype=np.int64)
+        sigma[lignes, sources] = 1
+        distances = np.full((len(sources), n), -1, dtype=np.int64)
+        distances[lignes, sources] = 0
+        # Le front est stocké de façon creuse : (ligne du lot, sommet, σ) pour chaque sommet du dernier niveau
+        front_lignes, front_sommets, front_sigma = lignes, sources, np.ones(len(sources), dtype=np.int64)
+        niveau = 0
+        while len(front_sommets) > 0:
+            niveau += 1
+            if sigma.dtype != object and int(front_sigma.max()) > np.iinfo(np.int64).max // max(degre_max, 1):
+                sigma, front_sigma = sigma.astype(object), front_sigma.astype(object)
+            # Voisins de chaque sommet du front, lus directement dans la matrice CSR (A est symétrique)
+            premiers = pointeurs[front_sommets]
+            degres = pointeurs[front_sommets + 1] - premiers
+            origine = np.repeat(np.arange(len(front_sommets)), degres)
+            decalages = np.arange(len(origine)) - np.repeat(np.cumsum(degres) - degres, degres)
+            cibles = voisins[premiers[origine] + decalages]
+            lignes_cibles = front_lignes[origine]
+            nouveaux = distances[lignes_cibles, cibles] < 0
+            cibles, lignes_cibles = cibles[nouveaux], lignes_cibles[nouveaux]
+            contributions = front_sigma[origine[nouveaux]]
+            if len(cibles) == 0:
+                break
+            # Somme des contributions arrivant sur un même (ligne, sommet)
+            cles = lignes_cibles * n + cibles
+            ordre = np.argsort(cles, kind='stable')
+            cles = cles[ordre]
+            groupes = np.flatnonzero(np.r_[True, cles[1:] != cles[:-1]])
+            front_sigma = np.add.reduceat(contributions[ordre], groupes)
+            front_lignes, front_sommets = np.divmod(cles[groupes], n)
+            sigma[front_lignes, front_sommets] = front_sigma
+            distances[front_lignes, front_sommets] = niveau
+
+        # Chaque paire non ordonnée une seule fois
+        garder = (np.arange(n)[np.newaxis, :] > sources[:, np.newaxis]) & (distances > 0)
+        valeurs, comptes = np.unique(sigma[garder], return_counts=True)
+        for valeur, compte in zip(valeurs.tolist(), comptes.tolist()):
+            distribution[valeur] = distribution.get(valeur, 0) + compte
+        comptes_longueurs = np.bincount(distances[garder])
+        if len(comptes_longueurs) > len(histogramme):
+            histogramme = np.pad(histogramme, (0, len(comptes_longueurs) - len(histogramme)))
+        histogramme[:len(comptes_longueurs)] += comptes_longueurs
+
+    grands = bool(distribution) and max(distribution) > np.iinfo(np.int64).max
+    valeurs = np.array(sorted(distribution), dtype=object if grands else np.int64)
+    comptes = np.array([distribution[valeur] for valeur in sorted(distribution)], dtype=np.int64)
+    nombre_paires = int(comptes.sum())
+    total = sum(valeur * compte for valeur, compte in distribution.items())
+    return {
+        'Valeurs de σ': valeurs,
+        'Nombre de Paires par σ': comptes,
+        'Nombre Moyen de Plus Courts Chemins': total / nombre_paires if nombre_paires > 0 else None,
+        'Nombre Total de Plus Courts Chemins': total,
+        'Nombre de Paires Connectées': nombre_paires,
+        'Histogramme des Longueurs': histogramme,
+    }
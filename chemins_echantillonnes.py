@@ -0,0 +1,274 @@
+# L'objectif de ce fichier est d'estimer la distribution des longueurs des plus courts chemins (en sauts, ou
+# pondérées par distance²) des grands essaims, pour lesquels les n² distances de chemins.py deviennent trop
+# longues à calculer : on ne lance le parcours en largeur (ou Dijkstra) que depuis un échantillon de sources.
+#   - Chaque source s donne la ligne exacte de ses distances, résumée par le nombre de satellites à chaque
+#     longueur ; l'histogramme des paires est estimé par la moyenne de ces lignes (× nombre de sources / 2).
+#   - Les sources sont tirées sans remise dans chaque composante connexe (échantillon stratifié, proportionnel
+#     à la taille des composantes, au moins deux sources par composante) ou dans tout le graphe.
+#   - L'échantillon grandit jusqu'à ce que l'intervalle de confiance de la longueur moyenne soit assez étroit
+#     (demi-largeur relative <= precision), ou jusqu'à épuisement des sources (résultat exact). La taille
+#     suivante est celle que l'erreur type observée rend nécessaire (entre 1,25 et 4 fois la taille actuelle).
+#   - Les erreurs types des comptes et de la longueur moyenne (estimateur par quotient) sont analytiques ;
+#     l'intervalle du diamètre effectif (90 % des paires à cette distance ou moins) est obtenu par bootstrap.
+# Les distances pondérées sont accumulées sur une grille fine de CLASSES_FINES classes, regroupées à la fin
+# dans les classes de np.histogram (bornes : plus petit poids d'arête et plus grande distance observée).
+
+from statistics import NormalDist
+
+import numpy as np
+from scipy.sparse.csgraph import connected_components, dijkstra, shortest_path
+
+from chemins import matrice_adjacence_csr, taille_lot_sources
+
+# Au-delà de ce nombre de sommets, les distributions de chemins sont estimées par échantillonnage (sauf demande
+# contraire)
+SOMMETS_EXACTS = 20000
+
+# Demi-largeur relative par défaut de l'intervalle de confiance de la longueur moyenne
+PRECISION = 0.02
+
+# Nombre de sources du premier échantillon
+SOURCES_INITIALES = 64
+
+# Nombre de classes de la grille fine des distances pondérées (la grille s'étend si nécessaire)
+CLASSES_FINES = 4096
+
+# Nombre de rééchantillonnages pour l'intervalle de confiance du diamètre effectif
+REPLICATIONS_BOOTSTRAP = 200
+
+# Proportion des paires à une distance inférieure ou égale au diamètre effectif
+QUANTILE_DIAMETRE_EFFECTIF = 0.9
+
+
+# Faut-il échantillonner ? precision vaut None (oui au-delà de SOMMETS_EXACTS sommets), 0 (jamais) ou la
+# précision demandée (toujours)
+def mode_echantillonne(graphe, precision=None):
+    if precision is None:
+        return graphe.number_of_nodes() > SOMMETS_EXACTS
+    return precision > 0
+
+
+# Strates de sources : composantes connexes d'au moins deux sommets (les autres n'ont aucune paire), ou un
+# seul ensemble contenant tous les sommets
+def _strates(adjacence, stratifie):
+    n = adjacence.shape[0]
+    if not stratifie:
+        return [np.arange(n)] if n >= 2 else []
+    nombre, etiquettes = connected_components(adjacence, directed=False)
+    ordre = np.argsort(etiquettes, kind='stable')
+    bornes = np.searchsorted(etiquettes[ordre], np.arange(nombre + 1))
+    return [ordre[bornes[h]:bornes[h + 1]] for h in range(nombre) if bornes[h + 1] - bornes[h] >= 2]
+
+
+# Nombre de sources à tirer dans chaque strate pour un échantillon total d'environ m sources
+def _allocation(tailles, m):
+    proportionnelles = np.ceil(m * tailles / tailles.sum()).astype(np.int64)
+    return np.minimum(tailles, np.maximum(2, proportionnelles))
+
+
+# Comptes par source (lignes) : somme, par strate, des lignes et de leurs carrés, puis estimation du total
+# (sur toutes les sources) et de sa variance (tirage sans remise dans chaque strate)
+def _total_et_variance(valeurs, strates_sources, tailles, tirees):
+    dimension = valeurs.shape[1:]
+    sommes = np.zeros((len(tailles),) + dimension)
+    carres = np.zeros((len(tailles),) + dimension)
+    np.add.at(sommes, strates_sources, valeurs)
+    np.add.at(carres, strates_sources, valeurs.astype(np.float64) ** 2)
+    forme = (-1,) + (1,) * len(dimension)
+    m = tirees.reshape(forme).astype(np.float64)
+    taille = tailles.reshape(forme).astype(np.float64)
+    moyennes = sommes / m
+    variances = np.maximum(carres - sommes * moyennes, 0.0) / np.maximum(m - 1, 1)
+    total = (taille * moyennes).sum(axis=0)
+    variance = (taille ** 2 * (1 - m / taille) * variances / m).sum(axis=0)
+    return total, variance
+
+
+# Valeur sous laquelle se trouve la proportion q des comptes, par interpolation linéaire dans la classe
+# ]bords[i], bords[i + 1]] qui la contient (comptes : une ligne par histogramme)
+def _quantile(comptes, bords, q):
+    cumul = np.cumsum(comptes, axis=-1)
+    cible = q * cumul[..., -1:]
+    i = np.minimum((cumul < cible).sum(axis=-1), comptes.shape[-1] - 1)
+    avant = np.take_along_axis(cumul, i[..., np.newaxis], axis=-1)[..., 0] - \
+        np.take_along_axis(comptes, i[..., np.newaxis], axis=-1)[..., 0]
+    dans_classe = np.take_along_axis(comptes, i[..., np.newaxis], axis=-1)[..., 0]
+    fraction = np.divide(cible[..., 0] - avant, dans_classe, out=np.zeros(i.shape), where=dans_classe > 0)
+    return bords[i] + fraction * (bords[i + 1] - bords[i])
+
+
+# Cette fonction estime, à partir d'un échantillon de sources, la distribution des longueurs des plus courts
+# chemins entre paires de sommets connectés (chaque paire comptée une seule fois) :
+#   pondere : False (en sauts, comme chemins.histogramme_sauts) ou nom de l'attribut de poids (distances
+#             pondérées, classées comme chemins.histogramme_distances avec classes classes)
+#   precision : demi-largeur relative visée pour l'intervalle de confiance de la longueur moyenne
+#   confiance : niveau des intervalles de confiance
+#   stratifie : tirage des sources par composante connexe (True) ou dans tout le graphe (False)
+#   sources_max : nombre maximal de sources (None : autant que nécessaire)
+# Les comptes estimés sont réels ; 'Exact' vaut True si toutes les sources ont été parcourues.
+def distribution_chemins_echantillonnee(graphe, pondere=False, classes=30, precision=PRECISION, confiance=0.95,
+                                        stratifie=True, sources_initiales=SOURCES_INITIALES, sources_max=None,
+                                        graine=None, taille_lot=None):
+    adjacence, noeuds = matrice_adjacence_csr(graphe, poids=pondere or None)
+    n = len(noeuds)
+    generateur = np.random.default_rng(graine)
+    strates = [generateur.permutation(strate) for strate in _strates(adjacence, stratifie)]
+    tailles = np.array([len(strate) for strate in strates], dtype=np.int64)
+    tirees = np.zeros(len(strates), dtype=np.int64)
+    z = NormalDist().inv_cdf((1 + confiance) / 2)
+    taille_lot = taille_lot_sources(n, taille_lot)
+
+    # Par source : comptes par longueur (ou par classe fine), nombre de sommets atteints et somme des distances
+    comptes = np.zeros((0, 1), dtype=np.int64)
+    atteints = np.zeros(0)
+    sommes = np.zeros(0)
+    strates_sources = np.zeros(0, dtype=np.int64)
+    largeur = None
+    distance_maximale = 0.0
+
+    objectif = sources_initiales
+    while True:
+        cibles = _allocation(tailles, objectif) if len(strates) > 0 else tirees
+        if sources_max is not None and tirees.sum() > 0:
+            # Le premier échantillon est complet ; les suivants sont réduits pour ne pas dépasser sources_max
+            supplementaires = cibles - tirees
+            reste = max(0, sources_max - int(tirees.sum()))
+            if supplementaires.sum() > reste:
+                cibles = tirees + supplementaires * reste // supplementaires.sum()
+            if (cibles == tirees).all():
+                break
+        nouvelles = [strate[debut:fin] for strate, debut, fin in zip(strates, tirees, cibles)]
+        strates_nouvelles = np.repeat(np.arange(len(strates)), cibles - tirees)
+        nouvelles = np.concatenate(nouvelles) if nouvelles else np.zeros(0, dtype=np.int64)
+        tirees = np.maximum(tirees, cibles)
+
+        for debut in range(0, len(nouvelles), taille_lot):
+            sources = nouvelles[debut:debut + taille_lot]
+            # La matrice contient les deux sens de chaque lien : le mode orienté évite le surcoût du mode non
+            # orienté de SciPy, pour les mêmes distances
+            if pondere:
+                distances = dijkstra(adjacence, directed=True, indices=sources)
+            else:
+                distances = shortest_path(adjacence, method='D', unweighted=True, directed=True, indices=sources)
+            distances[np.arange(len(sources)), sources] = np.inf
+            finies = np.isfinite(distances)
+            atteints = np.concatenate([atteints, finies.sum(axis=1)])
+            sommes = np.concatenate([sommes, np.where(finies, distances, 0.0).sum(axis=1)])
+            if pondere:
+                if largeur is None:
+                    # Deux sommets d'une même composante sont à au plus deux fois l'excentricité d'une source
+                    largeur = max(2 * float(distances[finies].max(initial=0.0)), 1.0) / CLASSES_FINES
+                distance_maximale = max(distance_maximale, float(distances[finies].max(initial=0.0)))
+                valeurs = (distances[finies] // largeur).astype(np.int64)
+            else:
+                valeurs = distances[finies].astype(np.int64)
+            lignes = np.nonzero(finies)[0]
+            longueur = max(comptes.shape[1], int(valeurs.max(initial=0)) + 1)
+            lot = np.bincount(lignes * longueur + valeurs, minlength=len(sources) * longueur)
+            comptes = np.pad(comptes, ((0, 0), (0, longueur - comptes.shape[1])))
+            comptes = np.concatenate([comptes, lot.reshape(len(sources), longueur)])
+        strates_sources = np.concatenate([strates_sources, strates_nouvelles])
+
+        # Longueur moyenne (quotient de deux totaux) et son erreur type
+        if len(strates) > 0:
+            total_sommes, _ = _total_et_variance(sommes, strates_sources, tailles, tirees)
+            total_atteints, _ = _total_et_variance(atteints, strates_sources, tailles, tirees)
+        else:
+            total_sommes = total_atteints = 0.0
+        moyenne = float(total_sommes / total_atteints) if total_atteints > 0 else None
+        erreur_moyenne = 0.0
+        if moyenne is not None:
+            _, variance = _total_et_variance(sommes - moyenne * atteints, strates_sources, tailles, tirees)
+            erreur_moyenne = float(np.sqrt(variance) / total_atteints)
+        exact = bool((tirees == tailles).all())
+        precision_atteinte = moyenne is None or z * erreur_moyenne <= precision * moyenne
+        if exact or precision_atteinte:
+            break
+        # L'erreur type décroît comme 1 / racine(nombre de sources) : taille visée, avec une marge de 10 %
+        facteur = 1.1 * (z * erreur_moyenne / (precision * moyenne)) ** 2
+        objectif = int(np.ceil(tirees.sum() * min(max(facteur, 1.25), 4.0)))
+
+    # Classes de sortie : longueurs entières en sauts, classes de np.histogram pour les distances pondérées
+    if pondere:
+        if total_atteints > 0:
+            bords = np.histogram_bin_edges([float(adjacence.data.min()), distance_maximale], bins=classes)
+        else:
+            bords = np.linspace(0.0, 1.0, classes + 1)
+        centres = (np.arange(comptes.shape[1]) + 0.5) * largeur if largeur is not None else np.zeros(0)
+        regroupement = np.zeros((comptes.shape[1], classes))
+        regroupement[np.arange(comptes.shape[1]), np.clip(np.searchsorted(bords, centres, side='right') - 1,
+                                                          0, classes - 1)] = 1.0
+        comptes_sortie = comptes @ regroupement
+        bords_fins = np.arange(comptes.shape[1] + 1) * (largeur or 1.0)
+    else:
+        comptes_sortie = comptes
+        bords_fins = np.arange(comptes.shape[1] + 1) - 1.0
+
+    if len(strates) > 0:
+        histogramme, variance = _total_et_variance(comptes_sortie, strates_sources, tailles, tirees)
+        total_fin, _ = _total_et_variance(comptes, strates_sources, tailles, tirees)
+    else:
+        histogramme = variance = np.zeros(comptes_sortie.shape[1])
+        total_fin = np.zeros(comptes.shape[1])
+    histogramme, erreur = histogramme / 2, np.sqrt(variance) / 2
+    resultats = {
+        'Histogramme': histogramme,
+        'Erreur Type': erreur,
+        'Intervalle de Confiance': (np.maximum(histogramme - z * erreur, 0.0), histogramme + z * erreur),
+        'Nombre de Paires': float(total_atteints) / 2,
+        'Longueur Moyenne des Chemins': moyenne,
+        'Intervalle de Confiance de la Longueur Moyenne':
+            (moyenne - z * erreur_moyenne, moyenne + z * erreur_moyenne) if moyenne is not None else None,
+        'Sources Échantillonnées': int(tirees.sum()),
+        'Exact': exact,
+        'Précision Atteinte': exact or precision_atteinte,
+    }
+    if pondere:
+        resultats['Bords'] = bords
+
+    # Diamètre effectif : sur les comptes estimés, puis sur des rééchantillonnages des sources de chaque strate
+    if total_atteints > 0:
+        resultats['Diamètre Effectif'] = float(_quantile(total_fin, bords_fins, QUANTILE_DIAMETRE_EFFECTIF))
+        if exact:
+            resultats['Intervalle de Confiance du Diamètre Effectif'] = (resultats['Diamètre Effectif'],) * 2
+        else:
+            ordre = np.argsort(strates_sources, kind='stable')
+            debuts = np.concatenate([[0], np.cumsum(tirees)[:-1]])[strates_sources[ordre]]
+            effectifs = tirees[strates_sources[ordre]]
+            tirages = debuts + (generateur.random((REPLICATIONS_BOOTSTRAP, len(ordre))) * effectifs).astype(np.int64)
+            poids = np.zeros((REPLICATIONS_BOOTSTRAP, len(ordre)))
+            np.add.at(poids, (np.repeat(np.arange(REPLICATIONS_BOOTSTRAP), len(ordre)), tirages.ravel()), 1.0)
+            poids *= (tailles / tirees)[strates_sources[ordre]]
+            replications = _quantile(poids @ comptes[ordre], bords_fins, QUANTILE_DIAMETRE_EFFECTIF)
+            alpha = (1 - confiance) / 2
+            resultats['Intervalle de Confiance du Diamètre Effectif'] = \
+                tuple(np.quantile(replications, [alpha, 1 - alpha]).tolist())
+    else:
+        resultats['Diamètre Effectif'] = None
+        resultats['Intervalle de Confiance du Diamètre Effectif'] = None
+    return resultats
+
+
+# Exemple sur un essaim synthétique : distributions estimées, comparées au calcul exact s'il est raisonnable
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from generateur_essaim import generer_essaim
+    from graphe_essaim import GrapheEssaim
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    nums_sat, coordonnees_sat = generer_essaim('moyenne', n, graine=0)
+    portee = 60000
+    graphe = GrapheEssaim.depuis_coordonnees(nums_sat, coordonnees_sat, portee, pondere=True)
+    for pondere in (False, 'weight'):
+        debut = time.perf_counter()
+        estimation = distribution_chemins_echantillonnee(graphe, pondere=pondere, graine=0)
+        duree = time.perf_counter() - debut
+        moyenne = estimation['Longueur Moyenne des Chemins']
+        bas, haut = estimation['Intervalle de Confiance de la Longueur Moyenne']
+        print(f"{n} satellites, portée {portee} m, {'distance²' if pondere else 'sauts'} :",
+              f"longueur moyenne {moyenne:.5g} [{bas:.5g}, {haut:.5g}],",
+              f"diamètre effectif {estimation['Diamètre Effectif']:.4g}",
+              "[{:.4g}, {:.4g}],".format(*estimation['Intervalle de Confiance du Diamètre Effectif']),
+              f"{estimation['Sources Échantillonnées']} sources, {duree:.2f} s")
@@ -0,0 +1,128 @@
+# L'objectif de ce fichier est d'analyser les cliques de l'essaim sans conserver toutes les cliques maximales.
+# Sur les graphes denses (forte densité, 60 km), leur nombre explose : on ne garde donc que l'histogramme de
+# leurs tailles, et on propose une recherche de clique maximum par séparation et évaluation.
+# Les deux calculs acceptent un budget (durée ou nombre de cliques) et indiquent si le résultat est partiel.
+
+import heapq
+import time
+
+import numpy as np
+import networkx as nx
+
+from graphe_essaim import en_networkx
+
+
+class _BudgetEpuise(Exception):
+    pass
+
+
+# Cette fonction parcourt les cliques maximales une à une (nx.find_cliques est un générateur) et accumule
+# leurs tailles dans un histogramme (histogramme[k] = nombre de cliques maximales de taille k).
+# Si duree_max (en secondes) ou nombre_max est atteint, on s'arrête et le résultat est marqué partiel.
+def histogramme_cliques(graphe, duree_max=None, nombre_max=None):
+    histogramme = np.zeros(1, dtype=np.int64)
+    nombre = 0
+    partiel = False
+    debut = time.perf_counter()
+
+    for clique in nx.find_cliques(en_networkx(graphe)):
+        taille = len(clique)
+        if taille >= len(histogramme):
+            histogramme = np.pad(histogramme, (0, taille + 1 - len(histogramme)))
+        histogramme[taille] += 1
+        nombre += 1
+        if (nombre_max is not None and nombre >= nombre_max) or \
+                (duree_max is not None and time.perf_counter() - debut > duree_max):
+            partiel = True
+            break
+
+    return {'Histogramme': histogramme, 'Nombre': nombre, 'Partiel': partiel}
+
+
+# Ordre de dégénérescence : on retire à chaque étape un sommet de degré minimal dans le graphe restant.
+# On renvoie l'ordre de retrait et, pour chaque sommet, son degré au moment du retrait (nombre de coeur).
+def ordre_degenerescence(adjacence):
+    degres = {v: len(voisins) for v, voisins in adjacence.items()}
+    tas = [(degre, v) for v, degre in degres.items()]
+    heapq.heapify(tas)
+    retires = set()
+    ordre = []
+    coeur = {}
+    k = 0
+    while tas:
+        degre, v = heapq.heappop(tas)
+        if v in retires or degre != degres[v]:
+            continue
+        k = max(k, degre)
+        coeur[v] = k
+        ordre.append(v)
+        retires.add(v)
+        for w in adjacence[v]:
+            if w not in retires:
+                degres[w] -= 1
+                heapq.heappush(tas, (degres[w], w))
+    return ordre, coeur
+
+
+# Coloration gloutonne des candidats : deux sommets d'une même couleur ne sont pas voisins, donc une clique
+# contient au plus un sommet de chaque couleur. On renvoie les sommets triés par couleur croissante et,
+# pour chacun, le nombre de couleurs utilisées jusqu'à lui (borne supérieure de la clique atteignable).
+def _colorier(candidats, adjacence):
+    classes = []
+    for v in candidats:
+        voisins = adjacence[v]
+        for classe in classes:
+            if voisins.isdisjoint(classe):
+                classe.append(v)
+                break
+        else:
+            classes.append([v])
+    ordre, bornes = [], []
+    for couleur, classe in enumerate(classes, start=1):
+        ordre.extend(classe)
+        bornes.extend([couleur] * len(classe))
+    return ordre, bornes
+
+
+def _developper(clique, candidats, adjacence, meilleure, fin):
+    if fin is not None and time.perf_counter() > fin:
+        raise _BudgetEpuise
+    ordre, bornes = _colorier(candidats, adjacence)
+    for indice in range(len(ordre) - 1, -1, -1):
+        # Même en prenant un sommet de chaque couleur restante, on ne ferait pas mieux
+        if len(clique) + bornes[indice] <= len(meilleure[0]):
+            return
+        v = ordre[indice]
+        nouvelle_clique = clique + [v]
+        nouveaux_candidats = [w for w in ordre[:indice] if w in adjacence[v]]
+        if nouveaux_candidats:
+            _developper(nouvelle_clique, nouveaux_candidats, adjacence, meilleure, fin)
+        elif len(nouvelle_clique) > len(meilleure[0]):
+            meilleure[0] = nouvelle_clique
+
+
+# Cette fonction cherche une clique de taille maximum (séparation et évaluation) :
+# les sommets sont traités dans l'ordre de dégénérescence (chaque sommet n'a alors qu'au plus « dégénérescence »
+# voisins candidats), et chaque branche est coupée grâce à la borne de coloration et au nombre de coeur.
+# Si duree_max (en secondes) est atteinte, on renvoie la meilleure clique trouvée avec partiel = True.
+def clique_maximum(graphe, duree_max=None):
+    graphe = en_networkx(graphe)
+    adjacence = {v: set(graphe[v]) - {v} for v in graphe}
+    if not adjacence:
+        return [], False
+    ordre, coeur = ordre_degenerescence(adjacence)
+    position = {v: i for i, v in enumerate(ordre)}
+    meilleure = [[ordre[0]]]
+    fin = time.perf_counter() + duree_max if duree_max is not None else None
+
+    try:
+        # Les sommets de plus grand nombre de coeur sont les plus prometteurs : on les traite en premier
+        for v in sorted(ordre, key=lambda s: -coeur[s]):
+            if coeur[v] + 1 <= len(meilleure[0]):
+                break
+            candidats = [w for w in adjacence[v] if position[w] > position[v]]
+            if len(candidats) + 1 > len(meilleure[0]):
+                _developper([v], candidats, adjacence, meilleure, fin)
+    except _BudgetEpuise:
+        return meilleure[0], True
+    return meilleure[0], False
@@ -0,0 +1,135 @@
+# L'objectif de ce fichier est d'étudier la connexité de l'essaim en fonction de la portée, de façon continue.
+# Au lieu de reconstruire le graphe et de relancer nx.connected_components pour chaque portée candidate,
+# on parcourt les paires de satellites par distance croissante en fusionnant les composantes
+# avec une structure union-find : toute la courbe s'obtient en un seul passage (tri en O(E log E)).
+
+import numpy as np
+from scipy.sparse.csgraph import connected_components
+
+from aretes import paires_triees
+from chemins import matrice_adjacence_csr
+
+
+# Structure union-find (ensembles disjoints) avec compression de chemin et union par taille.
+class EnsemblesDisjoints:
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.taille = [1] * n
+        self.nombre_composantes = n
+        self.plus_grande_taille = 1 if n > 0 else 0
+
+    # On renvoie le représentant de l'ensemble contenant x
+    def trouver(self, x):
+        parent = self.parent
+        racine = x
+        while parent[racine] != racine:
+            racine = parent[racine]
+        # Compression de chemin
+        while parent[x] != racine:
+            parent[x], x = racine, parent[x]
+        return racine
+
+    # On fusionne les ensembles contenant x et y ; renvoie True si une fusion a eu lieu
+    def unir(self, x, y):
+        racine_x = self.trouver(x)
+        racine_y = self.trouver(y)
+        if racine_x == racine_y:
+            return False
+        if self.taille[racine_x] < self.taille[racine_y]:
+            racine_x, racine_y = racine_y, racine_x
+        self.parent[racine_y] = racine_x
+        self.taille[racine_x] += self.taille[racine_y]
+        self.nombre_composantes -= 1
+        if self.taille[racine_x] > self.plus_grande_taille:
+            self.plus_grande_taille = self.taille[racine_x]
+        return True
+
+
+# Cette fonction calcule, pour toutes les portées jusqu'à portee_max, le nombre de composantes connexes,
+# la taille de la plus grande composante et des statistiques de degré.
+# Chaque valeur des courbes correspond à la portée de même indice dans 'Portées' : la première est la
+# portée 0 (aucune arête), puis une valeur par paire, dans l'ordre croissant des distances.
+# Contrairement à creer_graphe, tous les satellites sont comptés, y compris les satellites isolés.
+# Si portee_max vaut None, toutes les paires sont considérées (mémoire en O(n²)).
+def balayage_portees(coordonnees_sat, portee_max=None):
+    coordonnees_sat = np.asarray(coordonnees_sat, dtype=np.float64)
+    n = len(coordonnees_sat)
+    sources, cibles, distances = paires_triees(coordonnees_sat, np.inf if portee_max is None else portee_max)
+    nb_paires = len(distances)
+    evenements = np.arange(nb_paires)
+
+    # Degrés : chaque paire augmente de 1 le degré de ses deux extrémités.
+    # Pour chaque extrémité, son degré après l'événement est son rang d'apparition dans la liste triée.
+    extremites = np.concatenate([sources, cibles])
+    indices_evenements = np.concatenate([evenements, evenements])
+    ordre = np.lexsort((indices_evenements, extremites))
+    debuts = np.searchsorted(extremites[ordre], np.arange(n))
+    rangs = np.arange(2 * nb_paires) - debuts[extremites[ordre]]
+    degre_apres = np.empty(2 * nb_paires, dtype=np.int64)
+    degre_apres[ordre] = rangs + 1
+    degre_max = np.maximum.accumulate(np.maximum(degre_apres[:nb_paires], degre_apres[nb_paires:])) \
+        if nb_paires > 0 else np.empty(0, dtype=np.int64)
+
+    # Satellites isolés : un satellite cesse de l'être à sa première apparition dans la liste
+    premiere_apparition = np.full(n, nb_paires, dtype=np.int64)
+    np.minimum.at(premiere_apparition, extremites, indices_evenements)
+    sortis = np.bincount(premiere_apparition[premiere_apparition < nb_paires], minlength=nb_paires)
+    isoles = n - np.cumsum(sortis)
+
+    # Composantes connexes : union-find sur les paires triées, on ne retient que les fusions
+    ensembles = EnsemblesDisjoints(n)
+    positions_fusions = [0]
+    nombres_composantes = [n]
+    plus_grandes_tailles = [ensembles.plus_grande_taille]
+    for k, (u, v) in enumerate(zip(sources.tolist(), cibles.tolist())):
+        if ensembles.unir(u, v):
+            positions_fusions.append(k + 1)
+            nombres_composantes.append(ensembles.nombre_composantes)
+            plus_grandes_tailles.append(ensembles.plus_grande_taille)
+            # Une fois l'essaim connexe, les paires suivantes ne changent plus les composantes
+            if ensembles.nombre_composantes == 1:
+                break
+
+    # On propage chaque valeur jusqu'à la fusion suivante
+    indice_fusion = np.searchsorted(positions_fusions, np.arange(nb_paires + 1), side='right') - 1
+    nombres_composantes = np.asarray(nombres_composantes)[indice_fusion]
+    plus_grandes_tailles = np.asarray(plus_grandes_tailles)[indice_fusion]
+
+    if ensembles.nombre_composantes == 1 and n > 1:
+        portee_critique = float(distances[positions_fusions[-1] - 1])
+    elif n == 1:
+        portee_critique = 0.0
+    else:
+        # L'essaim n'est pas connexe à portee_max
+        portee_critique = None
+
+    return {
+        'Portées': np.concatenate([[0.0], distances]),
+        'Nombre de Composantes Connexes': nombres_composantes,
+        'Taille de la Plus Grande Composante': plus_grandes_tailles,
+        'Degré Moyen': 2 * np.arange(nb_paires + 1) / n if n > 0 else np.zeros(nb_paires + 1),
+        'Degré Maximal': np.concatenate([[0], degre_max]),
+        'Nombre de Satellites Isolés': np.concatenate([[n], isoles]),
+        'Portée Critique': portee_critique,
+    }
+
+
+# Cette fonction lit l'état du balayage pour une portée donnée (dernière paire de distance <= portée)
+def etat_a_portee(balayage, portee):
+    k = int(np.searchsorted(balayage['Portées'], portee, side='right')) - 1
+    return {cle: valeurs[k] for cle, valeurs in balayage.items()
+            if cle not in ('Portées', 'Portée Critique')}
+
+
+# Composantes connexes d'un graphe (nx.Graph ou GrapheEssaim) calculées sur la matrice d'adjacence creuse ;
+# on renvoie, comme nx.connected_components, la liste des ensembles de sommets de chaque composante.
+def composantes_connexes(graphe):
+    adjacence, noeuds = matrice_adjacence_csr(graphe)
+    if len(noeuds) == 0:
+        return []
+    _, etiquettes = connected_components(adjacence, directed=False)
+    ordre = np.argsort(etiquettes, kind='stable')
+    coupures = np.flatnonzero(np.diff(etiquettes[ordre])) + 1
+    noeuds = np.asarray(noeuds, dtype=object)
+    return [set(groupe.tolist()) for groupe in np.split(noeuds[ordre], coupures)]
@@ -0,0 +1,236 @@
+# L'objectif de ce fichier est de simuler le routage opportuniste de l'essaim par diffusion épidémique :
+# chaque satellite émet un message destiné à tous les autres, et à chaque pas de temps, deux satellites en
+# contact (voisins dans le graphe du pas) échangent tous les messages qu'ils détiennent.
+#
+# Les messages détenus par chaque satellite sont rangés dans des bitsets : une ligne de mots uint64 par
+# satellite, un bit par message. Un pas de diffusion se fait sans boucle sur les messages ni sur les
+# contacts : on rassemble les lignes des voisins (format CSR de la matrice d'adjacence) et on les combine
+# par un OU bit à bit (np.bitwise_or.reduceat), pour tous les messages et tous les contacts à la fois.
+# Les colonnes de mots sont traitées par blocs pour borner la mémoire (TAILLE_BLOC, comme dans chemins.py).
+#
+# On peut simuler un graphe fixe (creer_graphe : les contacts sont les mêmes à chaque pas) ou une suite
+# d'instantanés (un graphe par pas de temps, voir temporel.py).
+
+import itertools
+
+import numpy as np
+
+from chemins import TAILLE_BLOC, matrice_adjacence_csr, matrice_adjacence_depuis_paires
+
+
+# Nombre de bits à 1 d'un tableau d'entiers non signés
+def _compter_bits(tableau):
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(tableau).sum(dtype=np.int64))
+    return int(np.unpackbits(np.ascontiguousarray(tableau).view(np.uint8)).sum(dtype=np.int64))
+
+
+# Bits des messages (colonnes) détenus par chaque satellite (lignes), sous forme booléenne
+def _deballer(bitsets, nombre_messages):
+    octets = np.ascontiguousarray(bitsets).view(np.uint8)
+    return np.unpackbits(octets, axis=1, bitorder='little', count=nombre_messages).astype(bool)
+
+
+# Un pas de diffusion sur un bloc de mots : chaque satellite reçoit le OU des bitsets emis par ses voisins.
+# Les arcs (lignes_arcs[k] <- indices[k]) sont triés par ligne ; garder (optionnel) sélectionne les arcs
+# utilisés à ce pas (contacts effectifs, ou voisins ayant quelque chose de nouveau à transmettre).
+def _propager(bitsets, emis, lignes_arcs, indices, garder=None):
+    if garder is not None:
+        lignes_arcs = lignes_arcs[garder]
+        indices = indices[garder]
+    nouveaux = bitsets.copy()
+    if len(indices) > 0:
+        # Début de chaque groupe d'arcs d'une même ligne (reduceat ne doit voir que des groupes non vides)
+        debuts = np.flatnonzero(np.diff(lignes_arcs, prepend=-1))
+        nouveaux[lignes_arcs[debuts]] |= np.bitwise_or.reduceat(emis[indices], debuts, axis=0)
+    return nouveaux
+
+
+# Arcs (triés par ligne) de la matrice d'adjacence d'un graphe, exprimés sur les indices de nums_sat
+# (les satellites absents du graphe n'ont aucun contact)
+def _arcs_sur(graphe, index, n):
+    adjacence, noeuds = matrice_adjacence_csr(graphe)
+    correspondance = np.array([index[sat] for sat in noeuds], dtype=np.int64)
+    lignes = np.repeat(np.arange(len(noeuds)), np.diff(adjacence.indptr))
+    garder = lignes < adjacence.indices
+    adjacence = matrice_adjacence_depuis_paires(n, correspondance[lignes[garder]],
+                                                correspondance[adjacence.indices[garder]])
+    adjacence.sort_indices()
+    lignes_arcs = np.repeat(np.arange(n), np.diff(adjacence.indptr))
+    return lignes_arcs, adjacence.indices
+
+
+# Cette fonction simule la diffusion épidémique de messages dans l'essaim.
+#   contacts : un graphe (nx.Graph ou GrapheEssaim, contacts identiques à chaque pas) ou une suite de graphes
+#              (un par pas de temps)
+#   nums_sat : satellites de l'essaim (par défaut, les sommets du graphe ou du premier instantané)
+#   sources : satellites qui émettent un message (par défaut tous : diffusion de tous vers tous)
+#   probabilite : probabilité qu'un contact donne lieu à un échange à un pas donné (1 : toujours)
+#   pas_max : nombre maximal de pas (par défaut, pour un graphe fixe, jusqu'à ce que chaque message ait atteint
+#             toute la composante connexe de sa source)
+#   latences : si True, on renvoie aussi la matrice (messages × satellites) des pas de réception (-1 : jamais)
+# Le taux de livraison porte sur les paires (source, destination) distinctes.
+def simuler_diffusion(contacts, nums_sat=None, sources=None, probabilite=1.0, pas_max=None, graine=None,
+                      latences=False, taille_bloc=None):
+    fixe = hasattr(contacts, 'number_of_nodes')
+    instantanes = iter([contacts] if fixe else contacts)
+    premier = next(instantanes, None)
+    if nums_sat is None:
+        if premier is None:
+            raise ValueError("Aucun instantané à simuler")
+        nums_sat = list(premier.nodes())
+    nums_sat = list(nums_sat)
+    n = len(nums_sat)
+    index = {sat: i for i, sat in enumerate(nums_sat)}
+    sources = np.arange(n) if sources is None else np.array([index[sat] for sat in sources], dtype=np.int64)
+    nombre_messages = len(sources)
+    nombre_mots = max(1, -(-nombre_messages // 64))
+    generateur = np.random.default_rng(graine)
+
+    # Bitsets initiaux : le message k est détenu par sa source
+    bitsets = np.zeros((n, nombre_mots), dtype=np.uint64)
+    messages = np.arange(nombre_messages)
+    bits = np.left_shift(np.uint64(1), (messages % 64).astype(np.uint64))
+    np.bitwise_or.at(bitsets, (sources, messages // 64), bits)
+
+    # Blocs de mots traités ensemble : (nombre d'arcs × mots du bloc) éléments au plus TAILLE_BLOC
+    arcs = _arcs_sur(premier, index, n) if premier is not None else None
+    if taille_bloc is None:
+        taille_bloc = TAILLE_BLOC // max(len(arcs[1]) if arcs is not None else 1, n, 1)
+    taille_bloc = max(1, min(nombre_mots, taille_bloc))
+    blocs = [slice(debut, debut + taille_bloc) for debut in range(0, nombre_mots, taille_bloc)]
+
+    matrice_latences = None
+    if latences:
+        matrice_latences = np.full((nombre_messages, n), -1, dtype=np.int32)
+        matrice_latences[messages, sources] = 0
+    # Sur un graphe fixe aux contacts certains, un voisin n'a à transmettre que ce qu'il a reçu au pas
+    # précédent (la frontière) ; un bloc dont la frontière est vide n'évoluera plus
+    deterministe = fixe and probabilite >= 1.0
+    frontiere = bitsets.copy() if deterministe else None
+    blocs_actifs = [True] * len(blocs)
+    if deterministe and pas_max is None:
+        pas_max = n
+    # Sur un graphe fixe aux contacts aléatoires, la diffusion s'arrête quand chaque message a atteint toute
+    # la composante connexe de sa source (nombre de livraisons possibles)
+    livraisons_possibles = None
+    if fixe and not deterministe and arcs is not None:
+        from scipy.sparse.csgraph import connected_components
+        lignes_arcs, indices = arcs
+        adjacence = matrice_adjacence_depuis_paires(n, lignes_arcs, indices)
+        _, composantes = connected_components(adjacence, directed=False)
+        livraisons_possibles = int((np.bincount(composantes)[composantes[sources]] - 1).sum())
+        if pas_max is None and probabilite <= 0.0:
+            pas_max = 0
+    livrees = 0
+    histogramme = [0]
+    pas = 0
+    while arcs is not None and (pas_max is None or pas < pas_max):
+        pas += 1
+        lignes_arcs, indices = arcs
+        contacts_effectifs = generateur.random(len(indices)) < probabilite if probabilite < 1.0 else None
+        recus_pas = 0
+        for numero, bloc in enumerate(blocs):
+            if not blocs_actifs[numero]:
+                continue
+            if deterministe:
+                emis = frontiere[:, bloc]
+                nouveaux = _propager(bitsets[:, bloc], emis, lignes_arcs, indices, emis.any(axis=1)[indices])
+            else:
+                nouveaux = _propager(bitsets[:, bloc], bitsets[:, bloc], lignes_arcs, indices, contacts_effectifs)
+            arrivees = nouveaux & ~bitsets[:, bloc]
+            recus_bloc = _compter_bits(arrivees)
+            recus_pas += recus_bloc
+            if deterministe:
+                frontiere[:, bloc] = arrivees
+                blocs_actifs[numero] = recus_bloc > 0
+            if latences and recus_bloc > 0:
+                premiers_messages = bloc.start * 64
+                lignes, colonnes = np.nonzero(_deballer(arrivees, min(nombre_messages - premiers_messages,
+                                                                     arrivees.shape[1] * 64)))
+                matrice_latences[premiers_messages + colonnes, lignes] = pas
+            bitsets[:, bloc] = nouveaux
+        histogramme.append(recus_pas)
+        livrees += recus_pas
+
+        if fixe:
+            # Graphe fixe et contacts certains : la diffusion est terminée dès qu'un pas n'apporte rien
+            if recus_pas == 0 and deterministe:
+                histogramme.pop()
+                pas -= 1
+                break
+            if livraisons_possibles is not None and livrees >= livraisons_possibles:
+                break
+        else:
+            suivant = next(instantanes, None)
+            arcs = _arcs_sur(suivant, index, n) if suivant is not None else None
+
+    histogramme = np.asarray(histogramme, dtype=np.int64)
+    livraisons = int(histogramme.sum())
+    paires = nombre_messages * (n - 1)
+    livraisons_par_message = np.zeros(nombre_messages, dtype=np.int64)
+    for bloc in blocs:
+        premiers_messages = bloc.start * 64
+        compte = min(nombre_messages - premiers_messages, (bloc.stop - bloc.start) * 64)
+        if compte > 0:
+            livraisons_par_message[premiers_messages:premiers_messages + compte] = \
+                _deballer(bitsets[:, bloc], compte).sum(axis=0)
+    livraisons_par_message -= 1  # la source détient son propre message
+
+    if livraisons > 0:
+        latence_moyenne = float(np.dot(np.arange(len(histogramme)), histogramme) / livraisons)
+        cumul = np.cumsum(histogramme)
+        latence_mediane = int(np.searchsorted(cumul, livraisons / 2))
+        latence_maximale = int(np.flatnonzero(histogramme)[-1])
+    else:
+        latence_moyenne = latence_mediane = latence_maximale = None
+
+    resultats = {
+        'sat_id': np.asarray(nums_sat),
+        'Nombre de Messages': nombre_messages,
+        'Nombre de Pas': pas,
+        'Taux de Livraison': livraisons / paires if paires > 0 else 0.0,
+        'Taux de Livraison par Pas': np.cumsum(histogramme) / paires if paires > 0 else np.zeros(len(histogramme)),
+        'Histogramme des Latences': histogramme,
+        'Latence Moyenne': latence_moyenne,
+        'Latence Médiane': latence_mediane,
+        'Latence Maximale': latence_maximale,
+        'Livraisons par Message': livraisons_par_message,
+    }
+    if latences:
+        resultats['Latences'] = matrice_latences
+    return resultats
+
+
+# Cette fonction simule la diffusion sur une suite d'instantanés de positions (voir temporel.charger_instantanes) :
+# à chaque pas, les contacts sont les paires de satellites à portée.
+def diffusion_instantanes(instantanes, portee, **options):
+    from graphe_essaim import GrapheEssaim
+    instantanes = iter(instantanes)
+    premier = next(instantanes, None)
+    if premier is None:
+        raise ValueError("Aucun instantané à simuler")
+    options.setdefault('nums_sat', np.asarray(premier[1]).tolist())
+    graphes = (GrapheEssaim.depuis_coordonnees(nums_sat, coordonnees_sat, portee)
+               for _, nums_sat, coordonnees_sat in itertools.chain([premier], instantanes))
+    return simuler_diffusion(graphes, **options)
+
+
+# Résultats de la diffusion de tous vers tous pour chaque configuration (densité × portée)
+if __name__ == "__main__":
+    import pandas as pd
+
+    from analyse import fichiers_donnees, mesures_diffusion
+    from balayage_configurations import executer_balayage
+    from cache_resultats import CacheResultats
+
+    portees = [20000, 40000, 60000]
+    etiquettes_densite = ['faible', 'moyenne', 'forte']
+    resultats_configurations = executer_balayage(fichiers_donnees, portees, mesures_diffusion, cache=CacheResultats())
+
+    for mesure in ['Taux de Livraison', 'Latence Moyenne', 'Latence Maximale']:
+        matrice = pd.DataFrame(index=etiquettes_densite, columns=portees)
+        for (i, portee), resultats in resultats_configurations.items():
+            matrice.loc[etiquettes_densite[i], portee] = resultats[mesure]
+        print(f"\n{mesure} :")
+        print(matrice)
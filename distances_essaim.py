@@ -0,0 +1,139 @@
+# L'objectif de ce fichier est de calculer les statistiques des distances entre satellites (plus petite et
+# plus grande distance, histogramme des distances entre paires) sans construire la matrice n × n de
+# distance.cdist (80 Go pour 100 000 satellites) :
+#   - la paire la plus proche est donnée par l'arbre k-d (plus proche voisin de chaque satellite) ;
+#   - les deux satellites les plus éloignés sont des sommets de l'enveloppe convexe de l'essaim : on ne compare
+#     que ces quelques sommets entre eux ;
+#   - l'histogramme est calculé par blocs de lignes (mémoire bornée par TAILLE_BLOC) ou, pour les grands
+#     essaims, estimé sur un échantillon de paires tirées au hasard.
+
+import numpy as np
+from scipy.spatial import ConvexHull, QhullError, cKDTree
+
+from chemins import TAILLE_BLOC, taille_lot_sources
+
+# Au-delà de ce nombre de paires, l'histogramme est estimé par échantillonnage (sauf demande contraire)
+PAIRES_EXACTES = 1 << 26
+
+# Nombre de paires tirées par défaut en mode échantillonné
+TAILLE_ECHANTILLON = 1 << 22
+
+
+# Distances euclidiennes entre les lignes de deux tableaux (..., 3) compatibles. On somme coordonnée par
+# coordonnée pour ne pas créer de tableau intermédiaire trois fois plus grand que le résultat.
+def _normes(premiers, seconds):
+    carres = 0.0
+    for k in range(premiers.shape[-1]):
+        ecarts = premiers[..., k] - seconds[..., k]
+        carres = carres + ecarts * ecarts
+    return np.sqrt(carres)
+
+
+# Cette fonction renvoie la plus petite distance entre deux satellites et les indices (i, j) de la paire
+def paire_la_plus_proche(coordonnees_sat):
+    coordonnees_sat = np.asarray(coordonnees_sat, dtype=np.float64)
+    if len(coordonnees_sat) < 2:
+        return None, None, None
+    # Le premier voisin de chaque satellite est lui-même (ou un satellite à la même position)
+    distances, voisins = cKDTree(coordonnees_sat).query(coordonnees_sat, k=2)
+    i = int(np.argmin(distances[:, 1]))
+    j = int(voisins[i, 1])
+    return float(_normes(coordonnees_sat[i], coordonnees_sat[j])), min(i, j), max(i, j)
+
+
+# Cette fonction renvoie la plus grande distance entre deux satellites (diamètre de l'essaim) et les indices
+# (i, j) de la paire. Seuls les sommets de l'enveloppe convexe sont comparés, par blocs.
+def paire_la_plus_eloignee(coordonnees_sat):
+    coordonnees_sat = np.asarray(coordonnees_sat, dtype=np.float64)
+    n = len(coordonnees_sat)
+    if n < 2:
+        return None, None, None
+    try:
+        candidats = np.sort(ConvexHull(coordonnees_sat).vertices)
+    except (QhullError, ValueError):
+        # Essaim plat ou trop petit pour une enveloppe en 3D : on compare tous les satellites
+        candidats = np.arange(n)
+
+    points = coordonnees_sat[candidats]
+    meilleure, meilleure_paire = -1.0, (0, 1)
+    taille_lot = taille_lot_sources(len(points))
+    for debut in range(0, len(points), taille_lot):
+        lignes = np.arange(debut, min(debut + taille_lot, len(points)))
+        distances = _normes(points[lignes, np.newaxis, :], points[np.newaxis, :, :])
+        k = int(np.argmax(distances))
+        if distances.flat[k] > meilleure:
+            meilleure = float(distances.flat[k])
+            meilleure_paire = (lignes[k // len(points)], k % len(points))
+    i, j = sorted(candidats[list(meilleure_paire)].tolist())
+    return meilleure, i, j
+
+
+# Cette fonction calcule l'histogramme des distances entre toutes les paires de satellites distincts (chaque
+# paire comptée une seule fois), avec les classes de np.histogram(distances, bins=classes).
+#   echantillon : None (exact jusqu'à PAIRES_EXACTES paires, sinon TAILLE_ECHANTILLON paires tirées),
+#                 0 (toujours exact) ou nombre de paires tirées au hasard
+#   bornes : plus petite et plus grande distance, si elles sont déjà connues
+# En mode échantillonné, les comptes sont estimés pour l'ensemble des paires (réels) et 'Erreur Type' donne
+# l'écart type de l'estimation de chaque classe.
+def histogramme_distances_paires(coordonnees_sat, classes=30, echantillon=None, graine=None, bornes=None):
+    coordonnees_sat = np.asarray(coordonnees_sat, dtype=np.float64)
+    n = len(coordonnees_sat)
+    nombre_paires = n * (n - 1) // 2
+    if nombre_paires == 0:
+        return {'Comptes': np.zeros(classes, dtype=np.int64), 'Bords': np.linspace(0.0, 1.0, classes + 1),
+                'Exact': True, 'Nombre de Paires': 0}
+    if bornes is None:
+        bornes = (paire_la_plus_proche(coordonnees_sat)[0], paire_la_plus_eloignee(coordonnees_sat)[0])
+    bords = np.histogram_bin_edges(bornes, bins=classes)
+
+    if echantillon is None:
+        echantillon = 0 if nombre_paires <= PAIRES_EXACTES else TAILLE_ECHANTILLON
+    if echantillon == 0 or echantillon >= nombre_paires:
+        # Blocs de lignes : distances de chaque satellite aux satellites d'indice supérieur
+        comptes = np.zeros(classes, dtype=np.int64)
+        taille_lot = taille_lot_sources(n)
+        for debut in range(0, n, taille_lot):
+            fin = min(debut + taille_lot, n)
+            distances = _normes(coordonnees_sat[debut:fin, np.newaxis, :], coordonnees_sat[np.newaxis, debut:, :])
+            garder = np.arange(debut, n)[np.newaxis, :] > np.arange(debut, fin)[:, np.newaxis]
+            comptes += np.histogram(distances[garder], bins=classes, range=bornes)[0]
+        return {'Comptes': comptes, 'Bords': bords, 'Exact': True, 'Nombre de Paires': nombre_paires}
+
+    # Paires (i, j), i != j, tirées uniformément, par blocs (chaque paire copie six coordonnées)
+    generateur = np.random.default_rng(graine)
+    comptes = np.zeros(classes, dtype=np.int64)
+    taille_bloc = TAILLE_BLOC // 4
+    for debut in range(0, echantillon, taille_bloc):
+        taille = min(taille_bloc, echantillon - debut)
+        i = generateur.integers(0, n, size=taille)
+        j = generateur.integers(0, n - 1, size=taille)
+        j += j >= i
+        comptes += np.histogram(_normes(coordonnees_sat[i], coordonnees_sat[j]), bins=classes, range=bornes)[0]
+    proportions = comptes / echantillon
+    return {'Comptes': proportions * nombre_paires, 'Bords': bords, 'Exact': False,
+            'Nombre de Paires': nombre_paires, 'Paires Échantillonnées': echantillon,
+            'Erreur Type': np.sqrt(proportions * (1 - proportions) / echantillon) * nombre_paires}
+
+
+# Cette fonction regroupe les statistiques des distances d'un essaim (nums_sat, coordonnees_sat) :
+# plus petite et plus grande distance (avec les numéros des satellites concernés) et, si classes n'est pas
+# None, l'histogramme des distances entre paires (voir histogramme_distances_paires).
+def statistiques_distances(nums_sat, coordonnees_sat, classes=30, echantillon=None, graine=None):
+    nums_sat = np.asarray(nums_sat)
+    distance_minimale, i, j = paire_la_plus_proche(coordonnees_sat)
+    distance_maximale, k, l = paire_la_plus_eloignee(coordonnees_sat)
+    resultats = {
+        'Distance Minimale': distance_minimale,
+        'Paire la Plus Proche': (nums_sat[i].item(), nums_sat[j].item()) if i is not None else None,
+        'Distance Maximale': distance_maximale,
+        'Paire la Plus Éloignée': (nums_sat[k].item(), nums_sat[l].item()) if k is not None else None,
+    }
+    if classes is not None:
+        histogramme = histogramme_distances_paires(coordonnees_sat, classes, echantillon, graine,
+                                                   bornes=(distance_minimale, distance_maximale))
+        resultats['Histogramme des Distances'] = histogramme['Comptes']
+        resultats['Bords des Classes'] = histogramme['Bords']
+        resultats['Histogramme Exact'] = histogramme['Exact']
+        if not histogramme['Exact']:
+            resultats['Erreur Type'] = histogramme['Erreur Type']
+    return resultats
@@ -0,0 +1,192 @@
+# L'objectif de ce fichier est d'offrir un point d'entrée unique à la bibliothèque d'analyse de l'essaim,
+# utilisable depuis un autre programme ou en ligne de commande :
+#
+#     import essaim
+#     graphe = essaim.creer_graphe(essaim.charger_topologie("topology_high.csv"), 60000)
+#     essaim.analyser_graphe(graphe, ['degres', 'chemins'])
+#
+#     python -m essaim analyse --densite forte --portee 60000 --mesures degres,chemins
+#     python -m essaim figures --repertoire figures --formats png,svg
+#     python -m essaim mesures
+#
+# L'import de ce module est immédiat : aucun calcul n'est lancé et les fonctions ci-dessous ne sont importées
+# (avec SciPy, NetworkX ou matplotlib selon le cas) qu'au premier accès à leur nom.
+
+import argparse
+import importlib
+import json
+import sys
+
+# Nom public -> module qui le définit
+_exports = {
+    'fichiers_donnees': 'analyse',
+    'charger_donnees': 'analyse',
+    'creer_graphe': 'analyse',
+    'creer_graphes': 'analyse',
+    'analyser_graphe': 'analyse',
+    'analyser_distances': 'analyse',
+    'statistiques_distances': 'distances_essaim',
+    'mesures_graphe': 'analyse',
+    'mesures_distributions': 'analyse',
+    'mesures_diffusion': 'analyse',
+    'mesures_robustesse': 'analyse',
+    'charger_topologie': 'chargement',
+    'charger_trajectoires': 'chargement',
+    'GrapheEssaim': 'graphe_essaim',
+    'balayage_portees': 'connexite',
+    'composantes_connexes': 'connexite',
+    'compter_plus_courts_chemins': 'chemins',
+    'distribution_chemins_echantillonnee': 'chemins_echantillonnes',
+    'matrice_distances_ponderees': 'chemins',
+    'triangles_et_clustering': 'triangles',
+    'histogramme_cliques': 'cliques',
+    'clique_maximum': 'cliques',
+    'charge_relais': 'charge_relais',
+    'suivre_topologie': 'temporel',
+    'simuler_diffusion': 'diffusion',
+    'diffusion_instantanes': 'diffusion',
+    'ouvrir_index': 'routage',
+    'construire_index': 'routage',
+    'IndexRoutage': 'routage',
+    'analyser_pannes': 'robustesse',
+    'pannes_successives': 'robustesse',
+    'optimiser_portees': 'portees_satellites',
+    'executer_balayage': 'balayage_configurations',
+    'CacheResultats': 'cache_resultats',
+    'exporter_configurations': 'rendu',
+    'instrumenter': 'instrumentation',
+}
+
+__all__ = sorted(_exports)
+
+# Fichiers de données associés aux noms de densité (les noms des fichiers sont aussi acceptés)
+densites = {
+    'faible': 'topology_low.csv', 'low': 'topology_low.csv',
+    'moyenne': 'topology_avg.csv', 'avg': 'topology_avg.csv',
+    'forte': 'topology_high.csv', 'high': 'topology_high.csv',
+}
+
+
+# Import à la demande des noms exportés (PEP 562)
+def __getattr__(nom):
+    if nom not in _exports:
+        raise AttributeError(f"module 'essaim' has no attribute '{nom}'")
+    valeur = getattr(importlib.import_module(_exports[nom]), nom)
+    globals()[nom] = valeur
+    return valeur
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
+
+
+# Une portée entière (60000) et une portée réelle égale (60000.0) doivent partager les entrées du cache
+def _portee(texte):
+    valeur = float(texte)
+    return int(valeur) if valeur.is_integer() else valeur
+
+
+def _liste(texte):
+    return [element.strip() for element in texte.split(',') if element.strip()]
+
+
+# Conversion des résultats (tableaux NumPy, tuples, ...) en valeurs JSON
+def _en_json(valeur):
+    if hasattr(valeur, 'tolist'):
+        return valeur.tolist()
+    if isinstance(valeur, (list, tuple)):
+        return [_en_json(element) for element in valeur]
+    if isinstance(valeur, dict):
+        return {str(cle): _en_json(element) for cle, element in valeur.items()}
+    return valeur
+
+
+def _commande_analyse(arguments):
+    from analyse import mesures_graphe, mesures_distributions, mesures_diffusion, mesures_robustesse
+    from balayage_configurations import executer_balayage
+
+    toutes_mesures = dict(mesures_distributions, **mesures_graphe, **mesures_diffusion, **mesures_robustesse)
+    noms = _liste(arguments.mesures) if arguments.mesures else list(mesures_graphe)
+    inconnues = [nom for nom in noms if nom not in toutes_mesures]
+    if inconnues:
+        raise SystemExit(f"Mesures inconnues : {', '.join(inconnues)} (voir : python -m essaim mesures)")
+
+    if arguments.trace or arguments.profil:
+        import instrumentation
+        instrumentation.activer(arguments.trace, memoire=arguments.trace_memoire, profil_etape=arguments.profil)
+
+    fichiers = [densites.get(densite, densite) for densite in arguments.densite]
+    cache = None
+    if not arguments.sans_cache:
+        from cache_resultats import CacheResultats
+        cache = CacheResultats()
+    resultats = executer_balayage(fichiers, arguments.portee, {nom: toutes_mesures[nom] for nom in noms},
+                                  processus=arguments.processus, cache=cache)
+
+    sortie = []
+    for (i, portee), resultats_configuration in sorted(resultats.items()):
+        sortie.append({'Fichier': fichiers[i], 'Portée': portee, 'Résultats': resultats_configuration})
+
+    if arguments.json:
+        json.dump(_en_json(sortie), sys.stdout, ensure_ascii=False)
+        print()
+    else:
+        for configuration in sortie:
+            print(f"{configuration['Fichier']} - portée {configuration['Portée']} m")
+            for cle, valeur in configuration['Résultats'].items():
+                print(f"  {cle} : {valeur}")
+
+
+def _commande_figures(arguments):
+    from rendu import exporter_configurations
+    fichiers = [densites.get(densite, densite) for densite in arguments.densite] if arguments.densite else None
+    for chemin in exporter_configurations(arguments.repertoire, _liste(arguments.formats), vue=arguments.vue,
+                                          etiquettes=arguments.etiquettes, fichiers=fichiers,
+                                          portees=arguments.portee, noms_densites=arguments.densite):
+        print(chemin)
+
+
+def _commande_mesures(arguments):
+    from analyse import mesures_graphe, mesures_distributions, mesures_diffusion, mesures_robustesse
+    for nom in dict(mesures_graphe, **mesures_distributions, **mesures_diffusion, **mesures_robustesse):
+        print(nom)
+
+
+def _analyseur():
+    analyseur = argparse.ArgumentParser(prog='python -m essaim', description="Analyse des graphes de l'essaim")
+    commandes = analyseur.add_subparsers(dest='commande', required=True)
+
+    analyse = commandes.add_parser('analyse', help="analyser une ou plusieurs configurations (densité × portée)")
+    analyse.add_argument('--densite', nargs='+', required=True,
+                         help="faible/moyenne/forte (ou low/avg/high, ou chemin d'un fichier CSV)")
+    analyse.add_argument('--portee', nargs='+', type=_portee, required=True, help="portée(s) en mètres")
+    analyse.add_argument('--mesures', help="noms des mesures séparés par des virgules (par défaut : mesures_graphe)")
+    analyse.add_argument('--processus', type=int, default=1, help="nombre de processus (1 par défaut)")
+    analyse.add_argument('--sans-cache', action='store_true', help="ne pas lire ni écrire le cache des résultats")
+    analyse.add_argument('--json', action='store_true', help="écrire les résultats au format JSON")
+    analyse.add_argument('--trace', help="fichier de trace des étapes (.json ou .csv, voir instrumentation.py)")
+    analyse.add_argument('--trace-memoire', action='store_true', help="mesurer la mémoire allouée par étape")
+    analyse.add_argument('--profil', help="nom d'une étape à profiler avec cProfile (ex. analyser_chemins)")
+    analyse.set_defaults(executer=_commande_analyse)
+
+    figures = commandes.add_parser('figures', help="enregistrer les figures des configurations sans affichage")
+    figures.add_argument('--repertoire', default='figures')
+    figures.add_argument('--formats', default='png', help="formats séparés par des virgules (png,svg,...)")
+    figures.add_argument('--vue', choices=['3D', '2D'], default='3D')
+    figures.add_argument('--etiquettes', action='store_true', help="afficher les numéros des satellites")
+    figures.add_argument('--densite', nargs='+')
+    figures.add_argument('--portee', nargs='+', type=_portee)
+    figures.set_defaults(executer=_commande_figures)
+
+    mesures = commandes.add_parser('mesures', help="lister les mesures disponibles")
+    mesures.set_defaults(executer=_commande_mesures)
+    return analyseur
+
+
+def main(arguments=None):
+    arguments = _analyseur().parse_args(arguments)
+    arguments.executer(arguments)
+
+
+if __name__ == "__main__":
+    main()
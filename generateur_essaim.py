@@ -0,0 +1,57 @@
+# L'objectif de ce fichier est de générer des essaims synthétiques de grande taille (de 100 à 100 000
+# satellites) qui reproduisent la répartition spatiale de topology_low/avg/high.csv.
+#
+# On estime la densité des positions de l'essaim de référence par noyaux gaussiens : chaque nouveau
+# satellite est un satellite de référence tiré au hasard, déplacé d'un bruit gaussien de même covariance
+# que l'essaim (réduite par la règle de Scott). La forme de l'essaim (centre, axes, allongement) est
+# donc conservée. Pour que les graphes restent comparables à portée égale, le nuage est ensuite dilaté
+# d'un facteur (n / n_référence)^(1/3) autour de son centre : le nombre de satellites par unité de volume,
+# et donc le degré moyen à une portée donnée, reste celui de l'essaim de référence.
+
+import numpy as np
+
+fichiers_reference = {
+    'faible': 'topology_low.csv',
+    'moyenne': 'topology_avg.csv',
+    'forte': 'topology_high.csv',
+}
+
+
+# Cette fonction renvoie (nums_sat, coordonnees_sat) pour un essaim synthétique de n satellites.
+#   reference : densité ('faible', 'moyenne', 'forte'), fichier CSV ou tableau (m, 3) de coordonnées
+#   conserver_densite : si False, le nuage n'est pas dilaté (l'essaim devient de plus en plus dense)
+def generer_essaim(reference, n, graine=None, conserver_densite=True):
+    coordonnees_reference = _coordonnees_reference(reference)
+    m = len(coordonnees_reference)
+    generateur = np.random.default_rng(graine)
+
+    centre = coordonnees_reference.mean(axis=0)
+    covariance = np.cov(coordonnees_reference, rowvar=False)
+    # Largeur de bande de Scott en dimension 3 : m^(-1/(d+4))
+    largeur = m ** (-1.0 / 7.0)
+    facteur_cholesky = np.linalg.cholesky(covariance * largeur ** 2)
+
+    tirages = generateur.integers(0, m, size=n)
+    coordonnees_sat = coordonnees_reference[tirages] + generateur.standard_normal((n, 3)) @ facteur_cholesky.T
+    # Le bruit augmente la variance d'un facteur (1 + largeur²) : on la ramène à celle de la référence
+    echelle = 1.0 / np.sqrt(1.0 + largeur ** 2)
+    if conserver_densite:
+        echelle *= (n / m) ** (1.0 / 3.0)
+    coordonnees_sat = centre + (coordonnees_sat - centre) * echelle
+    return np.arange(n), np.ascontiguousarray(coordonnees_sat)
+
+
+# Cette fonction écrit un essaim au format de topology_*.csv (sat_id, x, y, z)
+def enregistrer_essaim(fichier_csv, nums_sat, coordonnees_sat):
+    import pandas as pd
+    essaim_DF = pd.DataFrame({'sat_id': nums_sat, 'x': coordonnees_sat[:, 0], 'y': coordonnees_sat[:, 1],
+                              'z': coordonnees_sat[:, 2]})
+    essaim_DF.to_csv(fichier_csv, index=False)
+
+
+def _coordonnees_reference(reference):
+    if isinstance(reference, str):
+        from chargement import charger_topologie
+        _, coordonnees = charger_topologie(fichiers_reference.get(reference, reference))
+        return np.asarray(coordonnees, dtype=np.float64)
+    return np.asarray(reference, dtype=np.float64)
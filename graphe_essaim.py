@@ -0,0 +1,140 @@
+# L'objectif de ce fichier est de proposer une représentation compacte du graphe de l'essaim.
+# Au lieu d'un nx.Graph (dictionnaires de dictionnaires, un tableau NumPy par sommet pour 'pos'),
+# on garde un seul tableau (n, 3) de coordonnées, les arêtes au format CSR (indices int32 et poids float32
+# optionnels, environ une dizaine d'octets par arête) et la correspondance sat_id <-> indice.
+# La conversion vers NetworkX n'est faite qu'à la demande.
+#
+# La classe offre aussi les quelques méthodes de nx.Graph utilisées par les analyses et les affichages
+# (nodes, edges, degree, ...), pour pouvoir leur être passée directement.
+
+import numpy as np
+import networkx as nx
+from scipy.sparse import csr_array
+
+from aretes import paires_a_portee
+
+
+class GrapheEssaim:
+
+    def __init__(self, nums_sat, coordonnees_sat, indptr, indices, poids=None):
+        self.nums_sat = np.asarray(nums_sat)
+        self.coordonnees_sat = np.ascontiguousarray(coordonnees_sat, dtype=np.float64)
+        type_pointeurs = np.int32 if len(indices) < np.iinfo(np.int32).max else np.int64
+        self.indptr = np.asarray(indptr, dtype=type_pointeurs)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.poids = np.asarray(poids, dtype=np.float32) if poids is not None else None
+        self._index = None
+
+    # Construction à partir des tableaux d'arêtes (i < j) renvoyés par aretes.paires_a_portee
+    @classmethod
+    def depuis_paires(cls, nums_sat, coordonnees_sat, sources, cibles, poids=None):
+        n = len(nums_sat)
+        lignes = np.concatenate([sources, cibles])
+        colonnes = np.concatenate([cibles, sources])
+        ordre = np.lexsort((colonnes, lignes))
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(lignes, minlength=n))])
+        poids_csr = np.concatenate([poids, poids])[ordre] if poids is not None else None
+        return cls(nums_sat, coordonnees_sat, indptr, colonnes[ordre], poids_csr)
+
+    # Construction directe pour une portée donnée (poids = distance² si pondere vaut True).
+    # Contrairement à creer_graphe, tous les satellites sont présents, y compris les satellites isolés.
+    @classmethod
+    def depuis_coordonnees(cls, nums_sat, coordonnees_sat, portee, pondere=False):
+        sources, cibles, distances = paires_a_portee(coordonnees_sat, portee)
+        return cls.depuis_paires(nums_sat, coordonnees_sat, sources, cibles, distances ** 2 if pondere else None)
+
+    # Conversion depuis un graphe NetworkX (les coordonnées sont lues dans l'attribut 'pos' s'il existe)
+    @classmethod
+    def depuis_networkx(cls, graphe, poids=None):
+        nums_sat = list(graphe.nodes())
+        index = {sat: i for i, sat in enumerate(nums_sat)}
+        positions = nx.get_node_attributes(graphe, 'pos')
+        coordonnees_sat = np.array([positions[sat] for sat in nums_sat], dtype=np.float64) \
+            if len(positions) == len(nums_sat) and nums_sat else np.full((len(nums_sat), 3), np.nan)
+        aretes = list(graphe.edges(data=poids, default=1.0)) if poids is not None else list(graphe.edges())
+        sources = np.array([index[arete[0]] for arete in aretes], dtype=np.int64)
+        cibles = np.array([index[arete[1]] for arete in aretes], dtype=np.int64)
+        valeurs = np.array([arete[2] for arete in aretes], dtype=np.float64) if poids is not None else None
+        return cls.depuis_paires(nums_sat, coordonnees_sat, sources, cibles, valeurs)
+
+    # Conversion vers NetworkX, à la demande (attribut 'pos' et, si le graphe est pondéré, attribut de poids)
+    def vers_networkx(self, poids='weight', isoles=True):
+        graphe = nx.Graph()
+        if isoles:
+            graphe.add_nodes_from((sat, {'pos': position})
+                                  for sat, position in zip(self.nums_sat.tolist(), self.coordonnees_sat))
+        sources, cibles = self.aretes_indices()
+        extremites_u = self.nums_sat[sources].tolist()
+        extremites_v = self.nums_sat[cibles].tolist()
+        if self.poids is not None and poids is not None:
+            valeurs = self.poids_aretes().astype(np.float64).tolist()
+            graphe.add_edges_from((u, v, {poids: w}) for u, v, w in zip(extremites_u, extremites_v, valeurs))
+        else:
+            graphe.add_edges_from(zip(extremites_u, extremites_v))
+        return graphe
+
+    # Matrice d'adjacence creuse (partage les tableaux d'indices) ; avec poids, elle contient les poids
+    def adjacence(self, poids=None):
+        if poids is not None:
+            if self.poids is None:
+                raise ValueError("Le graphe de l'essaim n'est pas pondéré")
+            valeurs = self.poids.astype(np.float64)
+        else:
+            valeurs = np.ones(len(self.indices))
+        n = len(self.nums_sat)
+        return csr_array((valeurs, self.indices, self.indptr), shape=(n, n))
+
+    # Indice (ligne de coordonnees_sat) d'un satellite à partir de son numéro
+    def index(self, sat):
+        if self._index is None:
+            self._index = {s: i for i, s in enumerate(self.nums_sat.tolist())}
+        return self._index[sat]
+
+    def degres(self):
+        return np.diff(self.indptr)
+
+    # Arêtes sous forme de deux tableaux d'indices (i < j)
+    def aretes_indices(self):
+        lignes = np.repeat(np.arange(len(self.nums_sat)), np.diff(self.indptr))
+        garder = lignes < self.indices
+        return lignes[garder], self.indices[garder].astype(np.int64)
+
+    # Poids des arêtes, dans l'ordre de aretes_indices
+    def poids_aretes(self):
+        lignes = np.repeat(np.arange(len(self.nums_sat)), np.diff(self.indptr))
+        return self.poids[lignes < self.indices]
+
+    # Positions au format de creation_graphe_essain (sat_id -> coordonnées)
+    def positions(self):
+        return dict(zip(self.nums_sat.tolist(), self.coordonnees_sat))
+
+    # Méthodes compatibles avec nx.Graph
+    def nodes(self):
+        return self.nums_sat.tolist()
+
+    def edges(self):
+        sources, cibles = self.aretes_indices()
+        return list(zip(self.nums_sat[sources].tolist(), self.nums_sat[cibles].tolist()))
+
+    def degree(self):
+        return list(zip(self.nums_sat.tolist(), self.degres().tolist()))
+
+    def number_of_nodes(self):
+        return len(self.nums_sat)
+
+    def number_of_edges(self):
+        return len(self.indices) // 2
+
+    def __len__(self):
+        return len(self.nums_sat)
+
+    def __iter__(self):
+        return iter(self.nums_sat.tolist())
+
+
+# On renvoie un graphe NetworkX, en convertissant un GrapheEssaim si nécessaire
+# (pour les algorithmes qui n'existent que dans NetworkX, comme l'énumération des cliques)
+def en_networkx(graphe, poids='weight'):
+    if isinstance(graphe, GrapheEssaim):
+        return graphe.vers_networkx(poids=poids)
+    return graphe
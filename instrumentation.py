@@ -0,0 +1,259 @@
+# L'objectif de ce fichier est de savoir où part le temps d'une analyse (chargement, construction des graphes,
+# mesures, affichage). Les fonctions principales sont décorées par @instrumenter et les blocs de code
+# peuvent être entourés par « with etape(nom) » : pour chaque appel, on enregistre la durée, le temps CPU,
+# la mémoire allouée (optionnelle, avec tracemalloc), le pic de mémoire du processus et le nombre de
+# sommets et d'arêtes du graphe traité, avec la configuration courante (fichier, portée).
+#
+# Désactivée (cas par défaut), l'instrumentation se réduit à un test de booléen par appel.
+# Activation :
+#     instrumentation.activer('trace.json', memoire=True, profil_etape='analyser_graphe')
+# ou, sans modifier les scripts, par variables d'environnement :
+#     ESSAIM_TRACE=trace.csv [ESSAIM_TRACE_MEMOIRE=1] [ESSAIM_PROFIL=creer_graphe] python resultats_toutes_parties.py
+# La trace est écrite à la fin du programme (JSON ou CSV selon l'extension) ; le profil cProfile de l'étape
+# choisie est écrit dans un fichier .prof (lisible avec pstats ou snakeviz).
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import time
+
+try:
+    import resource
+except ImportError:
+    # Pas de getrusage hors Unix : le pic de mémoire du processus n'est pas relevé
+    resource = None
+
+_actif = False
+_memoire = False
+_enregistrements = []
+_pile = []
+_configuration = {}
+_profil = {'etape': None, 'fichier': None, 'profileur': None, 'actif': False}
+_sortie = {'fichier': None, 'enregistree': False, 'atexit': False}
+_NUL = contextlib.nullcontext()
+# Variables d'environnement lues par _activer_depuis_environnement (héritées par les processus de calcul)
+_VARIABLES_ENVIRONNEMENT = ('ESSAIM_TRACE', 'ESSAIM_INSTRUMENTATION', 'ESSAIM_TRACE_MEMOIRE', 'ESSAIM_PROFIL',
+                            'ESSAIM_PROFIL_FICHIER')
+
+
+def est_actif():
+    return _actif
+
+
+# Cette fonction active l'instrumentation dans le processus courant.
+#   fichier : trace écrite à la fin du programme (None : on la récupère avec enregistrements())
+#   memoire : mesure de la mémoire allouée par étape avec tracemalloc (ralentit les calculs)
+#   profil_etape : nom d'une étape dont les appels sont profilés par cProfile (fichier_profil)
+# Les processus de calcul lancés ensuite (voir balayage_configurations.py) sont activés eux aussi.
+def activer(fichier=None, memoire=False, profil_etape=None, fichier_profil=None):
+    global _actif, _memoire
+    _actif = True
+    _memoire = memoire
+    if memoire:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    if profil_etape is not None:
+        _profil['etape'] = profil_etape
+        _profil['fichier'] = fichier_profil or f"profil_{profil_etape}.prof"
+    os.environ['ESSAIM_INSTRUMENTATION'] = '1'
+    os.environ['ESSAIM_TRACE_MEMOIRE'] = '1' if memoire else ''
+    if profil_etape is not None:
+        os.environ['ESSAIM_PROFIL'] = profil_etape
+        os.environ['ESSAIM_PROFIL_FICHIER'] = _profil['fichier']
+    if fichier is not None and not _sortie['atexit']:
+        atexit.register(_terminer)
+        _sortie['atexit'] = True
+    _sortie['fichier'] = fichier
+
+
+# Cette fonction désactive l'instrumentation dans le processus courant et dans les processus de calcul lancés
+# ensuite : toutes les variables d'environnement qui les activeraient sont retirées.
+def desactiver():
+    global _actif
+    _actif = False
+    for variable in _VARIABLES_ENVIRONNEMENT:
+        os.environ.pop(variable, None)
+
+
+# Les étiquettes données (par exemple fichier et portée) sont ajoutées aux enregistrements du bloc
+@contextlib.contextmanager
+def configuration(**etiquettes):
+    precedentes = dict(_configuration)
+    _configuration.update(etiquettes)
+    try:
+        yield
+    finally:
+        _configuration.clear()
+        _configuration.update(precedentes)
+
+
+# Bloc de code mesuré ; graphe (optionnel) sert à relever le nombre de sommets et d'arêtes
+def etape(nom, graphe=None):
+    if not _actif:
+        return _NUL
+    return _Etape(nom, graphe)
+
+
+# Décorateur : chaque appel de la fonction est une étape (du nom de la fonction, par défaut).
+# Le graphe est cherché dans les arguments, puis dans la valeur renvoyée.
+def instrumenter(nom=None):
+    def decorer(fonction):
+        nom_etape = nom or fonction.__name__
+
+        @functools.wraps(fonction)
+        def fonction_instrumentee(*args, **kwargs):
+            if not _actif:
+                return fonction(*args, **kwargs)
+            mesure = _Etape(nom_etape, _chercher_graphe(args, kwargs))
+            with mesure:
+                resultat = fonction(*args, **kwargs)
+                if mesure.graphe is None and hasattr(resultat, 'number_of_nodes'):
+                    mesure.graphe = resultat
+            return resultat
+
+        return fonction_instrumentee
+
+    return decorer
+
+
+def _chercher_graphe(args, kwargs):
+    for valeur in list(args) + list(kwargs.values()):
+        if hasattr(valeur, 'number_of_nodes'):
+            return valeur
+    return None
+
+
+class _Etape:
+
+    def __init__(self, nom, graphe):
+        self.nom = nom
+        self.graphe = graphe
+        self.pic_enfants = 0
+
+    def __enter__(self):
+        if _memoire:
+            import tracemalloc
+            courant, pic = tracemalloc.get_traced_memory()
+            # Le pic du bloc parent jusqu'ici ne doit pas être perdu par reset_peak
+            if _pile:
+                _pile[-1].pic_enfants = max(_pile[-1].pic_enfants, pic - _pile[-1].memoire_debut)
+            tracemalloc.reset_peak()
+            self.memoire_debut = courant
+        self.parent = _pile[-1].nom if _pile else None
+        _pile.append(self)
+        if self.nom == _profil['etape'] and not _profil['actif']:
+            import cProfile
+            if _profil['profileur'] is None:
+                _profil['profileur'] = cProfile.Profile()
+            _profil['profileur'].enable()
+            _profil['actif'] = self
+        self.cpu_debut = time.process_time()
+        self.debut = time.perf_counter()
+        return self
+
+    def __exit__(self, *exception):
+        duree = time.perf_counter() - self.debut
+        cpu = time.process_time() - self.cpu_debut
+        if _profil['actif'] is self:
+            _profil['profileur'].disable()
+            _profil['actif'] = False
+            # Statistiques cumulées de tous les appels de l'étape jusqu'ici
+            _profil['profileur'].dump_stats(_profil['fichier'])
+        _pile.pop()
+
+        enregistrement = dict(_configuration)
+        enregistrement.update({'Étape': self.nom, 'Parent': self.parent, 'Processus': os.getpid(),
+                               'Durée (s)': duree, 'Temps CPU (s)': cpu})
+        if _memoire:
+            import tracemalloc
+            _, pic = tracemalloc.get_traced_memory()
+            pic_bloc = max(pic - self.memoire_debut, self.pic_enfants)
+            enregistrement['Mémoire Allouée (octets)'] = pic_bloc
+            if _pile:
+                _pile[-1].pic_enfants = max(_pile[-1].pic_enfants, pic_bloc + self.memoire_debut - _pile[-1].memoire_debut)
+        if resource is not None:
+            # ru_maxrss est en kilo-octets sous Linux
+            enregistrement['Pic RSS du Processus (octets)'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        if self.graphe is not None:
+            enregistrement['Noeuds'] = self.graphe.number_of_nodes()
+            enregistrement['Arêtes'] = self.graphe.number_of_edges()
+        if exception[0] is not None:
+            enregistrement['Erreur'] = exception[0].__name__
+        _enregistrements.append(enregistrement)
+        return False
+
+
+def enregistrements():
+    return list(_enregistrements)
+
+
+# On renvoie et on oublie les enregistrements du processus courant (pour les transmettre au processus principal)
+def vider():
+    enregistres = list(_enregistrements)
+    _enregistrements.clear()
+    return enregistres
+
+
+# Dans un processus de calcul créé par fork, on oublie l'état hérité du processus principal
+def reinitialiser_processus():
+    _enregistrements.clear()
+    _pile.clear()
+    if _profil['etape'] is not None:
+        _profil['profileur'] = None
+        _profil['actif'] = False
+        _profil['fichier'] = _fichier_profil_processus()
+
+
+def _fichier_profil_processus():
+    base = os.environ.get('ESSAIM_PROFIL_FICHIER') or _profil['fichier']
+    return f"{os.path.splitext(base)[0]}_{os.getpid()}.prof"
+
+
+# On ajoute des enregistrements venant d'un autre processus
+def ajouter(enregistres):
+    _enregistrements.extend(enregistres)
+
+
+# Cette fonction écrit la trace au format JSON (liste d'enregistrements) ou CSV (une ligne par enregistrement)
+def enregistrer_trace(fichier, enregistres=None):
+    enregistres = _enregistrements if enregistres is None else enregistres
+    if fichier.endswith('.csv'):
+        import csv
+        colonnes = []
+        for enregistrement in enregistres:
+            colonnes.extend(cle for cle in enregistrement if cle not in colonnes)
+        with open(fichier, 'w', newline='') as f:
+            ecrivain = csv.DictWriter(f, fieldnames=colonnes)
+            ecrivain.writeheader()
+            ecrivain.writerows(enregistres)
+    else:
+        with open(fichier, 'w') as f:
+            json.dump(enregistres, f, ensure_ascii=False, indent=1, default=str)
+
+
+def _terminer():
+    if _sortie['fichier'] is not None and not _sortie['enregistree']:
+        enregistrer_trace(_sortie['fichier'])
+        _sortie['enregistree'] = True
+
+
+# Activation par variables d'environnement. Les processus de calcul héritent de l'activation,
+# mais seul le processus principal écrit la trace (les autres renvoient leurs enregistrements).
+def _activer_depuis_environnement():
+    from multiprocessing import parent_process
+    principal = parent_process() is None
+    fichier = os.environ.get('ESSAIM_TRACE')
+    if not (fichier or os.environ.get('ESSAIM_INSTRUMENTATION')):
+        return
+    activer(fichier if principal else None, memoire=bool(os.environ.get('ESSAIM_TRACE_MEMOIRE')),
+            profil_etape=os.environ.get('ESSAIM_PROFIL') or None,
+            fichier_profil=os.environ.get('ESSAIM_PROFIL_FICHIER') or None)
+    if not principal and _profil['etape'] is not None:
+        # Le profil d'un processus de calcul est écrit dans son propre fichier
+        _profil['fichier'] = _fichier_profil_processus()
+
+
+_activer_depuis_environnement()
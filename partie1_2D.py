@@ -1,12 +1,15 @@
-import pandas as pd
-import networkx as nx
-import matplotlib.pyplot as plt
-import numpy as np
+# NetworkX, MatPlotLib, la construction des arêtes par index spatial (voir aretes.py) et le dessin groupé
+# (voir rendu.py) ne sont importés que dans les fonctions qui s'en servent : importer ce module ne charge
+# ni matplotlib, ni SciPy, ni NetworkX.
 
-# Lecture des fichiers CSV
-essain_low_DF = pd.read_csv("topology_low.csv")
-essain_avg_DF = pd.read_csv("topology_avg.csv")
-essain_high_DF = pd.read_csv("topology_high.csv")
+# Chargement des positions depuis leur conversion binaire projetée en mémoire (voir chargement.py)
+from chargement import charger_topologie, nums_et_coordonnees
+
+# Lecture des fichiers CSV (nums_sat, coordonnées projetés en mémoire)
+if __name__ == "__main__":
+    essain_low_DF = charger_topologie("topology_low.csv")
+    essain_avg_DF = charger_topologie("topology_avg.csv")
+    essain_high_DF = charger_topologie("topology_high.csv")
 
 
 # Portées nominales pour les calculs d'arêtes
@@ -18,14 +21,14 @@ portees_nominales = [20000, 40000, 60000]
 
 # Cette fonction permet de créer un graphe à partir d'un DataFrame contenant les informations des satellites.
 def creation_graphe_essain(essain_DF):
+    import networkx as nx
+
     # On crée tout d'abord un graphe vide
     essain_Graphe = nx.Graph()
 
-    # Puis on récupère la liste des numéros de sommets
-    nums_sat = essain_DF["sat_id"].tolist()
-
-    # On récupère les coordonnées des satellites sous forme de numpy array
-    coordonnees_sat = np.array(essain_DF[["x", "y", "z"]])
+    # Puis on récupère les numéros de sommets (en liste) et les coordonnées des satellites (numpy array)
+    nums_sat, coordonnees_sat = nums_et_coordonnees(essain_DF)
+    nums_sat = nums_sat.tolist()
 
 
     for i in range(len(nums_sat)):
@@ -39,9 +42,10 @@ def creation_graphe_essain(essain_DF):
 
 
 # On crée les graphes des trois essains
-essain_graphe_low, pos_low, coordonnees_sat_low, nums_sat_low = creation_graphe_essain(essain_low_DF)
-essain_graphe_avg, pos_avg, coordonnees_sat_avg, nums_sat_avg = creation_graphe_essain(essain_avg_DF)
-essain_graphe_high, pos_high, coordonnees_sat_high, nums_sat_high = creation_graphe_essain(essain_high_DF)
+if __name__ == "__main__":
+    essain_graphe_low, pos_low, coordonnees_sat_low, nums_sat_low = creation_graphe_essain(essain_low_DF)
+    essain_graphe_avg, pos_avg, coordonnees_sat_avg, nums_sat_avg = creation_graphe_essain(essain_avg_DF)
+    essain_graphe_high, pos_high, coordonnees_sat_high, nums_sat_high = creation_graphe_essain(essain_high_DF)
 
 
 #######################################################
@@ -50,36 +54,23 @@ essain_graphe_high, pos_high, coordonnees_sat_high, nums_sat_high = creation_gra
 
 # Cette fonction permet d'ajouter les arêtes entre les satellites si la distance est inférieure à la portée
 def ajout_des_aretes(graphe, portee, nums_sat, coordonnees_sat):
-    n = len(nums_sat)
-
-    for i in range(n):
-        for j in range(i + 1, n):
-            coordonnees_sat_i = coordonnees_sat[i]
-            coordonnees_sat_j = coordonnees_sat[j]
-            distance = np.linalg.norm(coordonnees_sat_i - coordonnees_sat_j)
-
-            # Si la distance est inférieure ou égale à la portée de communication, on ajoute une arête
-            if distance <= portee:
-                graphe.add_edge(nums_sat[i], nums_sat[j])
-
-    return graphe
+    from aretes import paires_a_portee, ajouter_aretes_depuis_paires
+    # On récupère en un seul appel les paires dont la distance est inférieure ou égale à la portée
+    sources, cibles, _ = paires_a_portee(coordonnees_sat, portee)
+    return ajouter_aretes_depuis_paires(graphe, nums_sat, sources, cibles)
 
 
 # Fonction qui permet d'afficher un graphe en 2D avec arêtes
-def affichage_graphe_2D_aretes(graphe, pos, nom_figure):
+# (si fichier est donné, chemin sans extension, la figure est enregistrée au lieu d'être affichée)
+def affichage_graphe_2D_aretes(graphe, pos, nom_figure, etiquettes=True, fichier=None, formats=('png',)):
+    import matplotlib.pyplot as plt
+    from rendu import dessiner_graphe_2D, enregistrer_figure
+
     # On crée une figure 2D
     fig, ax = plt.subplots()
 
-    # On dessine les nœuds
-    for node, (x, y, z) in pos.items():
-        ax.scatter(x, y, s=50, label=f'Nœud {node}')
-        ax.text(x, y, f'{node}', size=10, zorder=1)
-
-    # Idem pour lesarêtes
-    for edge in graphe.edges():
-        x = [pos[edge[0]][0], pos[edge[1]][0]]
-        y = [pos[edge[0]][1], pos[edge[1]][1]]
-        ax.plot(x, y, 'gray')
+    # On dessine les nœuds (un scatter) et les arêtes (une LineCollection), avec les labels si demandé
+    dessiner_graphe_2D(ax, graphe, pos, etiquettes=etiquettes)
 
     # Configuration du graphe
     ax.set_title(nom_figure)
@@ -87,28 +78,33 @@ def affichage_graphe_2D_aretes(graphe, pos, nom_figure):
     ax.set_ylabel('Y')
     plt.grid(True)
     plt.axis('equal')
-    plt.show()
+    if fichier is not None:
+        enregistrer_figure(fig, fichier, formats)
+    else:
+        plt.show()
+    plt.close(fig)
 
 # Cette fonction nous permet d'afficher les graphes en 2D sur une même ligne.
-def affichage_graphe_2D_aretes_horizontaux(essain_graphe, pos, coordonnees_sat, nums_sat, portees, densite):
+# Si fichier est donné (chemin sans extension), la figure est enregistrée au lieu d'être affichée.
+def affichage_graphe_2D_aretes_horizontaux(essain_graphe, pos, coordonnees_sat, nums_sat, portees, densite,
+                                           etiquettes=True, fichier=None, formats=('png',)):
+    import matplotlib.pyplot as plt
+    from aretes import graphes_par_portee
+    from rendu import dessiner_graphe_2D, enregistrer_figure
+
     # On crée une figure avec 3 sous-graphes
     fig, axes = plt.subplots(1, 3, figsize=(18, 6))
     fig.suptitle(f"Graphe de densité {densite} pour différentes portées", fontsize=16)
+
+    # On construit les graphes de toutes les portées à partir d'une seule recherche de voisins
+    graphes = graphes_par_portee(nums_sat, coordonnees_sat, portees, graphe_base=essain_graphe)
     
     for ax, portee in zip(axes, portees):
-        # On ajoute les arêtes en fonction de la portée
-        graphe_temp = ajout_des_aretes(essain_graphe.copy(), portee, nums_sat, coordonnees_sat)
-
-        # On dessine les nœuds
-        for node, (x, y, z) in pos.items():
-            ax.scatter(x, y, s=50, label=f'Nœud {node}')
-            ax.text(x, y, f'{node}', size=8, zorder=1)
+        # On récupère le graphe avec les arêtes correspondant à la portée
+        graphe_temp = graphes[portee]
 
-        # Puis les arêtes
-        for edge in graphe_temp.edges():
-            x = [pos[edge[0]][0], pos[edge[1]][0]]
-            y = [pos[edge[0]][1], pos[edge[1]][1]]
-            ax.plot(x, y, 'gray')
+        # On dessine les nœuds et les arêtes en deux appels
+        dessiner_graphe_2D(ax, graphe_temp, pos, etiquettes=etiquettes, taille_etiquettes=8)
 
         # Configuration
         ax.set_title(f"Portée : {portee} m")
@@ -118,9 +114,14 @@ def affichage_graphe_2D_aretes_horizontaux(essain_graphe, pos, coordonnees_sat,
         ax.axis('equal')
 
     plt.tight_layout()
-    plt.show()
+    if fichier is not None:
+        enregistrer_figure(fig, fichier, formats)
+    else:
+        plt.show()
+    plt.close(fig)
 
 # Appels pour les différentes densités :
-affichage_graphe_2D_aretes_horizontaux(essain_graphe_low, pos_low, coordonnees_sat_low, nums_sat_low, portees_nominales, "faible")
-affichage_graphe_2D_aretes_horizontaux(essain_graphe_avg, pos_avg, coordonnees_sat_avg, nums_sat_avg, portees_nominales, "moyenne")
-affichage_graphe_2D_aretes_horizontaux(essain_graphe_high, pos_high, coordonnees_sat_high, nums_sat_high, portees_nominales, "forte")
\ No newline at end of file
+if __name__ == "__main__":
+    affichage_graphe_2D_aretes_horizontaux(essain_graphe_low, pos_low, coordonnees_sat_low, nums_sat_low, portees_nominales, "faible")
+    affichage_graphe_2D_aretes_horizontaux(essain_graphe_avg, pos_avg, coordonnees_sat_avg, nums_sat_avg, portees_nominales, "moyenne")
+    affichage_graphe_2D_aretes_horizontaux(essain_graphe_high, pos_high, coordonnees_sat_high, nums_sat_high, portees_nominales, "forte")
\ No newline at end of file
@@ -0,0 +1,296 @@
+# L'objectif de ce fichier est d'étudier des portées différentes d'un satellite à l'autre : chaque satellite
+# choisit sa portée d'émission parmi quelques niveaux (20, 40 ou 60 km) et un lien n'existe que si les deux
+# satellites s'atteignent mutuellement (distance <= plus petite des deux portées, voir aretes.paires_a_portee).
+#
+# On cherche l'affectation de portée totale la plus faible qui garde l'essaim aussi connexe qu'à la portée
+# maximale (mêmes composantes connexes) et, si on le demande, dont le diamètre en sauts ne dépasse pas une cible :
+#   - les paires candidates sont cherchées une seule fois, à la portée maximale ; chaque paire retient le plus
+#     petit niveau qui la couvre, et les liens d'une affectation s'obtiennent par une comparaison sur ces tableaux ;
+#   - borne inférieure : une affectation qui convient contient une forêt couvrante ; en l'orientant depuis une
+#     racine par composante, chaque lien impose son niveau au satellite qui n'est pas du côté de la racine.
+#     Le coût dépasse donc le poids de la forêt couvrante minimale, plus le niveau minimal d'une racine ;
+#     cette forêt minimale donne aussi une première affectation (au plus deux fois la borne) ;
+#   - une deuxième affectation part du plus petit niveau utile de chaque satellite et relève des portées,
+#     fusion par fusion, dans une structure union-find (on ne fait qu'ajouter des liens) ;
+#   - les affectations sont ensuite améliorées en baissant les portées une à une. Une baisse qui ne retire
+#     aucun lien d'une forêt couvrante tenue à jour ne déconnecte rien et s'accepte en O(degré), sans
+#     reconstruire de graphe ; sinon seule la forêt est recalculée (fonction compilée de SciPy).
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components, minimum_spanning_tree, shortest_path
+
+from aretes import paires_a_portee
+from chemins import taille_lot_sources
+from connexite import EnsemblesDisjoints
+
+NIVEAUX_PORTEE = (20000, 40000, 60000)
+
+# Nombre de relèvements évalués (diamètre recalculé) à chaque étape de la recherche d'un diamètre cible
+CANDIDATS_DIAMETRE = 16
+
+
+# Données partagées par toutes les affectations d'un essaim : paires candidates (à la portée maximale),
+# niveau nécessaire de chaque paire et liste des paires incidentes à chaque satellite.
+# Les affectations sont des tableaux d'indices de niveaux (0 pour le premier niveau).
+class _ProblemePortees:
+
+    def __init__(self, coordonnees_sat, niveaux, puissance, diametre_max):
+        self.n = len(coordonnees_sat)
+        self.sources, self.cibles, distances = paires_a_portee(coordonnees_sat, niveaux[-1])
+        self.besoins = np.searchsorted(niveaux, distances, side='left')
+        self.couts = np.asarray(niveaux, dtype=np.float64) ** puissance
+        self.diametre_max = diametre_max
+        self.evaluees = 0
+
+        extremites = np.concatenate([self.sources, self.cibles])
+        numeros = np.arange(len(self.besoins))
+        ordre = np.argsort(extremites, kind='stable')
+        self.debuts = np.searchsorted(extremites[ordre], np.arange(self.n + 1))
+        self.incidentes = np.concatenate([numeros, numeros])[ordre]
+
+        # Plus petit niveau utile de chaque satellite : celui de sa paire la moins exigeante (le premier niveau
+        # pour un satellite sans voisin)
+        self.minimums = np.full(self.n, len(niveaux) - 1, dtype=np.int64)
+        np.minimum.at(self.minimums, extremites, np.concatenate([self.besoins, self.besoins]))
+        self.minimums[np.diff(self.debuts) == 0] = 0
+        self.nombre_composantes, self.composantes = connected_components(self.matrice(self.presentes(
+            np.full(self.n, len(niveaux) - 1))), directed=False)
+
+    def presentes(self, niveaux_sat):
+        return np.minimum(niveaux_sat[self.sources], niveaux_sat[self.cibles]) >= self.besoins
+
+    # Matrice d'adjacence des liens présents ; la valeur d'un lien est son numéro + 1
+    def matrice(self, presentes):
+        numeros = np.flatnonzero(presentes)
+        return coo_matrix((numeros + 1.0, (self.sources[numeros], self.cibles[numeros])),
+                          shape=(self.n, self.n)).tocsr()
+
+    # Numéros des liens d'une forêt couvrante des liens présents
+    def foret(self, presentes):
+        return minimum_spanning_tree(self.matrice(presentes)).data.astype(np.int64) - 1
+
+    # La forêt couvre autant que la portée maximale si elle a n - (nombre de composantes) liens
+    def couvrante(self, foret):
+        return len(foret) == self.n - self.nombre_composantes
+
+    # Plus grand diamètre (en sauts) des composantes connexes : un seul calcul de toutes les distances si
+    # elles tiennent en un lot, sinon l'algorithme iFUB composante par composante
+    def diametre(self, presentes):
+        from robustesse import diametre_sauts
+        adjacence = self.matrice(presentes)
+        adjacence = adjacence + adjacence.T
+        if taille_lot_sources(self.n) >= self.n:
+            distances = shortest_path(adjacence, method='D', unweighted=True, directed=True)
+            return int(distances[np.isfinite(distances)].max()) if self.n > 0 else 0
+        nombre, etiquettes = connected_components(adjacence, directed=False)
+        ordre = np.argsort(etiquettes, kind='stable')
+        bornes = np.searchsorted(etiquettes[ordre], np.arange(nombre + 1))
+        diametre = 0
+        for c in range(nombre):
+            sommets = ordre[bornes[c]:bornes[c + 1]]
+            if len(sommets) > 2:
+                diametre = max(diametre, diametre_sauts(adjacence[sommets][:, sommets]))
+            elif len(sommets) == 2:
+                diametre = max(diametre, 1)
+        return diametre
+
+    def cout(self, niveaux_sat):
+        return float(self.couts[niveaux_sat].sum())
+
+    # Borne inférieure du coût d'une affectation qui garde les composantes de la portée maximale, et
+    # affectation tirée de la forêt couvrante minimale (chaque satellite prend le niveau de son lien le plus long)
+    def borne_et_arbre(self):
+        poids = coo_matrix((self.couts[self.besoins], (self.sources, self.cibles)), shape=(self.n, self.n))
+        foret = minimum_spanning_tree(poids.tocsr()).tocoo()
+        niveaux_foret = np.searchsorted(self.couts, foret.data)
+        racines = np.full(self.nombre_composantes, np.inf)
+        np.minimum.at(racines, self.composantes, self.couts[self.minimums])
+        borne = max(float(foret.data.sum() + racines.sum()), self.cout(self.minimums))
+
+        niveaux_sat = self.minimums.copy()
+        np.maximum.at(niveaux_sat, foret.row, niveaux_foret)
+        np.maximum.at(niveaux_sat, foret.col, niveaux_foret)
+        return borne, niveaux_sat
+
+    # Partant du plus petit niveau utile de chaque satellite, on relie les composantes par la paire dont le
+    # surcoût est le plus faible, jusqu'à retrouver les composantes de la portée maximale. Relever un satellite
+    # n'ajoute que des liens : les composantes sont suivies par union-find, sans recalcul.
+    def relever(self):
+        niveaux_sat = self.minimums.copy()
+        nombre, etiquettes = connected_components(self.matrice(self.presentes(niveaux_sat)), directed=False)
+        ensembles = EnsemblesDisjoints(nombre)
+        while ensembles.nombre_composantes > self.nombre_composantes:
+            racines = np.array([ensembles.trouver(c) for c in range(nombre)])[etiquettes]
+            utiles = np.flatnonzero(racines[self.sources] != racines[self.cibles])
+            besoins = self.besoins[utiles]
+            surcouts = 0.0
+            for extremites in (self.sources[utiles], self.cibles[utiles]):
+                actuels = niveaux_sat[extremites]
+                surcouts = surcouts + self.couts[np.maximum(besoins, actuels)] - self.couts[actuels]
+            self.evaluees += len(utiles)
+            paire = utiles[np.argmin(surcouts)]
+            for v in (self.sources[paire], self.cibles[paire]):
+                if niveaux_sat[v] >= self.besoins[paire]:
+                    continue
+                niveaux_sat[v] = self.besoins[paire]
+                for lien in self.incidentes[self.debuts[v]:self.debuts[v + 1]].tolist():
+                    u, w = self.sources[lien], self.cibles[lien]
+                    if min(niveaux_sat[u], niveaux_sat[w]) >= self.besoins[lien]:
+                        ensembles.unir(etiquettes[u], etiquettes[w])
+        return niveaux_sat
+
+    # On relève, tant que le diamètre dépasse la cible, les portées qui réduisent le plus le diamètre par unité
+    # de coût (à défaut, qui ajoutent le plus de liens par unité de coût). Chaque lien absent propose un
+    # relèvement : celui de ses extrémités trop courtes jusqu'à son niveau. On essaie d'abord ceux qui ne
+    # relèvent qu'un satellite, et les autres seulement s'il n'y en a aucun. Si les distances en sauts tiennent
+    # en un lot, seuls les CANDIDATS_DIAMETRE relèvements dont les nouveaux liens raccourcissent le plus de
+    # sauts (par unité de coût) sont évalués.
+    def relever_diametre(self, niveaux_sat):
+        niveaux_sat = niveaux_sat.copy()
+        presentes = self.presentes(niveaux_sat)
+        diametre = self.diametre(presentes)
+        while diametre > self.diametre_max:
+            releves = set()
+            for lien in np.flatnonzero(~presentes).tolist():
+                besoin = self.besoins[lien]
+                releves.add(tuple((v, besoin) for v in (self.sources[lien].item(), self.cibles[lien].item())
+                                  if niveaux_sat[v] < besoin))
+            releves = sorted([releve for releve in releves if len(releve) == 1] or releves)
+            essais = []
+            for releve in releves:
+                essai_niveaux = niveaux_sat.copy()
+                for v, niveau in releve:
+                    essai_niveaux[v] = niveau
+                essais.append((essai_niveaux, self.cout(essai_niveaux) - self.cout(niveaux_sat)))
+
+            if len(essais) > CANDIDATS_DIAMETRE and taille_lot_sources(self.n) >= self.n:
+                adjacence = self.matrice(presentes)
+                distances = shortest_path(adjacence + adjacence.T, method='D', unweighted=True, directed=True)
+                raccourcis = []
+                for essai_niveaux, surcout in essais:
+                    nouvelles = np.flatnonzero(self.presentes(essai_niveaux) & ~presentes)
+                    raccourcis.append((distances[self.sources[nouvelles], self.cibles[nouvelles]] - 1).sum() / surcout)
+                essais = [essais[k] for k in np.argsort(raccourcis, kind='stable')[::-1][:CANDIDATS_DIAMETRE]]
+
+            meilleur, choix = None, None
+            for essai_niveaux, surcout in essais:
+                essai = self.presentes(essai_niveaux)
+                nouveau_diametre = self.diametre(essai)
+                self.evaluees += 1
+                cle = ((diametre - nouveau_diametre) / surcout, (essai.sum() - presentes.sum()) / surcout)
+                if meilleur is None or cle > meilleur:
+                    meilleur, choix = cle, (essai_niveaux, essai, nouveau_diametre)
+            if choix is None:
+                break
+            niveaux_sat, presentes, diametre = choix
+        return niveaux_sat
+
+    # On baisse les portées d'un niveau à la fois, dans l'ordre donné, tant que l'affectation convient.
+    # Seuls les liens de v au niveau retiré disparaissent ; s'aucun n'est dans la forêt couvrante (et sans
+    # cible de diamètre), les composantes ne changent pas.
+    def abaisser(self, niveaux_sat, ordre):
+        niveaux_sat = niveaux_sat.copy()
+        presentes = self.presentes(niveaux_sat)
+        dans_foret = np.zeros(len(self.besoins), dtype=bool)
+        dans_foret[self.foret(presentes)] = True
+        modifie = True
+        while modifie:
+            modifie = False
+            for v in ordre:
+                while niveaux_sat[v] > 0:
+                    incidentes = self.incidentes[self.debuts[v]:self.debuts[v + 1]]
+                    perdues = incidentes[presentes[incidentes] & (self.besoins[incidentes] == niveaux_sat[v])]
+                    self.evaluees += 1
+                    if len(perdues) > 0 and (dans_foret[perdues].any() or self.diametre_max is not None):
+                        essai = presentes.copy()
+                        essai[perdues] = False
+                        if dans_foret[perdues].any():
+                            foret = self.foret(essai)
+                            if not self.couvrante(foret):
+                                break
+                        else:
+                            foret = None
+                        if self.diametre_max is not None and self.diametre(essai) > self.diametre_max:
+                            break
+                        presentes = essai
+                        if foret is not None:
+                            dans_foret[:] = False
+                            dans_foret[foret] = True
+                    else:
+                        presentes[perdues] = False
+                    niveaux_sat[v] -= 1
+                    modifie = True
+        return niveaux_sat
+
+
+# Cette fonction cherche l'affectation des portées (une par satellite, parmi niveaux) de coût total minimal
+# qui garde les composantes connexes de la portée maximale (un seul bloc si l'essaim y est connexe) et, si
+# diametre_max n'est pas None, dont le plus grand diamètre en sauts des composantes est au plus diametre_max.
+#   puissance : le coût d'un satellite est portée ** puissance (1 : portée totale, 2 : proche de la puissance
+#               d'émission)
+#   essais : nombre d'ordres de baisse essayés depuis chaque affectation de départ (le premier baisse d'abord
+#            les plus grandes portées, les suivants mélangent les satellites de même niveau)
+# La recherche est heuristique : 'Borne Inférieure' (connexité seule) permet d'en juger l'écart à l'optimum.
+def optimiser_portees(nums_sat, coordonnees_sat, niveaux=NIVEAUX_PORTEE, diametre_max=None, puissance=1,
+                      essais=1, graine=None):
+    niveaux = np.sort(np.asarray(niveaux, dtype=np.float64))
+    coordonnees_sat = np.asarray(coordonnees_sat, dtype=np.float64)
+    probleme = _ProblemePortees(coordonnees_sat, niveaux, puissance, diametre_max)
+    n = probleme.n
+    borne, niveaux_arbre = probleme.borne_et_arbre()
+
+    objectif_atteint = True
+    departs = [niveaux_arbre, probleme.relever()]
+    if diametre_max is not None:
+        maximum = np.full(n, len(niveaux) - 1)
+        if probleme.diametre(probleme.presentes(maximum)) > diametre_max:
+            # Cible inaccessible : on garde les portées maximales (plus petit diamètre possible)
+            objectif_atteint = False
+            departs = [maximum]
+            probleme.diametre_max = None
+        else:
+            departs = [probleme.relever_diametre(depart) for depart in departs]
+
+    generateur = np.random.default_rng(graine)
+    meilleur = None
+    for depart in departs:
+        for essai in range(essais):
+            melange = np.arange(n) if essai == 0 else generateur.permutation(n)
+            ordre = melange[np.argsort(-depart[melange], kind='stable')].tolist()
+            niveaux_sat = probleme.abaisser(depart, ordre) if objectif_atteint else depart
+            if meilleur is None or probleme.cout(niveaux_sat) < probleme.cout(meilleur):
+                meilleur = niveaux_sat
+
+    presentes = probleme.presentes(meilleur)
+    portees = niveaux[meilleur]
+    return {
+        'sat_id': np.asarray(nums_sat),
+        'Portées': portees,
+        'Portée Totale': float(portees.sum()),
+        'Coût Total': probleme.cout(meilleur),
+        'Borne Inférieure': borne,
+        'Écart à la Borne': probleme.cout(meilleur) / borne - 1 if borne > 0 else 0.0,
+        'Répartition des Portées': {niveau: int(nombre) for niveau, nombre in
+                                    zip(niveaux.tolist(), np.bincount(meilleur, minlength=len(niveaux)))},
+        'Nombre de Liens': int(presentes.sum()),
+        'Nombre de Composantes Connexes': probleme.nombre_composantes,
+        'Diamètre': probleme.diametre(presentes),
+        'Objectif Atteint': objectif_atteint,
+        'Affectations Évaluées': probleme.evaluees,
+    }
+
+
+# Affectations optimisées pour les trois densités, comparées à une portée commune de 60 km
+if __name__ == "__main__":
+    from analyse import charger_donnees, fichiers_donnees
+
+    for fichier, (nums_sat, coordonnees_sat) in zip(fichiers_donnees, charger_donnees()):
+        print(f"\n{fichier} (portée commune de {NIVEAUX_PORTEE[-1]} m : {NIVEAUX_PORTEE[-1] * len(nums_sat)} m)")
+        for diametre_max in (None, 12, 8):
+            resultat = optimiser_portees(nums_sat, coordonnees_sat, diametre_max=diametre_max, essais=5, graine=0)
+            cible = "connexité" if diametre_max is None else f"diamètre <= {diametre_max}"
+            print(f"  {cible} : portée totale {resultat['Portée Totale']:.0f} m",
+                  f"(borne {resultat['Borne Inférieure']:.0f} m), répartition {resultat['Répartition des Portées']},",
+                  f"diamètre {resultat['Diamètre']}, objectif atteint : {resultat['Objectif Atteint']},",
+                  f"{resultat['Affectations Évaluées']} affectations évaluées")
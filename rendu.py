@@ -0,0 +1,126 @@
+# L'objectif de ce fichier est de dessiner rapidement les graphes de l'essaim.
+# Au lieu d'un appel à ax.scatter et ax.text par satellite et d'un appel à ax.plot par arête, on dessine
+# tous les satellites avec un seul scatter et toutes les arêtes avec une seule collection de segments
+# (Line3DCollection en 3D, LineCollection en 2D) ; les numéros des satellites sont optionnels.
+# Les figures peuvent aussi être enregistrées directement dans des fichiers (PNG, SVG, ...) sans affichage,
+# par exemple pour produire les 9 figures (densité × portée) sur un serveur :
+#     python rendu.py figures png svg
+
+import os
+import sys
+
+import numpy as np
+from matplotlib import rcParams
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+from aretes import graphes_par_portee
+from chargement import charger_topologie
+from instrumentation import instrumenter
+
+fichiers_donnees = ["topology_low.csv", "topology_avg.csv", "topology_high.csv"]
+densites = ["faible", "moyenne", "forte"]
+portees_nominales = [20000, 40000, 60000]
+
+
+# On récupère les satellites (dans l'ordre de pos) et le tableau (n, 3) de leurs coordonnées
+def _positions(pos):
+    noeuds = list(pos)
+    coordonnees = np.array([pos[noeud] for noeud in noeuds], dtype=np.float64).reshape(-1, 3)
+    return noeuds, coordonnees
+
+
+# Une couleur par satellite, dans le cycle de couleurs de matplotlib (comme un scatter par satellite)
+def _couleurs(n):
+    cycle = rcParams['axes.prop_cycle'].by_key().get('color', ['C0'])
+    return [cycle[i % len(cycle)] for i in range(n)]
+
+
+# Cette fonction renvoie les segments (nombre d'arêtes, 2, dimensions) des arêtes du graphe
+def segments_aretes(graphe, pos, dimensions=3):
+    noeuds, coordonnees = _positions(pos)
+    index = {noeud: i for i, noeud in enumerate(noeuds)}
+    aretes = np.array([(index[u], index[v]) for u, v in graphe.edges()], dtype=np.int64).reshape(-1, 2)
+    return coordonnees[:, :dimensions][aretes]
+
+
+# Cette fonction dessine le graphe dans un axe 3D : un scatter pour les satellites, une collection pour les arêtes
+@instrumenter()
+def dessiner_graphe_3D(ax, graphe, pos, etiquettes=True, taille_noeuds=50, taille_etiquettes=10):
+    noeuds, coordonnees = _positions(pos)
+    ax.scatter(coordonnees[:, 0], coordonnees[:, 1], coordonnees[:, 2], s=taille_noeuds, c=_couleurs(len(noeuds)),
+               depthshade=False)
+    if graphe is not None and graphe.number_of_edges() > 0:
+        ax.add_collection3d(Line3DCollection(segments_aretes(graphe, pos, 3), colors='gray', linewidths=1.5))
+    if etiquettes:
+        for noeud, (x, y, z) in zip(noeuds, coordonnees):
+            ax.text(x, y, z, f'{noeud}', size=taille_etiquettes, zorder=1)
+
+
+# Même chose en 2D (projection sur le plan (x, y))
+@instrumenter()
+def dessiner_graphe_2D(ax, graphe, pos, etiquettes=True, taille_noeuds=50, taille_etiquettes=10):
+    noeuds, coordonnees = _positions(pos)
+    ax.scatter(coordonnees[:, 0], coordonnees[:, 1], s=taille_noeuds, c=_couleurs(len(noeuds)))
+    if graphe is not None and graphe.number_of_edges() > 0:
+        ax.add_collection(LineCollection(segments_aretes(graphe, pos, 2), colors='gray', linewidths=1.5))
+    if etiquettes:
+        for noeud, (x, y, _) in zip(noeuds, coordonnees):
+            ax.text(x, y, f'{noeud}', size=taille_etiquettes, zorder=1)
+    ax.autoscale_view()
+
+
+# Cette fonction enregistre la figure dans chacun des formats demandés (fichier sans extension)
+# et renvoie la liste des fichiers écrits
+@instrumenter()
+def enregistrer_figure(fig, fichier, formats=('png',), dpi=150):
+    chemins = []
+    for format_fichier in formats:
+        chemin = f"{fichier}.{format_fichier}"
+        fig.savefig(chemin, format=format_fichier, dpi=dpi)
+        chemins.append(chemin)
+    return chemins
+
+
+# Cette fonction produit, sans affichage, la figure de chaque configuration (densité × portée) dans le
+# répertoire donné. Les figures sont créées avec matplotlib.figure.Figure, sans passer par pyplot :
+# aucune interface graphique n'est nécessaire.
+@instrumenter()
+def exporter_configurations(repertoire, formats=('png',), vue='3D', etiquettes=False, fichiers=None,
+                            portees=None, noms_densites=None):
+    fichiers = fichiers_donnees if fichiers is None else fichiers
+    portees = portees_nominales if portees is None else portees
+    noms_densites = densites if noms_densites is None else noms_densites
+    os.makedirs(repertoire, exist_ok=True)
+    chemins = []
+
+    for fichier, densite in zip(fichiers, noms_densites):
+        nums_sat, coordonnees_sat = charger_topologie(fichier)
+        pos = dict(zip(nums_sat.tolist(), coordonnees_sat))
+        # Les arêtes de toutes les portées sont obtenues à partir d'une seule recherche de voisins
+        graphes = graphes_par_portee(nums_sat, coordonnees_sat, portees)
+        for portee, graphe in graphes.items():
+            fig = Figure(figsize=(8, 8) if vue == '3D' else (8, 6))
+            if vue == '3D':
+                ax = fig.add_subplot(111, projection='3d')
+                dessiner_graphe_3D(ax, graphe, pos, etiquettes=etiquettes)
+            else:
+                ax = fig.add_subplot(111)
+                dessiner_graphe_2D(ax, graphe, pos, etiquettes=etiquettes)
+                ax.set_xlabel('X')
+                ax.set_ylabel('Y')
+                ax.grid(True)
+                ax.axis('equal')
+            ax.set_title(f"Graphe de densité {densite} avec arêtes (portée {portee}m)")
+            nom = os.path.join(repertoire, f"graphe_{os.path.splitext(os.path.basename(fichier))[0]}_{portee}")
+            chemins.extend(enregistrer_figure(fig, nom, formats))
+    return chemins
+
+
+# Utilisation : python rendu.py [répertoire] [formats ...]
+if __name__ == "__main__":
+    repertoire = sys.argv[1] if len(sys.argv) > 1 else "figures"
+    formats = sys.argv[2:] or ['png']
+    for chemin in exporter_configurations(repertoire, formats):
+        print(chemin)
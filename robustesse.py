@@ -0,0 +1,342 @@
+# L'objectif de ce fichier est d'étudier la robustesse de l'essaim face aux pannes : que devient le graphe
+# de contact si un satellite, ou un lien, tombe en panne ? et si plusieurs satellites tombent l'un après
+# l'autre (au hasard ou en commençant par les plus connectés) ?
+#
+# Plutôt que de refaire creer_graphe et nx.connected_components pour chacun des n retraits (coût quadratique) :
+#   - un seul parcours en profondeur (algorithme de Tarjan, itératif) donne les points d'articulation, les
+#     ponts et, pour chaque satellite, les tailles des morceaux de sa composante après son retrait ;
+#   - le diamètre (en sauts) après retrait n'est recalculé que pour les satellites dont le retrait peut
+#     allonger un plus court chemin : si deux voisins quelconques de v sont voisins ou ont un autre voisin
+#     commun, tout chemin passant par v a un détour de même longueur et aucune distance ne change ;
+#   - pour une suite de pannes, on parcourt la suite à l'envers en remettant les satellites un par un
+#     dans une structure union-find (chaque état coûte une fusion, au lieu d'un calcul de composantes).
+
+import numpy as np
+from scipy.sparse.csgraph import connected_components, shortest_path
+
+from chemins import matrice_adjacence_csr, taille_lot_sources
+from connexite import EnsemblesDisjoints
+
+
+# Parcours en profondeur itératif (algorithme de Tarjan) sur la matrice d'adjacence CSR.
+# On renvoie les étiquettes de composantes, les morceaux détachés (sommet retiré, taille du morceau :
+# sous-arbres fils dont aucun arc ne remonte au-dessus du sommet) et les ponts (parent, fils, taille du fils).
+def _parcours_tarjan(adjacence):
+    n = adjacence.shape[0]
+    indptr = adjacence.indptr.tolist()
+    indices = adjacence.indices.tolist()
+    ordre = [-1] * n
+    bas = [0] * n
+    parent = [-1] * n
+    taille = [1] * n
+    position = list(indptr[:n])
+    composante = [-1] * n
+    morceaux_sommets, morceaux_tailles = [], []
+    ponts_parents, ponts_fils, ponts_tailles = [], [], []
+    compteur = 0
+    nombre_composantes = 0
+
+    for racine in range(n):
+        if ordre[racine] != -1:
+            continue
+        ordre[racine] = bas[racine] = compteur
+        compteur += 1
+        composante[racine] = nombre_composantes
+        pile = [racine]
+        while pile:
+            v = pile[-1]
+            if position[v] < indptr[v + 1]:
+                w = indices[position[v]]
+                position[v] += 1
+                if ordre[w] == -1:
+                    parent[w] = v
+                    ordre[w] = bas[w] = compteur
+                    compteur += 1
+                    composante[w] = nombre_composantes
+                    pile.append(w)
+                elif w != parent[v] and ordre[w] < bas[v]:
+                    bas[v] = ordre[w]
+            else:
+                pile.pop()
+                if pile:
+                    p = pile[-1]
+                    taille[p] += taille[v]
+                    if bas[v] < bas[p]:
+                        bas[p] = bas[v]
+                    # Aucun arc du sous-arbre de v ne remonte au-dessus de p : retirer p détache ce sous-arbre
+                    if bas[v] >= ordre[p]:
+                        morceaux_sommets.append(p)
+                        morceaux_tailles.append(taille[v])
+                    if bas[v] > ordre[p]:
+                        ponts_parents.append(p)
+                        ponts_fils.append(v)
+                        ponts_tailles.append(taille[v])
+        nombre_composantes += 1
+
+    return (np.array(composante, dtype=np.int64), np.array(taille, dtype=np.int64),
+            np.array(morceaux_sommets, dtype=np.int64), np.array(morceaux_tailles, dtype=np.int64),
+            np.array(ponts_parents, dtype=np.int64), np.array(ponts_fils, dtype=np.int64),
+            np.array(ponts_tailles, dtype=np.int64))
+
+
+# Diamètre (en sauts) d'un graphe connexe par l'algorithme iFUB : on part d'un sommet central, puis on calcule
+# l'excentricité des sommets des niveaux les plus éloignés, du dernier vers le premier. Deux sommets des
+# niveaux <= i sont à au plus 2i sauts l'un de l'autre : on s'arrête dès que la meilleure excentricité
+# trouvée atteint 2i. borne_inferieure (une distance dont on sait qu'elle est atteinte) permet de s'arrêter plus tôt.
+def diametre_sauts(adjacence, centre=0, borne_inferieure=0):
+    if adjacence.shape[0] < 2:
+        return 0
+    niveaux = shortest_path(adjacence, method='D', unweighted=True, directed=False, indices=centre).astype(np.int64)
+    i = int(niveaux.max())
+    diametre = max(borne_inferieure, i)
+    taille_lot = taille_lot_sources(adjacence.shape[0])
+    while diametre < 2 * i:
+        frange = np.flatnonzero(niveaux == i)
+        for debut in range(0, len(frange), taille_lot):
+            distances = shortest_path(adjacence, method='D', unweighted=True, directed=False,
+                                      indices=frange[debut:debut + taille_lot])
+            diametre = max(diametre, int(distances.max()))
+        i -= 1
+    return diametre
+
+
+# Excentricités (en sauts, dans la composante) de tous les sommets, et nombre de partenaires diamétraux
+# (sommets à la distance du diamètre de la composante) des sommets qui en ont
+def _excentricites(adjacence, composante):
+    n = adjacence.shape[0]
+    excentricites = np.zeros(n, dtype=np.int64)
+    taille_lot = taille_lot_sources(n)
+    for debut in range(0, n, taille_lot):
+        distances = shortest_path(adjacence, method='D', unweighted=True, directed=False,
+                                  indices=np.arange(debut, min(debut + taille_lot, n)))
+        distances[~np.isfinite(distances)] = -1
+        excentricites[debut:debut + len(distances)] = distances.max(axis=1)
+
+    diametres_composantes = np.zeros(composante.max() + 1 if n > 0 else 0, dtype=np.int64)
+    np.maximum.at(diametres_composantes, composante, excentricites)
+    diametraux = np.flatnonzero((excentricites == diametres_composantes[composante]) & (excentricites > 0))
+    partenaires = np.zeros(n, dtype=np.int64)
+    for debut in range(0, len(diametraux), taille_lot):
+        sources = diametraux[debut:debut + taille_lot]
+        distances = shortest_path(adjacence, method='D', unweighted=True, directed=False, indices=sources)
+        partenaires[sources] = (distances == diametres_composantes[composante[sources]][:, np.newaxis]).sum(axis=1)
+    return excentricites, diametres_composantes, partenaires
+
+
+# Le retrait de v ne change aucune distance entre les autres sommets si deux voisins quelconques de v
+# sont voisins ou ont un autre voisin commun que v
+def _retrait_sans_detour(adjacence, v):
+    voisins = adjacence.indices[adjacence.indptr[v]:adjacence.indptr[v + 1]]
+    if len(voisins) < 2:
+        return True
+    lignes = adjacence[voisins]
+    directs = lignes[:, voisins].toarray() > 0
+    communs = (lignes @ lignes.T).toarray() >= 2
+    couverts = directs | communs
+    np.fill_diagonal(couverts, True)
+    return bool(couverts.all())
+
+
+# Cette fonction analyse la panne de chaque satellite et de chaque lien du graphe (nx.Graph ou GrapheEssaim).
+# Les tableaux sont dans l'ordre de 'sat_id' :
+#   - 'Point d'Articulation' : le retrait du satellite augmente le nombre de composantes ;
+#   - 'Nombre de Composantes Après Retrait', 'Taille de la Plus Grande Composante Après Retrait' ;
+#   - 'Diamètre Après Retrait' et 'Variation du Diamètre' (plus grande distance finie en sauts), si diametres
+#     vaut True : c'est la partie la plus coûteuse (un parcours en largeur depuis chaque sommet, au moins).
+# 'Morceaux' associe à chaque point d'articulation les tailles des morceaux de sa composante après son retrait.
+# Les ponts sont donnés par paires de numéros de satellites, avec les tailles des deux morceaux séparés.
+# Comme les autres analyses, les satellites absents du graphe (isolés dans creer_graphe) ne sont pas étudiés.
+def analyser_pannes(graphe, diametres=True):
+    adjacence, noeuds = matrice_adjacence_csr(graphe)
+    adjacence = adjacence.tocsr()
+    adjacence.sort_indices()
+    nums_sat = np.asarray(noeuds)
+    n = len(nums_sat)
+    (composante, _, morceaux_sommets, morceaux_tailles,
+     ponts_parents, ponts_fils, ponts_tailles) = _parcours_tarjan(adjacence)
+    tailles_composantes = np.bincount(composante, minlength=composante.max() + 1 if n > 0 else 0)
+    taille_composante = tailles_composantes[composante]
+    nombre_composantes = len(tailles_composantes)
+
+    # Morceaux de la composante de v après son retrait : les sous-arbres détachés, plus le reste
+    # (côté parent), s'il n'est pas vide
+    nombre_detaches = np.bincount(morceaux_sommets, minlength=n)
+    somme_detaches = np.bincount(morceaux_sommets, weights=morceaux_tailles, minlength=n).astype(np.int64)
+    plus_grand_detache = np.zeros(n, dtype=np.int64)
+    np.maximum.at(plus_grand_detache, morceaux_sommets, morceaux_tailles)
+    reste = taille_composante - 1 - somme_detaches
+    nombre_morceaux = nombre_detaches + (reste > 0)
+    articulation = nombre_morceaux >= 2
+
+    # Plus grande des autres composantes (la plus grande, sauf si c'est celle de v)
+    ordre_tailles = np.argsort(tailles_composantes)[::-1]
+    premiere = tailles_composantes[ordre_tailles[0]] if nombre_composantes > 0 else 0
+    seconde = tailles_composantes[ordre_tailles[1]] if nombre_composantes > 1 else 0
+    autres = np.where(composante == (ordre_tailles[0] if nombre_composantes > 0 else -1), seconde, premiere)
+
+    resultats = {
+        'sat_id': nums_sat,
+        "Point d'Articulation": articulation,
+        'Nombre de Composantes Après Retrait': nombre_composantes - 1 + nombre_morceaux,
+        'Taille de la Plus Grande Composante Après Retrait': np.maximum(autres,
+                                                                       np.maximum(plus_grand_detache, reste)),
+        'Morceaux': {},
+        'Ponts': np.column_stack([nums_sat[ponts_parents], nums_sat[ponts_fils]]) if len(ponts_fils) > 0
+        else np.empty((0, 2), dtype=nums_sat.dtype),
+        'Tailles des Morceaux des Ponts': np.column_stack([taille_composante[ponts_fils] - ponts_tailles,
+                                                           ponts_tailles]),
+    }
+    for v in np.flatnonzero(articulation).tolist():
+        tailles = morceaux_tailles[morceaux_sommets == v]
+        if reste[v] > 0:
+            tailles = np.append(tailles, reste[v])
+        resultats['Morceaux'][nums_sat[v].item()] = np.sort(tailles)[::-1]
+
+    if diametres:
+        resultats.update(_diametres_apres_retrait(adjacence, composante))
+    return resultats
+
+
+# Diamètre du graphe après le retrait de chaque sommet (voir _retrait_sans_detour)
+def _diametres_apres_retrait(adjacence, composante):
+    n = adjacence.shape[0]
+    excentricites, diametres_composantes, partenaires = _excentricites(adjacence, composante)
+    diametre = int(diametres_composantes.max()) if n > 0 else 0
+    paires_diametrales = np.bincount(composante, weights=partenaires, minlength=len(diametres_composantes)) // 2
+
+    # Plus grand diamètre des autres composantes
+    ordre = np.argsort(diametres_composantes)[::-1]
+    premier = diametres_composantes[ordre[0]] if len(ordre) > 0 else 0
+    second = diametres_composantes[ordre[1]] if len(ordre) > 1 else 0
+    autres = np.where(composante == (ordre[0] if len(ordre) > 0 else -1), second, premier)
+
+    diametres_apres = np.empty(n, dtype=np.int64)
+    for v in range(n):
+        c = composante[v]
+        paire_conservee = partenaires[v] < paires_diametrales[c]
+        if paire_conservee and _retrait_sans_detour(adjacence, v):
+            # Distances inchangées et une paire diamétrale ne contient pas v
+            diametre_composante = diametres_composantes[c]
+        else:
+            # Diamètre de chaque morceau de la composante privée de v
+            membres = np.flatnonzero(composante == c)
+            membres = membres[membres != v]
+            sous_graphe = adjacence[membres][:, membres]
+            nombre_morceaux, morceaux = connected_components(sous_graphe, directed=False)
+            diametre_composante = 0
+            for morceau in range(nombre_morceaux):
+                sommets = np.flatnonzero(morceaux == morceau)
+                graphe_morceau = sous_graphe[sommets][:, sommets] if nombre_morceaux > 1 else sous_graphe
+                # Sans v, les distances ne peuvent qu'augmenter : si la composante reste connexe,
+                # une paire diamétrale qui ne contient pas v garde au moins sa distance
+                borne = diametres_composantes[c] if nombre_morceaux == 1 and paire_conservee else 0
+                centre = int(np.argmin(excentricites[membres[sommets]]))
+                diametre_composante = max(diametre_composante, diametre_sauts(graphe_morceau, centre, borne))
+        diametres_apres[v] = max(autres[v], diametre_composante)
+    return {'Diamètre': diametre, 'Diamètre Après Retrait': diametres_apres,
+            'Variation du Diamètre': diametres_apres - diametre}
+
+
+# Cette fonction suit la connexité du graphe au fil d'une suite de pannes de satellites.
+#   ordre : 'aleatoire' (permutation tirée avec graine), 'degre' (les plus connectés d'abord)
+#           ou liste de numéros de satellites
+#   nombre : nombre de satellites retirés (par défaut, toute la suite)
+# Les tableaux ont nombre + 1 valeurs : l'état initial, puis l'état après chaque retrait.
+# 'Taille Moyenne des Autres Composantes' est la taille moyenne (pondérée par la taille) des composantes
+# autres que la plus grande, comme en percolation.
+def pannes_successives(graphe, ordre='aleatoire', nombre=None, graine=None):
+    adjacence, noeuds = matrice_adjacence_csr(graphe)
+    adjacence = adjacence.tocsr()
+    nums_sat = np.asarray(noeuds)
+    n = len(nums_sat)
+    if isinstance(ordre, str):
+        if ordre == 'aleatoire':
+            retraits = np.random.default_rng(graine).permutation(n)
+        elif ordre == 'degre':
+            retraits = np.argsort(-np.diff(adjacence.indptr), kind='stable')
+        else:
+            raise ValueError(f"Ordre de pannes inconnu : {ordre}")
+    else:
+        index = {sat: i for i, sat in enumerate(nums_sat.tolist())}
+        retraits = np.array([index[sat] for sat in ordre], dtype=np.int64)
+    retraits = retraits[:len(retraits) if nombre is None else nombre]
+    k = len(retraits)
+
+    # État final : les satellites restants et leurs liens
+    present = np.ones(n, dtype=bool)
+    present[retraits] = False
+    ensembles = EnsemblesDisjoints(n)
+    somme_carres = int(present.sum())
+    lignes = np.repeat(np.arange(n), np.diff(adjacence.indptr))
+    garder = (lignes < adjacence.indices) & present[lignes] & present[adjacence.indices]
+    for u, v in zip(lignes[garder].tolist(), adjacence.indices[garder].tolist()):
+        somme_carres += _unir(ensembles, u, v)
+
+    nombres_composantes = np.empty(k + 1, dtype=np.int64)
+    plus_grandes = np.empty(k + 1, dtype=np.int64)
+    sommes_carres = np.empty(k + 1, dtype=np.int64)
+    voisins = adjacence.indices.tolist()
+    indptr = adjacence.indptr.tolist()
+    presents = n - k
+    for i in range(k, -1, -1):
+        # Les absents sont des singletons de la structure qui ne comptent pas
+        nombres_composantes[i] = ensembles.nombre_composantes - (n - presents)
+        plus_grandes[i] = ensembles.plus_grande_taille if presents > 0 else 0
+        sommes_carres[i] = somme_carres
+        if i == 0:
+            break
+        # On remet le satellite retiré en i-ème
+        v = int(retraits[i - 1])
+        present[v] = True
+        presents += 1
+        somme_carres += 1
+        for w in voisins[indptr[v]:indptr[v + 1]]:
+            if present[w]:
+                somme_carres += _unir(ensembles, v, w)
+
+    restants = n - np.arange(k + 1)
+    autres = restants - plus_grandes
+    with np.errstate(invalid='ignore', divide='ignore'):
+        taille_moyenne = np.where(autres > 0, (sommes_carres - plus_grandes ** 2) / np.maximum(autres, 1), 0.0)
+    return {
+        'Satellites Retirés': nums_sat[retraits],
+        'Fraction Retirée': np.arange(k + 1) / n if n > 0 else np.zeros(k + 1),
+        'Nombre de Composantes Connexes': nombres_composantes,
+        'Taille de la Plus Grande Composante': plus_grandes,
+        'Taille Moyenne des Autres Composantes': taille_moyenne,
+    }
+
+
+# Fusion de deux ensembles ; on renvoie la variation de la somme des carrés des tailles
+def _unir(ensembles, u, v):
+    racine_u = ensembles.trouver(u)
+    racine_v = ensembles.trouver(v)
+    if racine_u == racine_v:
+        return 0
+    variation = 2 * ensembles.taille[racine_u] * ensembles.taille[racine_v]
+    ensembles.unir(racine_u, racine_v)
+    return variation
+
+
+# Pannes d'un satellite ou d'un lien, puis pannes successives, pour chaque densité à la portée de 60 km
+if __name__ == "__main__":
+    from analyse import charger_donnees, creer_graphe, fichiers_donnees
+
+    portee = 60000
+    for fichier, essaim in zip(fichiers_donnees, charger_donnees()):
+        graphe = creer_graphe(essaim, portee)
+        pannes = analyser_pannes(graphe)
+        print(f"\n{fichier} - portée {portee} m (diamètre : {pannes['Diamètre']} sauts)")
+        print("  Points d'articulation :", pannes['sat_id'][pannes["Point d'Articulation"]].tolist())
+        for sat, tailles in pannes['Morceaux'].items():
+            print(f"    panne de {sat} : morceaux de tailles {tailles.tolist()}")
+        print("  Ponts :", pannes['Ponts'].tolist())
+        allonges = pannes['Variation du Diamètre'] > 0
+        print("  Pannes qui allongent le diamètre :",
+              dict(zip(pannes['sat_id'][allonges].tolist(), pannes['Variation du Diamètre'][allonges].tolist())))
+        for ordre in ('aleatoire', 'degre'):
+            suite = pannes_successives(graphe, ordre, graine=0)
+            n = graphe.number_of_nodes()
+            tailles = {f"{fraction:.0%}": int(suite['Taille de la Plus Grande Composante'][int(fraction * n)])
+                       for fraction in (0.1, 0.25, 0.5)}
+            print(f"  Pannes successives ({ordre}) : plus grande composante après une fraction de pannes {tailles}")
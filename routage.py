@@ -0,0 +1,196 @@
+# L'objectif de ce fichier est de répondre en temps constant aux questions de la couche de routage :
+# combien de sauts, quel coût (distance², comme dans la partie 3) et quel prochain saut pour aller du
+# satellite a au satellite b, à une portée donnée.
+#
+# Pour chaque configuration (fichier de topologie, portée), l'index est calculé une seule fois (parcours en
+# largeur et Dijkstra compilés, par lots de sources) et enregistré dans un répertoire de fichiers .npy :
+#   - sauts.npy : nombre minimal de sauts (uint8, ou uint16 si l'essaim est trop étendu ; valeur maximale du
+#     type si b n'est pas accessible) ;
+#   - couts.npy : coût minimal (float32, inf si b n'est pas accessible) ;
+#   - prochains.npy : prochains[b, x] = prochain satellite (indice) sur une route de coût minimal de x vers b,
+#     -1 s'il n'y en a pas (int16 ou int32). C'est la matrice des prédécesseurs de Dijkstra depuis b : le graphe
+#     n'étant pas orienté, le prédécesseur de x sur la route b -> x est son successeur sur la route x -> b.
+#     La ligne de la destination est contiguë, ce qui sert la reconstruction d'une route saut par saut.
+# Les fichiers sont ouverts par projection en mémoire (lecture seule) : plusieurs processus qui lisent le même
+# index partagent les mêmes pages, sans le recharger, et un index est écrit dans des fichiers temporaires
+# renommés à la fin (un lecteur ne voit jamais d'index incomplet).
+
+import hashlib
+import json
+import os
+
+import numpy as np
+from numpy.lib.format import open_memmap
+from scipy.sparse.csgraph import connected_components, dijkstra, shortest_path
+
+from chemins import taille_lot_sources, type_indices
+
+# À incrémenter lorsque le contenu des index change, pour les faire recalculer
+VERSION_INDEX = 1
+
+REPERTOIRE_ROUTAGE = ".cache_routage"
+
+# Index déjà ouverts dans le processus courant : (répertoire de l'index) -> IndexRoutage
+_index_ouverts = {}
+
+
+def _etat_source(fichier_csv, portee):
+    etat = os.stat(fichier_csv)
+    return {'version': VERSION_INDEX, 'source': os.path.abspath(fichier_csv), 'taille': etat.st_size,
+            'date': etat.st_mtime_ns, 'portee': portee}
+
+
+# Répertoire de l'index d'une configuration ; le nom contient une empreinte du chemin absolu du CSV et de la
+# portée exacte, pour que deux CSV de même nom (ou deux portées proches) ne partagent pas le même index
+def repertoire_index(fichier_csv, portee, repertoire=REPERTOIRE_ROUTAGE):
+    nom = os.path.splitext(os.path.basename(fichier_csv))[0]
+    cle = f"{os.path.abspath(fichier_csv)}|{float(portee)!r}"
+    empreinte = hashlib.sha256(cle.encode()).hexdigest()[:12]
+    return os.path.join(repertoire, f"{nom}_{portee:g}_{empreinte}")
+
+
+# Type des nombres de sauts : uint8 suffit si aucune distance n'atteint 255 sauts (255 = non accessible).
+# Dans une composante, la distance est au plus le double de l'excentricité d'un de ses sommets ; seules les
+# composantes de plus de 255 satellites doivent être examinées.
+def _type_sauts(adjacence):
+    _, etiquettes = connected_components(adjacence, directed=False)
+    tailles = np.bincount(etiquettes)
+    grandes = np.flatnonzero(tailles > 255)
+    if len(grandes) == 0:
+        return np.uint8
+    representants = np.array([np.flatnonzero(etiquettes == c)[0] for c in grandes])
+    distances = shortest_path(adjacence, method='D', unweighted=True, directed=False, indices=representants)
+    return np.uint8 if 2 * distances[np.isfinite(distances)].max() < 255 else np.uint16
+
+
+# Cette fonction calcule l'index de routage d'une configuration et l'enregistre dans repertoire_index(...).
+# Tous les satellites du fichier sont indexés, y compris ceux qui n'ont aucun voisin à cette portée.
+def construire_index(fichier_csv, portee, repertoire=REPERTOIRE_ROUTAGE):
+    from chargement import charger_topologie
+    from graphe_essaim import GrapheEssaim
+
+    nums_sat, coordonnees_sat = charger_topologie(fichier_csv)
+    graphe = GrapheEssaim.depuis_coordonnees(nums_sat, coordonnees_sat, portee, pondere=True)
+    adjacence = graphe.adjacence('weight')
+    n = len(nums_sat)
+    dossier = repertoire_index(fichier_csv, portee, repertoire)
+    os.makedirs(dossier, exist_ok=True)
+    suffixe = f".{os.getpid()}.tmp"
+
+    type_sauts = _type_sauts(adjacence)
+    type_prochains = type_indices(n)
+    chemins = {nom: os.path.join(dossier, nom + ".npy") for nom in ('sat_id', 'sauts', 'couts', 'prochains')}
+    sauts = open_memmap(chemins['sauts'] + suffixe, mode='w+', dtype=type_sauts, shape=(n, n))
+    couts = open_memmap(chemins['couts'] + suffixe, mode='w+', dtype=np.float32, shape=(n, n))
+    prochains = open_memmap(chemins['prochains'] + suffixe, mode='w+', dtype=type_prochains, shape=(n, n))
+
+    # La matrice contient les deux sens de chaque lien : les parcours orientés donnent les mêmes distances,
+    # sans le surcoût du mode non orienté de SciPy
+    taille_lot = taille_lot_sources(n)
+    for debut in range(0, n, taille_lot):
+        sources = np.arange(debut, min(debut + taille_lot, n))
+        distances = shortest_path(adjacence, method='D', unweighted=True, directed=True, indices=sources)
+        distances[~np.isfinite(distances)] = np.iinfo(type_sauts).max
+        sauts[sources] = distances
+        distances, predecesseurs = dijkstra(adjacence, directed=True, indices=sources, return_predecessors=True)
+        couts[sources] = distances
+        predecesseurs[predecesseurs < 0] = -1
+        # Une destination est son propre prochain saut
+        predecesseurs[np.arange(len(sources)), sources] = sources
+        prochains[sources] = predecesseurs
+
+    for tableau in (sauts, couts, prochains):
+        tableau.flush()
+    del sauts, couts, prochains
+    with open(chemins['sat_id'] + suffixe, 'wb') as f:
+        np.save(f, np.asarray(nums_sat))
+    for chemin in chemins.values():
+        os.replace(chemin + suffixe, chemin)
+    # Les métadonnées sont écrites en dernier : elles valident l'index
+    meta = os.path.join(dossier, "index.json")
+    with open(meta + suffixe, 'w') as f:
+        json.dump(_etat_source(fichier_csv, portee), f)
+    os.replace(meta + suffixe, meta)
+    return dossier
+
+
+# Cette fonction renvoie l'index de routage d'une configuration, calculé au premier appel si nécessaire
+# (ou si le fichier de topologie a changé). Un index déjà ouvert dans le processus est réutilisé.
+def ouvrir_index(fichier_csv, portee, repertoire=REPERTOIRE_ROUTAGE):
+    dossier = repertoire_index(fichier_csv, portee, repertoire)
+    try:
+        with open(os.path.join(dossier, "index.json")) as f:
+            meta = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        meta = None
+    if meta != _etat_source(fichier_csv, portee):
+        _index_ouverts.pop(dossier, None)
+        construire_index(fichier_csv, portee, repertoire)
+    if dossier not in _index_ouverts:
+        _index_ouverts[dossier] = IndexRoutage(dossier)
+    return _index_ouverts[dossier]
+
+
+# Index de routage ouvert en lecture seule ; les satellites sont désignés par leur numéro (sat_id)
+class IndexRoutage:
+
+    def __init__(self, dossier):
+        self.dossier = dossier
+        self.nums_sat = np.load(os.path.join(dossier, "sat_id.npy"))
+        self.matrice_sauts = np.load(os.path.join(dossier, "sauts.npy"), mmap_mode='r')
+        self.matrice_couts = np.load(os.path.join(dossier, "couts.npy"), mmap_mode='r')
+        self.matrice_prochains = np.load(os.path.join(dossier, "prochains.npy"), mmap_mode='r')
+        self._inaccessible = np.iinfo(self.matrice_sauts.dtype).max
+        self._index = {sat: i for i, sat in enumerate(self.nums_sat.tolist())}
+
+    # Nombre minimal de sauts de a à b (None si b n'est pas accessible depuis a)
+    def sauts(self, a, b):
+        valeur = int(self.matrice_sauts[self._index[a], self._index[b]])
+        return None if valeur == self._inaccessible else valeur
+
+    # Coût minimal (somme des distances² des liens) de a à b (inf si b n'est pas accessible)
+    def cout(self, a, b):
+        return float(self.matrice_couts[self._index[a], self._index[b]])
+
+    # Prochain satellite sur une route de coût minimal de a vers b (None si b n'est pas accessible)
+    def prochain_saut(self, a, b):
+        suivant = int(self.matrice_prochains[self._index[b], self._index[a]])
+        return None if suivant < 0 else self.nums_sat[suivant].item()
+
+    # Route de coût minimal de a à b (liste de numéros de satellites, vide si b n'est pas accessible),
+    # reconstruite saut par saut dans la ligne de la destination
+    def route(self, a, b):
+        i, j = self._index[a], self._index[b]
+        prochains = self.matrice_prochains[j]
+        if prochains[i] < 0:
+            return []
+        route = [i]
+        while i != j:
+            i = int(prochains[i])
+            route.append(i)
+        return self.nums_sat[route].tolist()
+
+    def __len__(self):
+        return len(self.nums_sat)
+
+    # Transmis à un autre processus, l'index y est rouvert (projection des mêmes fichiers) au lieu d'être copié
+    def __reduce__(self):
+        return IndexRoutage, (self.dossier,)
+
+
+# Construction des index des trois densités aux portées étudiées, puis quelques requêtes
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from analyse import fichiers_donnees
+
+    portees = [float(portee) for portee in sys.argv[1:]] or [20000, 40000, 60000]
+    for fichier in fichiers_donnees:
+        for portee in portees:
+            debut = time.perf_counter()
+            index = ouvrir_index(fichier, portee)
+            duree = time.perf_counter() - debut
+            a, b = index.nums_sat[0].item(), index.nums_sat[-1].item()
+            print(f"{fichier} - portée {portee:g} m (index prêt en {duree:.2f} s) : de {a} à {b},",
+                  f"{index.sauts(a, b)} sauts minimum, coût {index.cout(a, b):.4g}, route {index.route(a, b)}")
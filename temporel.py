@@ -0,0 +1,99 @@
+# L'objectif de ce fichier est de suivre l'évolution du graphe de contact de l'essaim au cours du temps.
+# Les positions sont lues sous forme d'une suite d'instantanés (un par pas de temps) et le graphe est
+# mis à jour de façon incrémentale : à chaque pas, seules les paires dont la distance franchit la portée
+# sont ajoutées ou retirées, au lieu de reconstruire le graphe avec creer_graphe.
+
+import numpy as np
+import networkx as nx
+
+from aretes import paires_a_portee
+from chargement import charger_topologie, charger_trajectoires
+
+
+# Cette fonction lit une suite d'instantanés et renvoie, pas par pas, (temps, nums_sat, coordonnees_sat).
+# On accepte soit un seul fichier CSV contenant une colonne de temps en plus de sat_id, x, y, z,
+# soit une liste de fichiers CSV au format de topology_*.csv (un fichier par pas de temps).
+def charger_instantanes(source, colonne_temps='temps'):
+    if isinstance(source, (list, tuple)):
+        for pas, fichier in enumerate(source):
+            nums_sat, coordonnees_sat = charger_topologie(fichier)
+            ordre = np.argsort(nums_sat, kind='stable')
+            yield pas, nums_sat[ordre], coordonnees_sat[ordre]
+        return
+
+    # Lignes déjà triées par (temps, sat_id) : chaque instantané est une tranche des tableaux projetés
+    temps, decalages, nums_sat, coordonnees_sat = charger_trajectoires(source, colonne_temps)
+    for k, instant in enumerate(temps.tolist()):
+        yield instant, nums_sat[decalages[k]:decalages[k + 1]], coordonnees_sat[decalages[k]:decalages[k + 1]]
+
+
+# Cette fonction maintient le graphe de contact au fil des instantanés et renvoie, pour chaque pas,
+# les arêtes ajoutées et supprimées (tableaux (k, 2) de numéros de satellites) et, si une fonction
+# d'analyse est fournie (par exemple analyser_graphe), ses résultats sur le graphe courant.
+#
+# Les paires candidates sont celles à moins de portee + marge lors de la dernière recherche de voisins
+# (liste de Verlet) : tant qu'aucun satellite ne s'est déplacé de plus de marge / 2 depuis, aucune autre
+# paire ne peut passer sous la portée, et il suffit de recalculer la distance des paires candidates.
+# Comme creer_graphe, le graphe ne contient que les satellites ayant au moins un voisin.
+def suivre_topologie(instantanes, portee, marge=None, analyse=None):
+    if marge is None:
+        marge = 0.1 * portee
+
+    graphe = nx.Graph()
+    nums_sat = None
+    coordonnees_reference = None
+    cles_candidates = None
+    cles_actives = np.empty(0, dtype=np.int64)
+    actives = None
+
+    for temps, nums_sat_pas, coordonnees_sat in instantanes:
+        coordonnees_sat = np.asarray(coordonnees_sat, dtype=np.float64)
+        if nums_sat is None:
+            nums_sat = np.asarray(nums_sat_pas)
+        elif not np.array_equal(nums_sat, nums_sat_pas):
+            raise ValueError(f"Les satellites de l'instantané {temps} diffèrent de ceux du premier instantané")
+        n = len(nums_sat)
+
+        # On refait la recherche de voisins si un satellite a pu faire passer une nouvelle paire sous la portée
+        reconstruction = coordonnees_reference is None or \
+            2 * np.max(np.linalg.norm(coordonnees_sat - coordonnees_reference, axis=1)) > marge
+        if reconstruction:
+            sources, cibles, _ = paires_a_portee(coordonnees_sat, portee + marge)
+            cles_candidates = sources.astype(np.int64) * n + cibles
+            ordre = np.argsort(cles_candidates)
+            cles_candidates = cles_candidates[ordre]
+            sources, cibles = sources[ordre], cibles[ordre]
+            coordonnees_reference = coordonnees_sat.copy()
+
+        distances = np.linalg.norm(coordonnees_sat[sources] - coordonnees_sat[cibles], axis=1)
+        nouvelles_actives = distances <= portee
+
+        if reconstruction:
+            # La liste des candidates a changé : on compare les ensembles de paires
+            anciennes_cles_actives = cles_actives
+            cles_actives = cles_candidates[nouvelles_actives]
+            cles_ajoutees = np.setdiff1d(cles_actives, anciennes_cles_actives, assume_unique=True)
+            cles_supprimees = np.setdiff1d(anciennes_cles_actives, cles_actives, assume_unique=True)
+        else:
+            # Même liste de candidates : seules les paires qui changent d'état sont concernées
+            changements = nouvelles_actives != actives
+            cles_ajoutees = cles_candidates[changements & nouvelles_actives]
+            cles_supprimees = cles_candidates[changements & actives]
+            cles_actives = cles_candidates[nouvelles_actives]
+        actives = nouvelles_actives
+
+        ajouts = nums_sat[np.column_stack([cles_ajoutees // n, cles_ajoutees % n])]
+        suppressions = nums_sat[np.column_stack([cles_supprimees // n, cles_supprimees % n])]
+
+        # Mise à jour incrémentale du graphe
+        graphe.remove_edges_from(suppressions.tolist())
+        graphe.remove_nodes_from([sat for sat in set(suppressions.ravel().tolist()) if graphe.degree(sat) == 0])
+        graphe.add_edges_from(ajouts.tolist())
+
+        yield {
+            'Temps': temps,
+            'Arêtes Ajoutées': ajouts,
+            'Arêtes Supprimées': suppressions,
+            'Graphe': graphe,
+            'Résultats': analyse(graphe) if analyse is not None else None,
+        }
@@ -0,0 +1,39 @@
+# L'objectif de ce fichier est de calculer les triangles et les coefficients de clustering de l'essaim
+# en algèbre linéaire creuse, en une seule passe vectorisée, au lieu de la boucle Python de nx.clustering.
+# Avec A la matrice d'adjacence, le nombre de triangles passant par chaque sommet est diag(A³) / 2,
+# que l'on obtient sans former A³ : c'est la somme, ligne par ligne, de (A @ A) restreint aux arêtes de A.
+
+import numpy as np
+
+from chemins import matrice_adjacence_csr
+
+
+# Cette fonction calcule les triangles de chaque sommet à partir de la matrice d'adjacence creuse.
+def triangles_depuis_adjacence(adjacence):
+    adjacence = adjacence.astype(np.float64)
+    adjacence.data[:] = 1.0
+    # (A @ A)[i, j] compte les voisins communs de i et j ; on ne garde que les paires (i, j) voisines
+    chemins_fermes = (adjacence @ adjacence).multiply(adjacence)
+    return np.rint(np.asarray(chemins_fermes.sum(axis=1)).ravel() / 2).astype(np.int64)
+
+
+# Cette fonction renvoie, pour chaque sommet du graphe (dans l'ordre de 'Noeuds'), son nombre de triangles
+# et son coefficient de clustering local, ainsi que le clustering moyen et la transitivité globale.
+# Les conventions sont celles de NetworkX : un sommet de degré inférieur à 2 a un clustering nul.
+def triangles_et_clustering(graphe):
+    adjacence, noeuds = matrice_adjacence_csr(graphe)
+    triangles = triangles_depuis_adjacence(adjacence)
+    degres = np.diff(adjacence.indptr).astype(np.float64)
+
+    # Nombre de paires de voisins de chaque sommet
+    paires_voisins = degres * (degres - 1) / 2
+    clustering = np.divide(triangles, paires_voisins, out=np.zeros(len(noeuds)), where=paires_voisins > 0)
+    total_paires = paires_voisins.sum()
+
+    return {
+        'Noeuds': noeuds,
+        'Triangles': triangles,
+        'Clustering': clustering,
+        'Clustering Moyen': float(clustering.mean()) if len(noeuds) > 0 else 0.0,
+        'Transitivité': float(triangles.sum() / total_paires) if total_paires > 0 else 0.0,
+    }